@@ -0,0 +1,191 @@
+"""
+Local fixture server for the benchmark suite
+
+Serves the recorded pages under benchmarks/fixtures/<site>/ with one port per
+site, so that host checks such as is_github_url keep working. {{name}}
+placeholders are filled from the request (keyword, owner, repo, symbol) and
+with the base URL of every site ({{github}}, ...). Minkabu's daily_bar table
+is rendered server-side, DAILY_BAR_ROWS rows per ?page=N.
+
+Usage:
+    PYTHONPATH=. python benchmarks/fixture_server.py
+"""
+
+import re
+import threading
+import time
+from datetime import date, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from utils.endpoints import BASE_URL_ENV_PREFIX, DEFAULT_BASE_URLS
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SEARCH_ROUTE = [(re.compile(r"^/search$"), "search.html")]
+REPO = r"^/(?P<owner>[\w.-]+)/(?P<repo>[\w.-]+)"
+ROUTES = {
+    "brave": SEARCH_ROUTE,
+    "mojeek": SEARCH_ROUTE,
+    "bing": SEARCH_ROUTE,
+    "github": [
+        (re.compile(rf"{REPO}/releases$"), "releases.html"),
+        (re.compile(rf"{REPO}/releases\.atom$"), "releases.atom"),
+        (re.compile(rf"{REPO}/?$"), "repo.html"),
+    ],
+    "fotosource": [(re.compile(r"^/store-selector$"), "store-selector.html")],
+    "minkabu": [(re.compile(r"^/stock/(?P<symbol>\w+)/daily_bar$"), "daily_bar.html")],
+}
+DAILY_BAR_PAGES = 10
+DAILY_BAR_ROWS = 15
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".atom": "application/atom+xml; charset=utf-8",
+}
+
+
+def search_keyword(query: str) -> str:
+    # Queries look like '"react" releases site:github.com'
+    terms = parse_qs(query).get("q", [""])[0]
+    match = re.search(r'"([^"]+)"', terms)
+    keyword = match.group(1) if match else terms
+    return re.sub(r"[^a-z0-9.-]+", "-", keyword.lower()).strip("-")
+
+
+def daily_bar_values(values: dict[str, str], query: str) -> dict[str, str]:
+    page = int(parse_qs(query).get("page", ["1"])[0])
+    rows = []
+    for i in range(DAILY_BAR_ROWS):
+        n = (page - 1) * DAILY_BAR_ROWS + i
+        day = date(2025, 7, 1) - timedelta(days=n)
+        price = 1500 + (n + len(values["symbol"])) % 97
+        cells = [
+            day.strftime("%Y/%m/%d"),
+            price,
+            price + 20,
+            price - 20,
+            price + 5,
+            price + 5,
+            f"{1000000 + i * 1234:,}",
+        ]
+        rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    next_page = (
+        f'<a class="next_page" href="?page={page + 1}">次へ</a>'
+        if page < DAILY_BAR_PAGES
+        else ""
+    )
+    return {"rows": "\n".join(rows), "next_page": next_page}
+
+
+# Fixtures whose content depends on the request beyond simple placeholders
+RENDERERS = {"daily_bar.html": daily_bar_values}
+
+
+def render(template: str, values: dict[str, str]) -> str:
+    for key, value in values.items():
+        template = template.replace(f"{{{{{key}}}}}", value)
+    return template
+
+
+class FixtureHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, site: str, fixtures: "FixtureServer"):
+        super().__init__(("127.0.0.1", 0), FixtureRequestHandler)
+        self.site = site
+        self.fixtures = fixtures
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def resolve(self, url: str) -> tuple[Path, dict[str, str]] | None:
+        parsed = urlparse(url)
+        for pattern, filename in ROUTES[self.site]:
+            match = pattern.match(parsed.path)
+            if match:
+                values = {k: escape(v) for k, v in match.groupdict().items()}
+                if parsed.query:
+                    values["keyword"] = search_keyword(parsed.query)
+                if filename in RENDERERS:
+                    values.update(RENDERERS[filename](values, parsed.query))
+                return FIXTURES_DIR / self.site / filename, values
+        return None
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    server: FixtureHTTPServer
+
+    def serve_fixture(self, head: bool = False):
+        self.server.fixtures.requests += 1
+        if self.server.fixtures.delay_seconds:
+            time.sleep(self.server.fixtures.delay_seconds)
+
+        resolved = self.server.resolve(self.path)
+        if resolved is None:
+            self.send_error(404, "Not Found")
+            return
+
+        path, values = resolved
+        body = render(
+            path.read_text(encoding="utf-8"),
+            {**self.server.fixtures.base_urls, **values},
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES[path.suffix])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def serve_headers(self):
+        self.serve_fixture(head=True)
+
+    do_GET = serve_fixture
+    do_HEAD = serve_headers
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """One local HTTP server per site, started and stopped together."""
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.requests = 0
+        self.servers = {site: FixtureHTTPServer(site, self) for site in ROUTES}
+        self.base_urls = {site: s.base_url for site, s in self.servers.items()}
+
+    def __enter__(self):
+        for server in self.servers.values():
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def environ(self) -> dict[str, str]:
+        return {
+            f"{BASE_URL_ENV_PREFIX}{site.upper()}": url
+            for site, url in self.base_urls.items()
+            if site in DEFAULT_BASE_URLS
+        }
+
+
+def main():
+    with FixtureServer() as server:
+        for name, value in server.environ().items():
+            print(f"export {name}={value}")
+        print("🛰 Serving fixtures, press Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: fotosource store-list extraction
+
+Compares the per-element parse_li path with the single evaluate() bulk path
+on a generated local page, so no network access is needed.
+
+Usage:
+    PYTHONPATH=. python benchmarks/fotosource_store_list.py [stores] [rounds]
+"""
+
+import asyncio
+import sys
+import time
+from html import escape
+
+from fotosource_scraper.scraper import UL_LOCATOR, extract_store_list, parse_li
+from utils.playwright import leased_browser
+
+DEFAULT_STORES = 3000
+DEFAULT_ROUNDS = 3
+
+
+def build_store_list_html(stores: int) -> str:
+    items = []
+    for i in range(stores):
+        link = (
+            f'<a class="d-store-finder-store-link" href="https://store{i}.example.com">'
+            "Website</a>"
+            if i % 3
+            else ""
+        )
+        lines = [
+            f"City {i}, ON, Canada",
+            f"Store {i}",
+            f"{i} Main Street",
+            f"(555) 000-{i:04d}",
+            "OPEN",
+            "- until 9:00 PM",
+        ]
+        texts = "".join(
+            f'<p class="d-store-finder-store-text">{escape(line)}</p>' for line in lines
+        )
+        items.append(f"<li>{texts}{link}</li>")
+
+    return (
+        '<html><body><ul class="d-stores-map-store-list d-store-finder-store-list">'
+        f'{"".join(items)}</ul></body></html>'
+    )
+
+
+async def per_element(page, region: str) -> list[dict]:
+    lis = await page.locator(f"{UL_LOCATOR} > li").all()
+    return [await parse_li(region, li) for li in lis]
+
+
+async def bench(name: str, page, extract, rounds: int) -> list[dict]:
+    timings = []
+    rows: list[dict] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        rows = await extract(page, "Bench")
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(
+        f"⏱ {name}: {len(rows)} rows, best {best:.3f}s, {len(rows) / best:.0f} rows/s"
+    )
+    return rows
+
+
+async def run(stores: int, rounds: int):
+    async with leased_browser() as browser:
+        page = await browser.new_page()
+        await page.set_content(build_store_list_html(stores))
+
+        slow = await bench("per-element", page, per_element, rounds)
+        fast = await bench("bulk", page, extract_store_list, rounds)
+
+        assert slow == fast, "bulk extraction differs from parse_li"
+        await page.close()
+
+
+def main():
+    stores = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STORES
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROUNDS
+    asyncio.run(run(stores, rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Measurements for the benchmark suite
+
+RssSampler follows the peak resident memory of this process and of the
+Chromium processes it spawned while one scenario runs. Stage timings come
+from utils.metrics.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+RSS_SAMPLE_SECONDS = 0.1
+CHROMIUM_PROCESS_NAMES = ("chrom", "headless_shell")
+
+
+def read_process_table() -> dict[int, tuple[int, str]]:
+    """pid -> (parent pid, command name) for every process visible in /proc."""
+    table = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            text = stat.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        # The command name is in parentheses and may itself contain spaces
+        name = text[text.index("(") + 1 : text.rindex(")")]
+        ppid = int(text[text.rindex(")") + 2 :].split()[1])
+        table[int(stat.parent.name)] = (ppid, name)
+    return table
+
+
+def descendants(pid: int, table: dict[int, tuple[int, str]]) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for child, (parent, _) in table.items():
+        children.setdefault(parent, []).append(child)
+    found, pending = [], [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def rss_bytes(pid: int) -> int:
+    try:
+        pages = Path(f"/proc/{pid}/statm").read_text(encoding="utf-8").split()[1]
+    except (OSError, IndexError):
+        return 0
+    return int(pages) * os.sysconf("SC_PAGE_SIZE")
+
+
+def chromium_rss_bytes() -> int:
+    table = read_process_table()
+    return sum(
+        rss_bytes(pid)
+        for pid in descendants(os.getpid(), table)
+        if any(part in table[pid][1].lower() for part in CHROMIUM_PROCESS_NAMES)
+    )
+
+
+class RssSampler:
+    """Polls /proc while a scenario runs; figures are None off Linux.
+
+    Both peaks cover this scenario only (unlike ru_maxrss, which never goes
+    down), so scenarios and --baseline runs can be compared.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.peak_python_bytes: int | None = None
+        self.peak_chromium_bytes: int | None = None
+        self.task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        if Path("/proc/self/statm").exists():
+            self.peak_python_bytes = 0
+            self.peak_chromium_bytes = 0
+            self.task = asyncio.create_task(self.poll())
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.sample()
+
+    async def poll(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def sample(self):
+        self.peak_python_bytes = max(
+            self.peak_python_bytes or 0, rss_bytes(os.getpid())
+        )
+        self.peak_chromium_bytes = max(
+            self.peak_chromium_bytes or 0, chromium_rss_bytes()
+        )
+
+    def report(self) -> dict[str, float | None]:
+        return {
+            "python_peak_rss_mb": to_mb(self.peak_python_bytes),
+            "chromium_peak_rss_mb": to_mb(self.peak_chromium_bytes),
+        }
+
+
+def to_mb(size: int | None) -> float | None:
+    return round(size / 1024 / 1024, 1) if size is not None else None
@@ -0,0 +1,194 @@
+"""
+Benchmark suite: every scraper against the local fixture server
+
+Starts benchmarks/fixture_server.py, points the scrapers at it through
+SCRAPER_BASE_URL_<SITE>, and reports items/sec, p50/p95/p99 latency per
+stage (the scrapers' utils.metrics spans) and peak RSS for Python and
+Chromium. Results are saved as JSON; pass a previous file as --baseline to
+print the difference.
+
+Usage:
+    PYTHONPATH=. python benchmarks/suite.py [scenario ...]
+        [--output=<file>] [--baseline=<file>]
+"""
+
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+from typing import Iterator
+
+from playwright.async_api import async_playwright
+
+import fotosource_scraper.scraper as fotosource
+import playwright_stock_scraper.scraper as stock
+import rss_fetch_from_search.scraper as rss
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.metrics import RssSampler
+from utils.metrics import METRICS
+from utils.playwright import WAIT_METRICS, BrowserPool
+from utils.rate_limit import RATE_LIMITER, HostLimit
+from utils.writer import save_json
+
+OUTPUT_DIR = "outputs/benchmarks"
+SYMBOLS = ["281A", "6501", "7203"]
+TECHS = ["fastapi", "django", "react", "nextjs", "pytorch", "redis"]
+# The fixture server is local; keep the limiter out of the measurement
+FIXTURE_HOST_LIMITS = {
+    "127.0.0.1": HostLimit(rate=1000.0, burst=1000, max_in_flight=100)
+}
+
+
+async def run_fotosource(pool: BrowserPool) -> int:
+    return len(await fotosource.scrape(pool))
+
+
+async def run_fotosource_parallel(pool: BrowserPool) -> int:
+    return len(await fotosource.scrape(pool, workers=4))
+
+
+async def run_minkabu(pool: BrowserPool, engine: str = "playwright") -> int:
+    rows = 0
+    for symbol in SYMBOLS:
+        rows += len(await stock.scrape(symbol, pool, engine=engine))
+    return rows
+
+
+async def run_minkabu_http(pool: BrowserPool) -> int:
+    return await run_minkabu(pool, engine="http")
+
+
+async def run_rss(pool: BrowserPool) -> int:
+    techs = {str(i): {"name": name} for i, name in enumerate(TECHS)}
+    results = await rss.fetch_techs_rss(techs, pool)
+    return sum(1 for tech in results if tech["rss"])
+
+
+SCENARIOS = {
+    "fotosource": run_fotosource,
+    "fotosource_parallel": run_fotosource_parallel,
+    "minkabu": run_minkabu,
+    "minkabu_http": run_minkabu_http,
+    "rss": run_rss,
+}
+
+
+async def run_scenario(name: str, pool: BrowserPool) -> dict:
+    WAIT_METRICS.records.clear()
+    METRICS.reset()
+    RATE_LIMITER.configure(FIXTURE_HOST_LIMITS)
+
+    print(f"🏃 Running {name}")
+    async with RssSampler() as rss_sampler:
+        started = time.perf_counter()
+        items = await SCENARIOS[name](pool)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "items_per_sec": round(items / elapsed, 2) if elapsed else 0.0,
+        # Stage spans come from the scrapers' own instrumentation (utils.metrics)
+        **METRICS.summary(),
+        "waits": WAIT_METRICS.summary(),
+        **rss_sampler.report(),
+    }
+
+
+@contextmanager
+def pointed_at(server: FixtureServer) -> Iterator[None]:
+    previous = {name: os.environ.get(name) for name in server.environ()}
+    os.environ.update(server.environ())
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+async def run_suite(scenarios: list[str]) -> dict:
+    results = []
+    with FixtureServer() as server, pointed_at(server):
+        async with async_playwright() as playwright, BrowserPool(playwright) as pool:
+            for name in scenarios:
+                results.append(await run_scenario(name, pool))
+        requests = server.requests
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "playwright": version("playwright"),
+        "platform": platform.platform(),
+        "fixture_requests": requests,
+        "scenarios": results,
+    }
+
+
+def print_report(report: dict, baseline: dict | None = None):
+    previous = {s["scenario"]: s for s in (baseline or {}).get("scenarios", [])}
+    for scenario in report["scenarios"]:
+        line = (
+            f"📊 {scenario['scenario']}: {scenario['items']} items in "
+            f"{scenario['seconds']:.2f}s ({scenario['items_per_sec']:.1f}/s), "
+            f"peak RSS python {scenario['python_peak_rss_mb']} MB, "
+            f"chromium {scenario['chromium_peak_rss_mb']} MB"
+        )
+        before = previous.get(scenario["scenario"])
+        if before and before["items_per_sec"]:
+            change = scenario["items_per_sec"] / before["items_per_sec"] - 1
+            line += f", {change:+.1%} vs baseline"
+        print(line)
+        network = scenario.get("network")
+        if network:
+            print(
+                f"   🌐 {network['requests']} requests, "
+                f"{network['bytes'] / 1024:.0f} KiB, {network['blocked']} blocked"
+            )
+        for entry in scenario["spans"]:
+            labels = ",".join(f"{k}={v}" for k, v in entry["labels"].items())
+            print(
+                f"   ⏱ {entry['stage']}{f'[{labels}]' if labels else ''}: "
+                f"n={entry['count']} p50 {entry['p50_ms']}ms "
+                f"p95 {entry['p95_ms']}ms p99 {entry['p99_ms']}ms"
+            )
+
+
+def parse_args(argv: list[str]) -> tuple[list[str], str, str | None]:
+    options = dict(arg[2:].partition("=")[::2] for arg in argv if arg.startswith("--"))
+    scenarios = [arg for arg in argv if not arg.startswith("--")] or list(SCENARIOS)
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        print(
+            f"❌ Unknown scenario(s): {', '.join(unknown)}; choose from {list(SCENARIOS)}"
+        )
+        sys.exit(1)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    output = options.get("output", f"{OUTPUT_DIR}/suite-{stamp}.json")
+    return scenarios, output, options.get("baseline")
+
+
+def main():
+    scenarios, output, baseline_path = parse_args(sys.argv[1:])
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = asyncio.run(run_suite(scenarios))
+    print_report(report, baseline)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    save_json(report, output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import httpx
+import pytest
+
+import playwright_stock_scraper.scraper as stock
+from benchmarks.fixture_server import (
+    DAILY_BAR_PAGES,
+    DAILY_BAR_ROWS,
+    FixtureServer,
+    search_keyword,
+)
+from benchmarks.suite import FIXTURE_HOST_LIMITS
+from rss_fetch_from_search.feeds import FeedVerifier
+from rss_fetch_from_search.scraper import extract_rss_links_via_http, is_github_url
+from utils.rate_limit import RATE_LIMITER
+
+
+def test_search_keyword_from_engine_queries():
+    assert search_keyword('q="react" releases site:github.com') == "react"
+    assert search_keyword("q=%22Next.js%22+site%3Agithub.com") == "next.js"
+    assert search_keyword("q=fastapi") == "fastapi"
+
+
+def test_fixture_server_renders_templates_per_site():
+    with FixtureServer() as server:
+        github = server.base_urls["github"]
+        brave = httpx.get(
+            f"{server.base_urls['brave']}/search",
+            params={"q": '"react" releases site:github.com'},
+        )
+        releases = httpx.get(f"{github}/facebook/react/releases")
+        missing = httpx.get(f"{server.base_urls['minkabu']}/stock/281A/news")
+
+    assert brave.status_code == 200
+    assert f'href="{github}/react/react/releases"' in brave.text
+    assert releases.headers["content-type"].startswith("text/html")
+    assert f"{github}/facebook/react/releases.atom" in releases.text
+    assert missing.status_code == 404
+    assert server.requests == 3
+
+
+def test_fixture_server_environ_points_every_site():
+    with FixtureServer() as server:
+        env = server.environ()
+
+    assert set(env) == {
+        "SCRAPER_BASE_URL_BRAVE",
+        "SCRAPER_BASE_URL_MOJEEK",
+        "SCRAPER_BASE_URL_BING",
+        "SCRAPER_BASE_URL_GITHUB",
+        "SCRAPER_BASE_URL_FOTOSOURCE",
+        "SCRAPER_BASE_URL_MINKABU",
+    }
+
+
+@pytest.mark.asyncio
+async def test_rss_http_path_runs_against_fixture_server(monkeypatch):
+    with FixtureServer() as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        github = server.base_urls["github"]
+
+        async with httpx.AsyncClient() as client:
+            links = await extract_rss_links_via_http(
+                client, f"{github}/tiangolo/fastapi/releases"
+            )
+
+    assert is_github_url(f"{github}/tiangolo/fastapi")
+    assert not is_github_url("https://github.com/tiangolo/fastapi")
+    assert links == [
+        f"{github}/tiangolo/fastapi/releases.atom",
+        f"{github}/tiangolo/fastapi/tags.atom",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_feed_verifier_heads_fixture_server_feeds():
+    with FixtureServer() as server:
+        github = server.base_urls["github"]
+        async with httpx.AsyncClient() as client:
+            verified = await FeedVerifier(client).verify(
+                f"{github}/tiangolo/fastapi/releases.atom"
+            )
+            head = await client.head(f"{github}/tiangolo/fastapi/releases")
+
+    assert verified == f"{github}/tiangolo/fastapi/releases.atom"
+    assert head.status_code == 200
+    assert head.content == b""
+
+
+@pytest.mark.asyncio
+async def test_minkabu_http_engine_pages_through_fixture_server(monkeypatch):
+    with FixtureServer() as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        RATE_LIMITER.configure(FIXTURE_HOST_LIMITS)
+
+        rows = await stock.scrape("281A", engine="http")
+
+    assert len(rows) == DAILY_BAR_PAGES * DAILY_BAR_ROWS
+    assert rows[0]["Date"] == "2025/07/01"
+    assert set(rows[0]) == {"Date", "Open", "High", "Low", "Close", "Volume"}
+    assert server.requests == DAILY_BAR_PAGES
@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.metrics import RssSampler, descendants, read_process_table
+
+
+def test_descendants_walks_process_tree():
+    table = {10: (1, "python"), 11: (10, "node"), 12: (11, "chrome"), 13: (1, "bash")}
+
+    assert sorted(descendants(10, table)) == [11, 12]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+@pytest.mark.asyncio
+async def test_rss_sampler_reports_peaks():
+    assert os.getpid() in read_process_table()
+
+    async with RssSampler(interval=0.01) as sampler:
+        await asyncio.sleep(0.02)
+
+    report = sampler.report()
+    assert report["python_peak_rss_mb"] > 0
+    assert report["chromium_peak_rss_mb"] == 0
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+@pytest.mark.asyncio
+async def test_rss_sampler_peak_is_per_scenario():
+    async with RssSampler(interval=0.01) as big:
+        ballast = b"x" * (64 * 1024 * 1024)
+        await asyncio.sleep(0.03)
+    del ballast
+
+    async with RssSampler(interval=0.01) as small:
+        await asyncio.sleep(0.03)
+
+    assert (
+        small.report()["python_peak_rss_mb"] < big.report()["python_peak_rss_mb"] - 32
+    )
@@ -0,0 +1,35 @@
+import pytest
+
+from utils.circuit_breaker import BREAKERS
+from utils.metrics import METRICS, METRICS_PATH_ENV
+from utils.playwright import WAIT_METRICS
+from utils.rate_limit import RATE_LIMITER
+from utils.retry import RETRY_BUDGET
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state(monkeypatch, tmp_path):
+    RATE_LIMITER.reset()
+    WAIT_METRICS.records.clear()
+    METRICS.reset()
+    BREAKERS.reset()
+    RETRY_BUDGET.reset()
+    # Entry points export metrics on exit; keep them out of outputs/
+    monkeypatch.setenv(METRICS_PATH_ENV, str(tmp_path / "metrics.json"))
+    yield
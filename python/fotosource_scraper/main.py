@@ -1,16 +1,33 @@
-import asyncio
-
-from playwright.async_api import Error
+import sys
 
 from fotosource_scraper.usecase import run_scraping_and_save
-from utils.error_handling import handle_playwright_error
+from utils.error_handling import run_scraper
+
+METRICS_PATH = "outputs/fotosource_scraper/metrics.json"
+QUEUE_OPTION = "--queue="
+USAGE = "❌ Usage: python main.py [<workers>] [--queue=<file>]"
+
+
+def parse_workers(args: list[str]) -> int:
+    if not args:
+        return 1
+    if len(args) > 1 or not args[0].isdigit() or int(args[0]) < 1:
+        print(USAGE)
+        sys.exit(1)
+    return int(args[0])
 
 
 def main():
-    try:
-        asyncio.run(run_scraping_and_save())
-    except Error as e:
-        handle_playwright_error(e)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith(QUEUE_OPTION)]
+    queues = [arg.removeprefix(QUEUE_OPTION) for arg in sys.argv[1:] if arg not in args]
+    workers = parse_workers(args)
+
+    run_scraper(
+        run_scraping_and_save(
+            workers=workers, queue_path=queues[0] if queues else None
+        ),
+        METRICS_PATH,
+    )
 
 
 if __name__ == "__main__":
@@ -1,61 +1,301 @@
-from playwright.async_api import async_playwright
+import asyncio
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator
 
-from utils.playwright import create_browser, create_context
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-URL = "https://fotosource.com/store-selector"
+from utils.blocking import THIRD_PARTY_HOSTS, BlockingPolicy
+from utils.endpoints import base_url
+from utils.job_queue import JobQueue, leased_batches
+from utils.metrics import METRICS
+from utils.playwright import (
+    WAIT_METRICS,
+    BrowserPool,
+    PagePool,
+    create_context,
+    leased_browser,
+    navigate,
+    snapshot_content,
+    wait_for_content_change,
+)
+
+STORE_SELECTOR_PATH = "/store-selector"
 PAGE_LOAD_TIMEOUT = 60000
+REGION_WAIT_TIMEOUT = 10000
 MENU_LOCATOR = "div.d-stores-map-menu.d-store-finder-menu"
 LINK_LOCATOR = "a.d-store-finder-store-link"
 UL_LOCATOR = "ul.d-stores-map-store-list.d-store-finder-store-list"
+SELECT_LOCATOR = (
+    f"{MENU_LOCATOR} > div > div > "
+    "div.d-stores-map-filters-form.d-store-finder-filters-form > div > select"
+)
+STORE_TEXT_LOCATOR = "p.d-store-finder-store-text"
+STORE_FIELDS = ["city", "name", "address", "phone", "status", "hours"]
+# Extra attempts for a region that failed, on a reloaded page
+REGION_RETRIES = 2
+BLOCKING_POLICY = BlockingPolicy(
+    name="fotosource",
+    resource_types=frozenset({"image", "stylesheet", "font", "media"}),
+    hosts=THIRD_PARTY_HOSTS,
+)
 
+# Same schema as parse_li, built for every <li> in a single evaluate() round trip
+STORE_LIST_SCRIPT = """
+([listSelector, textSelector, linkSelector, fields, region]) =>
+    Array.from(document.querySelectorAll(`${listSelector} > li`)).map((li) => {
+        const lines = Array.from(li.querySelectorAll(textSelector)).map(
+            (p) => p.innerText
+        );
+        const store = { region };
+        fields.forEach((field, i) => {
+            store[field] = lines[i] ?? "";
+        });
+        const link = li.querySelector(linkSelector);
+        store.link = link ? link.getAttribute("href") : "";
+        return store;
+    })
+"""
 
-async def scrape() -> list[dict]:
-    select_locator = (
-        f"{MENU_LOCATOR} > div > div > "
-        "div.d-stores-map-filters-form.d-store-finder-filters-form > div > select"
-    )
 
-    async with async_playwright() as p:
-        browser = await create_browser(p, headless=True)
-        context = await create_context(browser)
+@dataclass
+class Region:
+    index: int
+    value: str
+    name: str
+    attempts: int = 0
+
+
+async def scrape(
+    pool: BrowserPool | None = None, bulk: bool = True, workers: int = 1
+) -> list[dict]:
+    all_data = [row async for row in iter_stores(pool, bulk, workers)]
+    print(f"✅ Scraped {len(all_data)} rows")
+    return all_data
+
+
+async def iter_stores(
+    pool: BrowserPool | None = None, bulk: bool = True, workers: int = 1
+) -> AsyncIterator[dict]:
+    async with leased_browser(pool) as browser:
+        context = await create_context(browser, BLOCKING_POLICY)
         page = await context.new_page()
-        await page.goto(URL, timeout=PAGE_LOAD_TIMEOUT)
-        await page.wait_for_selector(MENU_LOCATOR, timeout=PAGE_LOAD_TIMEOUT)
-        print(f"✅ Scraping {URL}")
+        await open_store_selector(page)
+        print(f"✅ Scraping {store_selector_url()}")
 
         # await page.screenshot(path="screenshots/fotosource.png")
 
-        options = await page.locator(f"{select_locator} > option").all()
-        all_data = []
+        regions = await list_regions(page)
+
+        if workers > 1:
+            # The first page only lists the regions; each worker opens its own
+            await page.close()
+            async for store in iter_stores_parallel(context, regions, bulk, workers):
+                yield store
+        else:
+            for region in regions:
+                for store in await scrape_region_reloading(page, region, bulk):
+                    yield store
+            await page.close()
+
+        await context.close()
+
+        WAIT_METRICS.print_summary()
+
+
+async def scrape_queued_regions(
+    jobs: JobQueue, owner: str, pool: BrowserPool | None = None, bulk: bool = True
+):
+    """Scrape the regions this worker leases from a queue shared with others.
+
+    Whichever worker starts first fills the queue from the dropdown; each
+    region's stores are stored as its job result.
+    """
+    async with leased_browser(pool) as browser:
+        context = await create_context(browser, BLOCKING_POLICY)
+        page = await context.new_page()
+        try:
+            await open_store_selector(page)
+            regions = await list_regions(page)
+            jobs.enqueue_many(
+                {
+                    r.value: {"index": r.index, "value": r.value, "name": r.name}
+                    for r in regions
+                },
+                max_attempts=REGION_RETRIES + 1,
+            )
+
+            async for (job,) in leased_batches(jobs, owner):
+                try:
+                    stores = await scrape_region(page, Region(**job.payload), bulk)
+                except PlaywrightError as e:
+                    print(
+                        f"🔁 Region {job.payload['name']} failed, back to the queue: {e}"
+                    )
+                    jobs.fail(job, str(e))
+                    # Reload before the next region, the page may be in any state
+                    await open_store_selector(page)
+                    continue
+                jobs.complete(job, stores)
+        finally:
+            await page.close()
+            await context.close()
+
+    WAIT_METRICS.print_summary()
+
+
+async def iter_stores_parallel(
+    context, regions: list[Region], bulk: bool, workers: int
+) -> AsyncIterator[dict]:
+    queue: asyncio.Queue[Region] = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    results = {region.index: loop.create_future() for region in regions}
+    for region in regions:
+        queue.put_nowait(region)
+
+    workers = min(workers, len(regions))
+    async with PagePool(context, size=max(workers, 1)) as pages:
+        tasks = [
+            asyncio.create_task(region_worker(pages, queue, results, bulk))
+            for _ in range(workers)
+        ]
+        for task in tasks:
+            task.add_done_callback(partial(fail_pending_regions, results=results))
 
-        for option in options:
-            value = await option.get_attribute("value")
-            if value is None or value == "0":
+        try:
+            # Regions finish in any order but are yielded in dropdown order
+            for region in regions:
+                for store in await results[region.index]:
+                    yield store
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def region_worker(
+    pages: PagePool, queue: asyncio.Queue[Region], results: dict, bulk: bool
+):
+    # One lease per worker: the store selector stays loaded between regions
+    async with pages.lease() as page:
+        ready = False
+        while not queue.empty():
+            region = queue.get_nowait()
+            try:
+                if not ready:
+                    await open_store_selector(page)
+                    ready = True
+                stores = await scrape_region(page, region, bulk)
+            except PlaywrightError as e:
+                # Reload before the next region, the page may be in any state
+                ready = False
+                retry_or_skip_region(region, queue, results, e)
                 continue
+            results[region.index].set_result(stores)
+
+
+async def scrape_region_reloading(page, region: Region, bulk: bool) -> list[dict]:
+    # Sequential counterpart of region_worker: retry on a reloaded page, then skip
+    while True:
+        try:
+            return await scrape_region(page, region, bulk)
+        except PlaywrightError as e:
+            region.attempts += 1
+            if region.attempts > REGION_RETRIES:
+                print(
+                    f"❌ Skipping region {region.name} after {region.attempts} attempts: {e}"
+                )
+                return []
+            print(
+                f"🔁 Retrying region {region.name} ({region.attempts}/{REGION_RETRIES})"
+            )
+            await open_store_selector(page)
+
+
+def retry_or_skip_region(
+    region: Region, queue: asyncio.Queue[Region], results: dict, error: Exception
+):
+    region.attempts += 1
+    if region.attempts > REGION_RETRIES:
+        print(
+            f"❌ Skipping region {region.name} after {region.attempts} attempts: {error}"
+        )
+        results[region.index].set_result([])
+        return
+
+    print(f"🔁 Retrying region {region.name} ({region.attempts}/{REGION_RETRIES})")
+    queue.put_nowait(region)
+
+
+def fail_pending_regions(task: asyncio.Task, results: dict):
+    # A worker died on an unexpected error; don't leave the consumer waiting forever
+    if task.cancelled() or task.exception() is None:
+        return
+    for future in results.values():
+        if not future.done():
+            future.set_exception(task.exception())
+
 
-            await page.select_option(select_locator, value=value)
-            await page.wait_for_selector(UL_LOCATOR, timeout=PAGE_LOAD_TIMEOUT)
+def store_selector_url() -> str:
+    return f"{base_url('fotosource')}{STORE_SELECTOR_PATH}"
 
-            option_texts = await option.all_inner_texts()
-            option_text = option_texts[0] if option_texts else ""
-            print(f"🌎 Selecting region: {option_text}")
-            # await page.screenshot(path=f"screenshots/fotosource_{option_text}.png")
 
+async def open_store_selector(page):
+    with METRICS.span("fotosource.navigate"):
+        await navigate(page, store_selector_url(), timeout=PAGE_LOAD_TIMEOUT)
+        await page.wait_for_selector(MENU_LOCATOR, timeout=PAGE_LOAD_TIMEOUT)
+
+
+async def list_regions(page) -> list[Region]:
+    regions: list[Region] = []
+    options = await page.locator(f"{SELECT_LOCATOR} > option").all()
+    for option in options:
+        value = await option.get_attribute("value")
+        if value is None or value == "0":
+            continue
+
+        option_texts = await option.all_inner_texts()
+        option_text = option_texts[0] if option_texts else ""
+        regions.append(Region(len(regions), value, option_text))
+    return regions
+
+
+async def scrape_region(page, region: Region, bulk: bool = True) -> list[dict]:
+    with METRICS.span("fotosource.region"):
+        previous = await snapshot_content(page, UL_LOCATOR)
+        await page.select_option(SELECT_LOCATOR, value=region.value)
+        if not await wait_for_content_change(
+            page, UL_LOCATOR, previous, REGION_WAIT_TIMEOUT
+        ):
+            # The list on screen still belongs to the previous region
+            raise PlaywrightTimeoutError(
+                f"Store list did not change after selecting {region.name}"
+            )
+
+    print(f"🌎 Selecting region: {region.name}")
+    # await page.screenshot(path=f"screenshots/fotosource_{region.name}.png")
+
+    with METRICS.span("fotosource.parse", bulk=str(bulk)):
+        if bulk:
+            stores = await extract_store_list(page, region.name)
+        else:
             lis = await page.locator(f"{UL_LOCATOR} > li").all()
-            for li in lis:
-                all_data.append(await parse_li(option_text, li))
+            stores = [await parse_li(region.name, li) for li in lis]
 
-        await page.close()
-        await context.close()
-        await browser.close()
+    METRICS.count("fotosource.rows", len(stores))
+    return stores
 
-        print(f"✅ Scraped {len(all_data)} rows")
 
-        return all_data
+async def extract_store_list(page, region: str) -> list[dict]:
+    return await page.evaluate(
+        STORE_LIST_SCRIPT,
+        [UL_LOCATOR, STORE_TEXT_LOCATOR, LINK_LOCATOR, STORE_FIELDS, region],
+    )
 
 
 async def parse_li(region, li):
-    lines = await li.locator("p.d-store-finder-store-text").all_inner_texts()
+    lines = await li.locator(STORE_TEXT_LOCATOR).all_inner_texts()
     city_line = lines[0] if len(lines) > 0 else ""
     name_line = lines[1] if len(lines) > 1 else ""
     address_line = lines[2] if len(lines) > 2 else ""
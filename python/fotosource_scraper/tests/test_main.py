@@ -0,0 +1,27 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fotosource_scraper import main as main_module
+
+
+@pytest.mark.parametrize("arg", ["0", "-2", "two"])
+def test_main_rejects_bad_worker_count(arg, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["main.py", arg])
+
+    with pytest.raises(SystemExit) as e:
+        main_module.main()
+
+    assert e.value.code == 1
+    assert "Usage" in capsys.readouterr().out
+
+
+@patch("fotosource_scraper.main.run_scraper")
+@patch("fotosource_scraper.main.run_scraping_and_save", new_callable=MagicMock)
+def test_main_passes_workers_and_queue(mock_run, _mock_run_scraper, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "3", "--queue=jobs.db"])
+
+    main_module.main()
+
+    mock_run.assert_called_once_with(workers=3, queue_path="jobs.db")
@@ -1,8 +1,41 @@
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from playwright.async_api import Error, async_playwright
 
-from fotosource_scraper.scraper import LINK_LOCATOR, parse_li
+from fotosource_scraper.scraper import (
+    LINK_LOCATOR,
+    REGION_RETRIES,
+    STORE_LIST_SCRIPT,
+    UL_LOCATOR,
+    Region,
+    extract_store_list,
+    iter_stores_parallel,
+    parse_li,
+    scrape_queued_regions,
+    scrape_region,
+    scrape_region_reloading,
+)
+from utils.job_queue import FAILED, JobQueue
+
+STORE_LIST_HTML = """
+<ul class="d-stores-map-store-list d-store-finder-store-list">
+  <li>
+    <p class="d-store-finder-store-text">Tokyo</p>
+    <p class="d-store-finder-store-text">Test Store</p>
+    <p class="d-store-finder-store-text">Tokyo Address</p>
+    <p class="d-store-finder-store-text">03-1234-5678</p>
+    <p class="d-store-finder-store-text">Open</p>
+    <p class="d-store-finder-store-text">9:00-18:00</p>
+    <a class="d-store-finder-store-link" href="https://example.com/store">Web</a>
+  </li>
+  <li>
+    <p class="d-store-finder-store-text">Osaka</p>
+    <p class="d-store-finder-store-text">Mini Shop</p>
+  </li>
+</ul>
+"""
 
 
 @pytest.mark.asyncio
@@ -87,3 +120,184 @@ async def test_parse_li_partial_fields_missing():
         "hours": "",
         "link": "",
     }
+
+
+@pytest.mark.asyncio
+async def test_extract_store_list_uses_single_evaluate():
+    page = AsyncMock()
+    page.evaluate.return_value = [{"region": "Tokyo", "city": "Tokyo"}]
+
+    result = await extract_store_list(page, "Tokyo")
+
+    assert result == [{"region": "Tokyo", "city": "Tokyo"}]
+    page.evaluate.assert_awaited_once()
+    script, args = page.evaluate.await_args.args
+    assert script == STORE_LIST_SCRIPT
+    assert args[0] == UL_LOCATOR
+    assert args[-1] == "Tokyo"
+
+
+@pytest.mark.asyncio
+async def test_extract_store_list_matches_parse_li():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await page.set_content(STORE_LIST_HTML)
+
+        lis = await page.locator(f"{UL_LOCATOR} > li").all()
+        expected = [await parse_li("Region", li) for li in lis]
+        result = await extract_store_list(page, "Region")
+
+        assert result == expected
+        assert result[1]["link"] == ""
+
+        await browser.close()
+
+
+def make_regions(*names):
+    return [Region(i, str(i + 1), name) for i, name in enumerate(names)]
+
+
+def make_mock_context():
+    context = MagicMock()
+    context.new_page = AsyncMock(side_effect=AsyncMock)
+    return context
+
+
+async def collect_parallel(regions, fake_scrape_region, workers=2):
+    context = make_mock_context()
+    with patch(
+        "fotosource_scraper.scraper.open_store_selector", new=AsyncMock()
+    ) as mock_open, patch(
+        "fotosource_scraper.scraper.scrape_region", new=fake_scrape_region
+    ):
+        rows = [
+            row async for row in iter_stores_parallel(context, regions, True, workers)
+        ]
+    return rows, context, mock_open
+
+
+@pytest.mark.asyncio
+async def test_iter_stores_parallel_keeps_region_order():
+    delays = {"Alberta": 0.03, "Manitoba": 0.0, "Ontario": 0.01}
+
+    async def fake_scrape_region(_page, region, _bulk):
+        await asyncio.sleep(delays[region.name])
+        return [{"region": region.name}]
+
+    regions = make_regions("Alberta", "Manitoba", "Ontario")
+    rows, context, mock_open = await collect_parallel(regions, fake_scrape_region)
+
+    assert [r["region"] for r in rows] == ["Alberta", "Manitoba", "Ontario"]
+    # One page per worker, each opened once
+    assert context.new_page.await_count == 2
+    assert mock_open.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_stores_parallel_retries_failed_region():
+    calls = []
+
+    async def flaky_scrape_region(_page, region, _bulk):
+        calls.append(region.name)
+        if region.name == "Manitoba" and calls.count("Manitoba") == 1:
+            raise Error("Timeout 10000ms exceeded")
+        return [{"region": region.name}]
+
+    regions = make_regions("Alberta", "Manitoba", "Ontario")
+    rows, _, _ = await collect_parallel(regions, flaky_scrape_region)
+
+    assert [r["region"] for r in rows] == ["Alberta", "Manitoba", "Ontario"]
+    assert calls.count("Manitoba") == 2
+    assert calls.count("Alberta") == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_stores_parallel_skips_region_after_retries():
+    async def broken_scrape_region(_page, region, _bulk):
+        if region.name == "Yukon":
+            raise Error("select_option failed")
+        return [{"region": region.name}]
+
+    regions = make_regions("Alberta", "Yukon", "Ontario")
+    rows, _, _ = await collect_parallel(regions, broken_scrape_region)
+
+    assert [r["region"] for r in rows] == ["Alberta", "Ontario"]
+    assert regions[1].attempts == REGION_RETRIES + 1
+
+
+@pytest.mark.asyncio
+async def test_iter_stores_parallel_surfaces_unexpected_errors():
+    async def buggy_scrape_region(_page, region, _bulk):
+        if region.name == "Ontario":
+            raise KeyError("city")
+        return [{"region": region.name}]
+
+    regions = make_regions("Alberta", "Ontario")
+    with pytest.raises(KeyError):
+        await collect_parallel(regions, buggy_scrape_region)
+
+
+@pytest.mark.asyncio
+async def test_scrape_region_raises_when_store_list_does_not_change():
+    page = AsyncMock()
+
+    with patch(
+        "fotosource_scraper.scraper.snapshot_content", new=AsyncMock(return_value="")
+    ), patch(
+        "fotosource_scraper.scraper.wait_for_content_change",
+        new=AsyncMock(return_value=False),
+    ):
+        with pytest.raises(Error):
+            await scrape_region(page, Region(0, "1", "Hokkaido"))
+
+    page.evaluate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_scrape_region_reloading_retries_then_skips():
+    region = Region(0, "1", "Hokkaido")
+    stale = AsyncMock(side_effect=Error("store list did not change"))
+
+    with patch("fotosource_scraper.scraper.scrape_region", new=stale), patch(
+        "fotosource_scraper.scraper.open_store_selector", new=AsyncMock()
+    ) as mock_open:
+        rows = await scrape_region_reloading(AsyncMock(), region, True)
+
+    assert rows == []
+    assert stale.await_count == REGION_RETRIES + 1
+    assert mock_open.await_count == REGION_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_scrape_queued_regions_stores_results_per_region(tmp_path):
+    regions = make_regions("Alberta", "Yukon", "Ontario")
+
+    async def flaky_scrape_region(_page, region, _bulk):
+        if region.name == "Yukon":
+            raise Error("select_option failed")
+        return [{"region": region.name}]
+
+    lease = AsyncMock()
+    lease.__aenter__.return_value = MagicMock()
+    context = make_mock_context()
+    context.close = AsyncMock()
+    with JobQueue(tmp_path / "jobs.sqlite3", "fotosource") as jobs, patch(
+        "fotosource_scraper.scraper.leased_browser", return_value=lease
+    ), patch(
+        "fotosource_scraper.scraper.create_context",
+        new=AsyncMock(return_value=context),
+    ), patch(
+        "fotosource_scraper.scraper.open_store_selector", new=AsyncMock()
+    ), patch(
+        "fotosource_scraper.scraper.list_regions", new=AsyncMock(return_value=regions)
+    ), patch(
+        "fotosource_scraper.scraper.scrape_region", new=flaky_scrape_region
+    ):
+        await scrape_queued_regions(jobs, "w1")
+
+        assert jobs.results() == {
+            "1": [{"region": "Alberta"}],
+            "3": [{"region": "Ontario"}],
+        }
+        assert jobs.counts()[FAILED] == 1
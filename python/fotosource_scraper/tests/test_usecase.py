@@ -38,3 +38,45 @@ async def test_run_scraping_and_save_with_custom_path():
 
         mock_scrape.assert_awaited_once()
         mock_save_csv.assert_called_once_with(mock_data, custom_path)
+
+
+@pytest.mark.asyncio
+async def test_run_scraping_and_save_streaming(tmp_path):
+    async def fake_iter_stores(**_kwargs):
+        yield {"region": "Tokyo", "name": "Test Store"}
+        yield {"region": "Osaka", "name": "Another Store"}
+
+    output_file = tmp_path / "stores.csv"
+
+    with patch("fotosource_scraper.usecase.iter_stores", new=fake_iter_stores), patch(
+        "fotosource_scraper.usecase.save_csv"
+    ) as mock_save_csv:
+        await usecase.run_scraping_and_save(str(output_file), streaming=True)
+
+    mock_save_csv.assert_not_called()
+    assert output_file.read_text(encoding="utf-8").splitlines() == [
+        "region,name",
+        "Tokyo,Test Store",
+        "Osaka,Another Store",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_scraping_and_save_from_queue(tmp_path):
+    queue_path = str(tmp_path / "jobs.sqlite3")
+
+    async def fake_scrape_queued_regions(jobs, owner):
+        assert owner
+        jobs.enqueue_many({"2": {}, "1": {}})
+        for job in jobs.lease(owner, limit=2):
+            jobs.complete(job, [{"region": job.key}])
+
+    with patch(
+        "fotosource_scraper.usecase.scrape_queued_regions",
+        new=fake_scrape_queued_regions,
+    ), patch("fotosource_scraper.usecase.save_csv") as mock_save_csv:
+        await usecase.run_scraping_and_save("stores.csv", queue_path=queue_path)
+
+    mock_save_csv.assert_called_once_with(
+        [{"region": "2"}, {"region": "1"}], "stores.csv"
+    )
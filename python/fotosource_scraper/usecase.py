@@ -1,9 +1,30 @@
-from fotosource_scraper.scraper import scrape
-from utils.writer import save_csv
+from fotosource_scraper.scraper import iter_stores, scrape, scrape_queued_regions
+from utils.job_queue import JobQueue, default_owner
+from utils.writer import CsvStreamWriter, save_csv
+
+QUEUE_NAME = "fotosource"
 
 
 async def run_scraping_and_save(
     output_path: str = "outputs/fotosource_scraper/stores.csv",
+    streaming: bool = False,
+    workers: int = 1,
+    queue_path: str | None = None,
 ):
-    data = await scrape()
+    if queue_path:
+        with JobQueue(queue_path, QUEUE_NAME) as jobs:
+            await scrape_queued_regions(jobs, default_owner())
+            jobs.print_summary()
+            # Results come back in dropdown order, whichever worker scraped them
+            data = [store for stores in jobs.results().values() for store in stores]
+        save_csv(data, output_path)
+        return
+
+    if streaming:
+        # Rows hit the disk region by region; a crash keeps them in <output>.partial
+        with CsvStreamWriter(output_path) as writer:
+            await writer.write_from(iter_stores(workers=workers))
+        return
+
+    data = await scrape(workers=workers)
     save_csv(data, output_path)
@@ -0,0 +1,133 @@
+"""
+Browserless engine for Minkabu's daily_bar pages
+
+The price table and the 「次へ」 link are server-rendered, so each page is
+fetched over HTTP and parsed with html.parser, following a.next_page hrefs.
+Rows use the same schema as scraper.parse_row. Pages that need a browser
+(script-rendered table, script-driven pager) raise UnparseablePage so the
+caller can switch to the Playwright engine.
+"""
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import AsyncIterator
+from urllib.parse import urljoin
+
+import httpx
+
+from utils.metrics import METRICS
+from utils.rate_limit import RATE_LIMITER
+
+TABLE_ID = "fourvalue_timeline"
+NEXT_PAGE_CLASS = "next_page"
+ROW_COLUMN_COUNT = 7
+# Output key -> <td> index; column 5 (adjusted close) is skipped like parse_row
+ROW_COLUMNS = {"Date": 0, "Open": 1, "High": 2, "Low": 3, "Close": 4, "Volume": 6}
+
+
+class UnparseablePage(Exception):
+    pass
+
+
+@dataclass
+class DailyBarPage:
+    rows: list[dict] = field(default_factory=list)
+    next_href: str | None = None
+    has_table: bool = False
+
+
+class DailyBarParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.page = DailyBarPage()
+        self.table_depth = 0
+        # Browsers imply <tbody> when the markup omits it, so track <thead> instead
+        self.in_thead = False
+        self.cells: list[str] | None = None
+        self.text: list[str] | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        if tag == "a" and NEXT_PAGE_CLASS in (attributes.get("class") or "").split():
+            self.page.next_href = attributes.get("href") or ""
+        elif tag == "table" and (self.table_depth or attributes.get("id") == TABLE_ID):
+            self.page.has_table = True
+            self.table_depth += 1
+        elif not self.table_depth:
+            return
+        elif tag == "thead":
+            self.in_thead = True
+        elif tag == "tr" and not self.in_thead:
+            self.cells = []
+        elif tag == "td" and self.cells is not None:
+            self.text = []
+        elif tag == "br" and self.text is not None:
+            self.text.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self.table_depth:
+            return
+        if tag == "table":
+            self.table_depth -= 1
+        elif tag == "thead":
+            self.in_thead = False
+        elif tag == "td" and self.cells is not None and self.text is not None:
+            # Collapse whitespace the way innerText does for normal flow text
+            self.cells.append(" ".join("".join(self.text).split()))
+            self.text = None
+        elif tag == "tr" and self.cells is not None:
+            if len(self.cells) == ROW_COLUMN_COUNT:
+                row = {key: self.cells[index] for key, index in ROW_COLUMNS.items()}
+                self.page.rows.append(row)
+            self.cells = None
+
+    def handle_data(self, data: str) -> None:
+        if self.text is not None:
+            self.text.append(data)
+
+
+def parse_daily_bar(html: str) -> DailyBarPage:
+    parser = DailyBarParser()
+    parser.feed(html)
+    parser.close()
+    page = parser.page
+
+    if not page.has_table:
+        raise UnparseablePage(f"no #{TABLE_ID} table in the HTML")
+    if not page.rows:
+        raise UnparseablePage(
+            f"#{TABLE_ID} has no rows, it is probably script-rendered"
+        )
+    if page.next_href is not None and (
+        not page.next_href.strip("#") or page.next_href.startswith("javascript:")
+    ):
+        raise UnparseablePage(f"a.{NEXT_PAGE_CLASS} is script-driven")
+    return page
+
+
+async def fetch_daily_bar(client: httpx.AsyncClient, url: str) -> DailyBarPage:
+    with METRICS.span("minkabu.http_fetch"):
+        async with RATE_LIMITER.slot(url):
+            response = await client.get(url)
+        response.raise_for_status()
+    if "html" not in response.headers.get("content-type", ""):
+        raise UnparseablePage(f"{url} did not return HTML")
+    with METRICS.span("minkabu.http_parse"):
+        return parse_daily_bar(response.text)
+
+
+async def iter_http_pages(
+    client: httpx.AsyncClient, url: str, known_dates: set[str] | None = None
+) -> AsyncIterator[list[dict]]:
+    """Yield the rows of each page that are not in ``known_dates``."""
+    while True:
+        page = await fetch_daily_bar(client, url)
+        new_rows = [r for r in page.rows if r["Date"] not in (known_dates or ())]
+        yield new_rows
+
+        if known_dates and not new_rows:
+            print("🛑 Reached already stored dates, stop paging")
+            return
+        if page.next_href is None:
+            return
+        url = urljoin(url, page.next_href)
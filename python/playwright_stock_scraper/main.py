@@ -1,24 +1,49 @@
-import asyncio
 import sys
 
-from playwright.async_api import Error
+from playwright_stock_scraper.scraper import ENGINES
+from playwright_stock_scraper.usecase import load_watchlist, run_scraping_and_save
+from utils.error_handling import run_scraper
 
-from playwright_stock_scraper.usecase import run_scraping_and_save
-from utils.error_handling import handle_playwright_error
+METRICS_PATH = "outputs/playwright_stock_scraper/metrics.json"
+FLAGS = {"--incremental": "incremental", "--stream": "streaming"}
+FORMATS = ("csv", "json", "jsonl")
+WATCHLIST_OPTION = "--watchlist="
+ENGINE_OPTION = "--engine="
+QUEUE_OPTION = "--queue="
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("❌ Usage: python main.py <symbol> [csv|json]")
+    args = [arg for arg in sys.argv[1:] if arg not in FLAGS]
+    options = {FLAGS[arg]: True for arg in sys.argv[1:] if arg in FLAGS}
+
+    symbols = []
+    for arg in args:
+        if arg.startswith(WATCHLIST_OPTION):
+            symbols.extend(load_watchlist(arg.removeprefix(WATCHLIST_OPTION)))
+        elif arg.startswith(ENGINE_OPTION):
+            options["engine"] = arg.removeprefix(ENGINE_OPTION)
+        elif arg.startswith(QUEUE_OPTION):
+            options["queue_path"] = arg.removeprefix(QUEUE_OPTION)
+        elif arg not in FORMATS:
+            symbols.append(arg)
+    formats = [arg for arg in args if arg in FORMATS]
+    output_format = formats[0] if formats else "csv"
+
+    # A queue worker may join with no symbols of its own
+    if (not symbols and "queue_path" not in options) or options.get(
+        "engine", "auto"
+    ) not in ENGINES:
+        print(
+            "❌ Usage: python main.py <symbol>... [--watchlist=<file>] "
+            "[csv|json|jsonl] [--incremental] [--stream] "
+            f"[--engine={'|'.join(ENGINES)}] [--queue=<file>]"
+        )
         sys.exit(1)
 
-    symbol = sys.argv[1]
-    output_format = sys.argv[2] if len(sys.argv) > 2 else "csv"
+    # A single symbol keeps the original one-shot run
+    target = symbols[0] if len(symbols) == 1 else symbols
 
-    try:
-        asyncio.run(run_scraping_and_save(symbol, output_format))
-    except Error as e:
-        handle_playwright_error(e)
+    run_scraper(run_scraping_and_save(target, output_format, **options), METRICS_PATH)
 
 
 if __name__ == "__main__":
@@ -7,47 +7,251 @@ from Minkabu's stock detail page with paging support.
 
 import asyncio
 import random
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
 
-from playwright.async_api import async_playwright
+import httpx
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-MIN_SLEEP_SECONDS = 0.5
-MAX_SLEEP_SECONDS = 3.0
+from playwright_stock_scraper.http_engine import (
+    ROW_COLUMN_COUNT,
+    ROW_COLUMNS,
+    UnparseablePage,
+    iter_http_pages,
+)
+from utils.blocking import THIRD_PARTY_HOSTS, BlockingPolicy
+from utils.endpoints import base_url
+from utils.http_client import create_http_client
+from utils.metrics import METRICS
+from utils.network import NETWORK_STATS
+from utils.playwright import (
+    WAIT_METRICS,
+    BrowserPool,
+    leased_browser,
+    navigate,
+    snapshot_content,
+    wait_for_content_change,
+)
+from utils.rate_limit import RATE_LIMITER, HostLimit
+
+# Optional random jitter before each page; pacing itself comes from HOST_LIMITS
+MIN_SLEEP_SECONDS = 0.0
+MAX_SLEEP_SECONDS = 0.0
 PAGE_LOAD_TIMEOUT = 60000
 ROW_WAIT_TIMEOUT = 10000
-CLICK_WAIT_MILLISECONDS = 1000
+NEXT_PAGE_WAIT_BUDGET_MS = 10000
+TABLE_SELECTOR = "#fourvalue_timeline"
 
+TABLE_ROWS_SCRIPT = """
+([selector, columnCount, columns]) =>
+    Array.from(document.querySelectorAll(`${selector} tbody tr`))
+        .map((tr) => Array.from(tr.querySelectorAll("td"), (td) => td.innerText.trim()))
+        .filter((cells) => cells.length === columnCount)
+        .map((cells) =>
+            Object.fromEntries(
+                Object.entries(columns).map(([key, index]) => [key, cells[index]])
+            )
+        )
+"""
 
-async def scrape(symbol: str) -> list[dict]:
-    url = f"https://minkabu.jp/stock/{symbol}/daily_bar"
+HOST_LIMITS = {
+    "minkabu.jp": HostLimit(rate=0.5, burst=1, max_in_flight=2),
+}
+# "auto" reads pages over HTTP and only starts Chromium when that fails
+ENGINES = ("auto", "http", "playwright")
+# Stylesheets stay: paging clicks the real "next" button, which needs the normal layout
+BLOCKING_POLICY = BlockingPolicy(
+    name="minkabu",
+    resource_types=frozenset({"image", "font", "media"}),
+    hosts=THIRD_PARTY_HOSTS,
+)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
 
-        table_selector = "#fourvalue_timeline"
+@dataclass
+class SymbolStats:
+    symbol: str
+    rows: int = 0
+    pages: int = 0
+    elapsed_seconds: float = 0.0
+    error: str | None = None
 
-        await page.goto(url, timeout=PAGE_LOAD_TIMEOUT)
 
-        print(f"✅ Scraping {url}")
+class ScrapeEngines:
+    """The HTTP and Playwright engines for one run, shared by every symbol.
+
+    Chromium is leased only when the Playwright engine is first needed, so an
+    ``auto`` run over server-rendered pages never starts a browser.
+    """
+
+    def __init__(
+        self, engine: str = "auto", pool: BrowserPool | None = None, bulk: bool = True
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; choose from {ENGINES}")
+        self.engine = engine
+        self.pool = pool
+        self.bulk = bulk
+        self.stack = AsyncExitStack()
+        self.client: httpx.AsyncClient | None = None
+        self.browser: Any = None
+        self.browser_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "ScrapeEngines":
+        await self.stack.__aenter__()
+        if self.engine != "playwright":
+            self.client = await self.stack.enter_async_context(create_http_client())
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self.stack.__aexit__(*exc)
+
+    async def get_browser(self):
+        async with self.browser_lock:
+            if self.browser is None:
+                self.browser = await self.stack.enter_async_context(
+                    leased_browser(self.pool)
+                )
+        return self.browser
+
+    async def iter_symbol_rows(
+        self,
+        symbol: str,
+        known_dates: set[str] | None = None,
+        stats: SymbolStats | None = None,
+    ) -> AsyncIterator[dict]:
+        stats = stats or SymbolStats(symbol)
+        if self.client is not None:
+            try:
+                async for row in iter_symbol_rows_via_http(
+                    self.client, symbol, known_dates, stats
+                ):
+                    yield row
+                return
+            except (UnparseablePage, httpx.HTTPError) as e:
+                # Rows already written cannot be taken back, so only fall back
+                # before the first one
+                if self.engine == "http" or stats.rows:
+                    raise
+                print(f"⚠️ HTTP engine cannot read {symbol} ({e}), using Playwright")
+                METRICS.count("minkabu.engine_fallback")
+                stats.pages = 0
+
+        browser = await self.get_browser()
+        async for row in iter_symbol_rows(
+            browser, symbol, self.bulk, known_dates, stats
+        ):
+            yield row
+
+
+async def scrape(
+    symbol: str,
+    pool: BrowserPool | None = None,
+    bulk: bool = True,
+    known_dates: set[str] | None = None,
+    engine: str = "auto",
+) -> list[dict]:
+    all_data = [row async for row in iter_rows(symbol, pool, bulk, known_dates, engine)]
+    print(f"✅ Scraped {len(all_data)} rows")
+    return all_data
+
+
+async def iter_rows(
+    symbol: str,
+    pool: BrowserPool | None = None,
+    bulk: bool = True,
+    known_dates: set[str] | None = None,
+    engine: str = "auto",
+) -> AsyncIterator[dict]:
+    RATE_LIMITER.configure(HOST_LIMITS)
+
+    async with ScrapeEngines(engine, pool, bulk) as engines:
+        async for row in engines.iter_symbol_rows(symbol, known_dates):
+            yield row
 
-        all_data = []
+        WAIT_METRICS.print_summary()
+        RATE_LIMITER.print_summary()
+
+
+def daily_bar_url(symbol: str) -> str:
+    return f"{base_url('minkabu')}/stock/{symbol}/daily_bar"
+
+
+async def iter_symbol_rows_via_http(
+    client: httpx.AsyncClient,
+    symbol: str,
+    known_dates: set[str] | None = None,
+    stats: SymbolStats | None = None,
+) -> AsyncIterator[dict]:
+    url = daily_bar_url(symbol)
+    stats = stats or SymbolStats(symbol)
+    started = time.perf_counter()
+    print(f"✅ Scraping {url} over HTTP")
+    try:
+        async for new_rows in iter_http_pages(client, url, known_dates):
+            stats.pages += 1
+            stats.rows += len(new_rows)
+            METRICS.count("minkabu.rows", len(new_rows))
+            for row in new_rows:
+                yield row
+    finally:
+        stats.elapsed_seconds += time.perf_counter() - started
+
+
+async def iter_symbol_rows(
+    browser,
+    symbol: str,
+    bulk: bool = True,
+    known_dates: set[str] | None = None,
+    stats: SymbolStats | None = None,
+) -> AsyncIterator[dict]:
+    # Each symbol gets its own context so several can share one browser
+    url = daily_bar_url(symbol)
+    stats = stats or SymbolStats(symbol)
+    started = time.perf_counter()
+    context = await browser.new_context()
+    NETWORK_STATS.attach(context)
+    await BLOCKING_POLICY.install(context)
+    try:
+        page = await context.new_page()
+
+        with METRICS.span("minkabu.navigate"):
+            await navigate(page, url, timeout=PAGE_LOAD_TIMEOUT)
+
+        print(f"✅ Scraping {url}")
 
         while True:
-            rows = await extract_table_rows(page, table_selector)
-            for row in rows:
-                parsed = await parse_row(row)
-                if parsed is not None:
-                    all_data.append(parsed)
+            with METRICS.span("minkabu.parse", bulk=str(bulk)):
+                page_rows = await scrape_current_page(page, bulk)
+            new_rows = [r for r in page_rows if r["Date"] not in (known_dates or ())]
+            stats.pages += 1
+            stats.rows += len(new_rows)
+            METRICS.count("minkabu.rows", len(new_rows))
+            for row in new_rows:
+                yield row
+
+            if known_dates and page_rows and not new_rows:
+                print("🛑 Reached already stored dates, stop paging")
+                break
 
             if not await go_to_next_page(page):
                 break
+    finally:
+        stats.elapsed_seconds += time.perf_counter() - started
+        await context.close()
 
-        await browser.close()
 
-        print(f"✅ Scraped {len(all_data)} rows")
+async def scrape_current_page(page, bulk: bool = True) -> list[dict]:
+    if bulk:
+        return await extract_table_data(page, TABLE_SELECTOR)
 
-        return all_data
+    page_rows = []
+    for row in await extract_table_rows(page, TABLE_SELECTOR):
+        parsed = await parse_row(row)
+        if parsed is not None:
+            page_rows.append(parsed)
+    return page_rows
 
 
 async def extract_table_rows(page, selector):
@@ -55,9 +259,16 @@ async def extract_table_rows(page, selector):
     return await page.query_selector_all(f"{selector} tbody tr")
 
 
+async def extract_table_data(page, selector) -> list[dict]:
+    await page.wait_for_selector(selector, timeout=ROW_WAIT_TIMEOUT, state="attached")
+    return await page.evaluate(
+        TABLE_ROWS_SCRIPT, [selector, ROW_COLUMN_COUNT, ROW_COLUMNS]
+    )
+
+
 async def parse_row(row):
     cols = await row.query_selector_all("td")
-    if len(cols) != 7:
+    if len(cols) != ROW_COLUMN_COUNT:
         return None
     return {
         "Date": (await cols[0].inner_text()).strip(),
@@ -75,11 +286,19 @@ async def go_to_next_page(
 ) -> bool:
     next_button = await page.query_selector("a.next_page")
     if next_button:
-        sleep_time = random.uniform(min_sleep, max_sleep)  # nosec B311
-        print(f"🕒 Sleeping for {sleep_time:.2f} seconds before next page")
-        await asyncio.sleep(sleep_time)
+        if max_sleep > 0:
+            sleep_time = random.uniform(min_sleep, max_sleep)  # nosec B311
+            print(f"🕒 Sleeping for {sleep_time:.2f} seconds before next page")
+            await asyncio.sleep(sleep_time)
 
-        await next_button.click()
-        await page.wait_for_timeout(CLICK_WAIT_MILLISECONDS)
+        previous = await snapshot_content(page, f"{TABLE_SELECTOR} tbody")
+        with METRICS.span("minkabu.next_page"):
+            async with RATE_LIMITER.slot(base_url("minkabu")):
+                await next_button.click()
+                if not await wait_for_content_change(
+                    page, f"{TABLE_SELECTOR} tbody", previous, NEXT_PAGE_WAIT_BUDGET_MS
+                ):
+                    # The table on screen is still the page we just scraped
+                    raise PlaywrightTimeoutError("Table did not change after next page")
         return True
     return False
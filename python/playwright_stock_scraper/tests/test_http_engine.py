@@ -0,0 +1,142 @@
+import httpx
+import pytest
+from playwright.async_api import async_playwright
+
+from playwright_stock_scraper.http_engine import (
+    UnparseablePage,
+    iter_http_pages,
+    parse_daily_bar,
+)
+from playwright_stock_scraper.scraper import extract_table_data
+
+TABLE_HTML = """
+<table id="fourvalue_timeline">
+  <thead><tr><th>日時</th><th>始値</th></tr></thead>
+  <tbody>
+    <tr>
+      <td> 2024-01-02 </td><td>101</td><td>111</td><td>91</td>
+      <td><span>106</span></td><td>-</td><td>1,234</td>
+    </tr>
+    <tr><td>2024-01-01</td><td>100</td><td>110</td></tr>
+  </tbody>
+</table>
+"""
+EXPECTED_ROW = {
+    "Date": "2024-01-02",
+    "Open": "101",
+    "High": "111",
+    "Low": "91",
+    "Close": "106",
+    "Volume": "1,234",
+}
+
+
+def daily_bar_html(dates: list[str], next_href: str | None = None) -> str:
+    rows = "".join(
+        f"<tr><td>{d}</td><td>1</td><td>2</td><td>0</td><td>1</td><td>1</td>"
+        f"<td>100</td></tr>"
+        for d in dates
+    )
+    pager = f'<a class="btn next_page" href="{next_href}">次へ</a>' if next_href else ""
+    return f'<table id="fourvalue_timeline"><tbody>{rows}</tbody></table>{pager}'
+
+
+def test_parse_daily_bar_matches_parse_row_schema():
+    page = parse_daily_bar(TABLE_HTML)
+
+    assert page.rows == [EXPECTED_ROW]
+    assert page.next_href is None
+
+
+def test_parse_daily_bar_without_tbody_and_other_tables():
+    html = (
+        '<table id="other"><tr><td>x</td></tr></table>'
+        '<table id="fourvalue_timeline"><tr><td>2024/01/03</td><td>1</td><td>2</td>'
+        "<td>0</td><td>1</td><td>1</td><td>1,000<br>株</td></tr></table>"
+        '<a class="next_page" href="/stock/TEST/daily_bar?page=2">次へ</a>'
+    )
+
+    page = parse_daily_bar(html)
+
+    assert [r["Date"] for r in page.rows] == ["2024/01/03"]
+    assert page.rows[0]["Volume"] == "1,000 株"
+    assert page.next_href == "/stock/TEST/daily_bar?page=2"
+
+
+@pytest.mark.parametrize(
+    "html, reason",
+    [
+        ("<p>maintenance</p>", "no #fourvalue_timeline"),
+        ('<table id="fourvalue_timeline"><tbody></tbody></table>', "no rows"),
+        (daily_bar_html(["2024/01/01"], next_href="#"), "script-driven"),
+        (daily_bar_html(["2024/01/01"], "javascript:void(0)"), "script-driven"),
+    ],
+)
+def test_parse_daily_bar_rejects_pages_that_need_a_browser(html, reason):
+    with pytest.raises(UnparseablePage, match=reason):
+        parse_daily_bar(html)
+
+
+def make_client(pages: dict[str, str]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = pages.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, text=body, headers={"content-type": "text/html"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+URL = "https://minkabu.jp/stock/TEST/daily_bar"
+PAGES = {
+    URL: daily_bar_html(["2025/07/03", "2025/07/02"], "?page=2"),
+    f"{URL}?page=2": daily_bar_html(["2025/07/01", "2025/06/30"], "?page=3"),
+    f"{URL}?page=3": daily_bar_html(["2025/06/27"]),
+}
+
+
+@pytest.mark.asyncio
+async def test_iter_http_pages_follows_next_links():
+    async with make_client(PAGES) as client:
+        pages = [rows async for rows in iter_http_pages(client, URL)]
+
+    assert [[r["Date"] for r in rows] for rows in pages] == [
+        ["2025/07/03", "2025/07/02"],
+        ["2025/07/01", "2025/06/30"],
+        ["2025/06/27"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_http_pages_stops_at_known_dates():
+    async with make_client(PAGES) as client:
+        pages = [
+            rows
+            async for rows in iter_http_pages(
+                client, URL, known_dates={"2025/07/02", "2025/07/01", "2025/06/30"}
+            )
+        ]
+
+    assert [[r["Date"] for r in rows] for rows in pages] == [["2025/07/03"], []]
+
+
+@pytest.mark.asyncio
+async def test_iter_http_pages_raises_on_error_status():
+    async with make_client({}) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            async for _ in iter_http_pages(client, URL):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_http_engine_matches_playwright_bulk_extraction():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await page.set_content(TABLE_HTML)
+
+        assert parse_daily_bar(TABLE_HTML).rows == await extract_table_data(
+            page, "#fourvalue_timeline"
+        )
+
+        await browser.close()
@@ -1,10 +1,13 @@
+import os
 import sys
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from playwright.async_api import Error
 
 from playwright_stock_scraper import main as main_module
+from utils.metrics import METRICS_PATH_ENV
 
 
 def test_main_no_args(monkeypatch):
@@ -40,3 +43,73 @@ def test_main_playwright_error(mock_run, monkeypatch, capsys):
     captured = capsys.readouterr()
     assert "Playwright Error" in captured.out
     assert e.value.code == 1
+    # Metrics are still exported for the failed run
+    assert Path(os.environ[METRICS_PATH_ENV]).exists()
+
+
+@patch("playwright_stock_scraper.main.run_scraping_and_save")
+def test_main_incremental_flag(mock_run, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "TEST", "--incremental"])
+
+    mock_run.return_value = None
+
+    main_module.main()
+
+    mock_run.assert_called_once_with("TEST", "csv", incremental=True)
+
+
+@patch("playwright_stock_scraper.main.run_scraping_and_save")
+def test_main_stream_flag(mock_run, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "TEST", "jsonl", "--stream"])
+
+    mock_run.return_value = None
+
+    main_module.main()
+
+    mock_run.assert_called_once_with("TEST", "jsonl", streaming=True)
+
+
+@patch("playwright_stock_scraper.main.run_scraping_and_save")
+def test_main_multiple_symbols_and_watchlist(mock_run, monkeypatch, tmp_path):
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("7203\n6501\n", encoding="utf-8")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main.py", "281A", f"--watchlist={watchlist}", "json", "--incremental"],
+    )
+
+    mock_run.return_value = None
+
+    main_module.main()
+
+    mock_run.assert_called_once_with(["281A", "7203", "6501"], "json", incremental=True)
+
+
+@patch("playwright_stock_scraper.main.run_scraping_and_save")
+def test_main_engine_option(mock_run, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "TEST", "--engine=http"])
+
+    mock_run.return_value = None
+
+    main_module.main()
+
+    mock_run.assert_called_once_with("TEST", "csv", engine="http")
+
+
+def test_main_unknown_engine(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "TEST", "--engine=selenium"])
+    with pytest.raises(SystemExit) as e:
+        main_module.main()
+    assert e.value.code == 1
+
+
+@patch("playwright_stock_scraper.main.run_scraping_and_save")
+def test_main_queue_worker_without_symbols(mock_run, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "--queue=outputs/jobs.sqlite3"])
+
+    mock_run.return_value = None
+
+    main_module.main()
+
+    mock_run.assert_called_once_with([], "csv", queue_path="outputs/jobs.sqlite3")
@@ -1,13 +1,22 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
+from playwright_stock_scraper.http_engine import UnparseablePage
 from playwright_stock_scraper.scraper import (
+    TABLE_ROWS_SCRIPT,
+    ScrapeEngines,
+    SymbolStats,
+    extract_table_data,
     extract_table_rows,
     go_to_next_page,
+    iter_symbol_rows,
     parse_row,
+    scrape,
 )
+from utils.metrics import METRICS
 
 
 @pytest.mark.asyncio
@@ -92,6 +101,55 @@ async def test_extract_table_rows_empty():
         await browser.close()
 
 
+@pytest.mark.asyncio
+async def test_extract_table_data_matches_parse_row():
+    html = """
+    <table id="fourvalue_timeline">
+      <tbody>
+        <tr>
+          <td> 2024-01-02 </td><td>101</td><td>111</td><td>91</td>
+          <td>106</td><td>-</td><td>1,234</td>
+        </tr>
+        <tr><td>2024-01-01</td><td>100</td><td>110</td></tr>
+      </tbody>
+    </table>
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        rows = await extract_table_rows(page, "#fourvalue_timeline")
+        expected = [r for r in [await parse_row(row) for row in rows] if r]
+        result = await extract_table_data(page, "#fourvalue_timeline")
+
+        assert result == expected
+        assert result == [
+            {
+                "Date": "2024-01-02",
+                "Open": "101",
+                "High": "111",
+                "Low": "91",
+                "Close": "106",
+                "Volume": "1,234",
+            }
+        ]
+
+        await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_extract_table_data_uses_single_evaluate():
+    page = AsyncMock()
+    page.evaluate.return_value = []
+
+    assert await extract_table_data(page, "#fourvalue_timeline") == []
+
+    page.evaluate.assert_awaited_once()
+    assert page.evaluate.await_args.args[0] == TABLE_ROWS_SCRIPT
+    assert page.evaluate.await_args.args[1][0] == "#fourvalue_timeline"
+
+
 @pytest.mark.asyncio
 async def test_go_to_next_page_clicks_once():
     page = AsyncMock()
@@ -102,7 +160,18 @@ async def test_go_to_next_page_clicks_once():
 
     assert clicked is True
     next_button.click.assert_awaited_once()
-    page.wait_for_timeout.assert_awaited_once()
+    page.wait_for_function.assert_awaited_once()
+    assert page.wait_for_function.await_args.kwargs["timeout"] == 10000
+
+
+@pytest.mark.asyncio
+async def test_go_to_next_page_raises_when_table_does_not_change():
+    page = AsyncMock()
+    page.query_selector.return_value = AsyncMock()
+    page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+
+    with pytest.raises(PlaywrightTimeoutError):
+        await go_to_next_page(page, min_sleep=0, max_sleep=0)
 
 
 @pytest.mark.asyncio
@@ -113,3 +182,143 @@ async def test_go_to_next_page_no_button():
     clicked = await go_to_next_page(page, min_sleep=0.01, max_sleep=0.02)
 
     assert clicked is False
+
+
+def row(date: str) -> dict:
+    return {
+        "Date": date,
+        "Open": "1",
+        "High": "1",
+        "Low": "1",
+        "Close": "1",
+        "Volume": "1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_scrape_incremental_stops_at_known_page():
+    pages = [
+        [row("2025/07/03"), row("2025/07/02")],
+        [row("2025/07/01"), row("2025/06/30")],
+        [row("2025/06/27"), row("2025/06/26")],
+    ]
+    lease = AsyncMock()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=AsyncMock(on=MagicMock()))
+    lease.__aenter__.return_value = browser
+
+    with patch(
+        "playwright_stock_scraper.scraper.leased_browser", return_value=lease
+    ), patch(
+        "playwright_stock_scraper.scraper.scrape_current_page",
+        new=AsyncMock(side_effect=pages),
+    ) as mock_page_rows, patch(
+        "playwright_stock_scraper.scraper.go_to_next_page",
+        new=AsyncMock(return_value=True),
+    ) as mock_next:
+        data = await scrape(
+            "TEST",
+            known_dates={"2025/07/02", "2025/07/01", "2025/06/30"},
+            engine="playwright",
+        )
+
+    assert data == [row("2025/07/03")]
+    assert mock_page_rows.await_count == 2
+    mock_next.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_iter_symbol_rows_records_stats():
+    context = AsyncMock(on=MagicMock())
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=context)
+    stats = SymbolStats("TEST")
+
+    with patch("playwright_stock_scraper.scraper.navigate", new=AsyncMock()), patch(
+        "playwright_stock_scraper.scraper.scrape_current_page",
+        new=AsyncMock(side_effect=[[row("2025/07/02"), row("2025/07/01")], []]),
+    ), patch(
+        "playwright_stock_scraper.scraper.go_to_next_page",
+        new=AsyncMock(side_effect=[True, False]),
+    ):
+        data = [r async for r in iter_symbol_rows(browser, "TEST", stats=stats)]
+
+    assert len(data) == 2
+    assert (stats.rows, stats.pages) == (2, 2)
+    assert stats.elapsed_seconds > 0
+    context.close.assert_awaited_once()
+
+
+def fake_rows(*dates, error=None):
+    async def iter_rows(*_args, **_kwargs):
+        for date in dates:
+            yield {"Date": date}
+        if error is not None:
+            raise error
+
+    return iter_rows
+
+
+@pytest.mark.asyncio
+async def test_scrape_engines_auto_uses_http_without_browser():
+    with patch(
+        "playwright_stock_scraper.scraper.iter_symbol_rows_via_http",
+        new=fake_rows("2025/07/02", "2025/07/01"),
+    ), patch("playwright_stock_scraper.scraper.leased_browser") as mock_lease:
+        async with ScrapeEngines("auto") as engines:
+            data = [r async for r in engines.iter_symbol_rows("TEST")]
+
+    assert [r["Date"] for r in data] == ["2025/07/02", "2025/07/01"]
+    mock_lease.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_scrape_engines_auto_falls_back_to_playwright():
+    lease = AsyncMock()
+    lease.__aenter__.return_value = MagicMock()
+    stats = SymbolStats("TEST", pages=1)
+
+    with patch(
+        "playwright_stock_scraper.scraper.iter_symbol_rows_via_http",
+        new=fake_rows(error=UnparseablePage("a.next_page is script-driven")),
+    ), patch(
+        "playwright_stock_scraper.scraper.leased_browser", return_value=lease
+    ) as mock_lease, patch(
+        "playwright_stock_scraper.scraper.iter_symbol_rows",
+        new=fake_rows("2025/07/01"),
+    ):
+        async with ScrapeEngines("auto") as engines:
+            data = [r async for r in engines.iter_symbol_rows("TEST", stats=stats)]
+            # The browser is leased once and kept for the other symbols
+            data += [r async for r in engines.iter_symbol_rows("OTHER")]
+
+    assert [r["Date"] for r in data] == ["2025/07/01", "2025/07/01"]
+    assert stats.pages == 0
+    mock_lease.assert_called_once_with(None)
+    assert METRICS.summary()["counters"] == [
+        {"name": "minkabu.engine_fallback", "labels": {}, "value": 2}
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine, stats", [("http", None), ("auto", "partial")])
+async def test_scrape_engines_does_not_fall_back(engine, stats):
+    # Forced HTTP runs, and runs that already produced rows, surface the error
+    rows = ("2025/07/02",) if stats else ()
+    symbol_stats = SymbolStats("TEST", rows=len(rows))
+
+    with patch(
+        "playwright_stock_scraper.scraper.iter_symbol_rows_via_http",
+        new=fake_rows(*rows, error=UnparseablePage("no rows")),
+    ), patch("playwright_stock_scraper.scraper.leased_browser") as mock_lease:
+        async with ScrapeEngines(engine) as engines:
+            with pytest.raises(UnparseablePage):
+                async for _ in engines.iter_symbol_rows("TEST", stats=symbol_stats):
+                    pass
+
+    mock_lease.assert_not_called()
+
+
+def test_scrape_engines_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        ScrapeEngines("selenium")
@@ -1,8 +1,20 @@
-from unittest.mock import patch
+import asyncio
+import csv
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from playwright.async_api import Error
 
-from playwright_stock_scraper.usecase import run_scraping_and_save
+from playwright_stock_scraper.http_engine import UnparseablePage
+from playwright_stock_scraper.usecase import (
+    WatchlistOptions,
+    load_watchlist,
+    run_queued_watchlist,
+    run_scraping_and_save,
+    run_watchlist,
+)
+from utils.job_queue import FAILED, JobQueue
 
 
 @pytest.mark.asyncio
@@ -13,7 +25,7 @@ async def test_run_scraping_and_save_json(mock_scrape, mock_save_json):
 
     await run_scraping_and_save("TEST", "json", output_path="outputs/test")
 
-    mock_scrape.assert_called_once_with("TEST")
+    mock_scrape.assert_called_once_with("TEST", engine="auto")
     mock_save_json.assert_called_once_with({"price": 1234}, "outputs/test/TEST.json")
 
 
@@ -25,5 +37,233 @@ async def test_run_scraping_and_save_csv(mock_scrape, mock_save_csv):
 
     await run_scraping_and_save("AAA", "csv", output_path="outputs/test")
 
-    mock_scrape.assert_called_once_with("AAA")
+    mock_scrape.assert_called_once_with("AAA", engine="auto")
     mock_save_csv.assert_called_once_with({"price": 5678}, "outputs/test/AAA.csv")
+
+
+@pytest.mark.asyncio
+async def test_run_scraping_and_save_incremental_merges_csv_newest_first(tmp_path):
+    output_file = tmp_path / "TEST.csv"
+    output_file.write_text(
+        "Date,Open,High,Low,Close,Volume\n2025/07/01,1,2,0,1,100\n", encoding="utf-8"
+    )
+    new_row = {
+        "Date": "2025/07/02",
+        "Open": "1",
+        "High": "3",
+        "Low": "1",
+        "Close": "2",
+        "Volume": "200",
+    }
+
+    with patch(
+        "playwright_stock_scraper.usecase.scrape",
+        new=AsyncMock(return_value=[new_row]),
+    ) as mock_scrape:
+        await run_scraping_and_save(
+            "test", "csv", output_path=str(tmp_path), incremental=True
+        )
+
+    mock_scrape.assert_awaited_once_with(
+        "test", known_dates={"2025/07/01"}, engine="auto"
+    )
+    with open(output_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["Date"] for r in rows] == ["2025/07/02", "2025/07/01"]
+
+
+@pytest.mark.asyncio
+async def test_run_scraping_and_save_incremental_merges_json(tmp_path):
+    output_file = tmp_path / "TEST.json"
+    output_file.write_text(json.dumps([{"Date": "2025/07/01"}]), encoding="utf-8")
+
+    with patch(
+        "playwright_stock_scraper.usecase.scrape",
+        new=AsyncMock(return_value=[{"Date": "2025/07/02"}]),
+    ):
+        await run_scraping_and_save(
+            "TEST", "json", output_path=str(tmp_path), incremental=True
+        )
+
+    assert json.loads(output_file.read_text(encoding="utf-8")) == [
+        {"Date": "2025/07/02"},
+        {"Date": "2025/07/01"},
+    ]
+
+
+@pytest.mark.asyncio
+@patch("playwright_stock_scraper.usecase.save_csv")
+@patch("playwright_stock_scraper.usecase.scrape")
+async def test_run_scraping_and_save_incremental_without_history(
+    mock_scrape, mock_save_csv, tmp_path
+):
+    mock_scrape.return_value = [{"Date": "2025/07/01"}]
+
+    await run_scraping_and_save(
+        "NEW", "csv", output_path=str(tmp_path), incremental=True
+    )
+
+    mock_scrape.assert_called_once_with("NEW", engine="auto")
+    mock_save_csv.assert_called_once_with(
+        [{"Date": "2025/07/01"}], f"{tmp_path}/NEW.csv"
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_scraping_and_save_jsonl_streams_rows(tmp_path):
+    async def fake_iter_rows(symbol, engine):
+        assert (symbol, engine) == ("TEST", "auto")
+        yield {"Date": "2025/07/02"}
+        yield {"Date": "2025/07/01"}
+
+    with patch("playwright_stock_scraper.usecase.iter_rows", new=fake_iter_rows):
+        await run_scraping_and_save("TEST", "jsonl", output_path=str(tmp_path))
+
+    lines = (tmp_path / "TEST.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"Date": "2025/07/02"},
+        {"Date": "2025/07/01"},
+    ]
+
+
+@pytest.mark.asyncio
+@patch("playwright_stock_scraper.usecase.save_csv")
+async def test_run_scraping_and_save_streaming_csv(mock_save_csv, tmp_path):
+    async def fake_iter_rows(_symbol, **_kwargs):
+        yield {"Date": "2025/07/02", "Close": "2"}
+
+    with patch("playwright_stock_scraper.usecase.iter_rows", new=fake_iter_rows):
+        await run_scraping_and_save(
+            "TEST", "csv", output_path=str(tmp_path), streaming=True
+        )
+
+    mock_save_csv.assert_not_called()
+    with open(tmp_path / "TEST.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == [{"Date": "2025/07/02", "Close": "2"}]
+
+
+def make_engines(iter_symbol_rows):
+    engines = MagicMock()
+    engines.iter_symbol_rows = iter_symbol_rows
+    lease = AsyncMock()
+    lease.__aenter__.return_value = engines
+    return lease
+
+
+@pytest.mark.asyncio
+async def test_run_watchlist_shares_one_engine_set_and_bounds_concurrency(tmp_path):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_iter_symbol_rows(symbol, known_dates=None, stats=None):
+        nonlocal in_flight, max_in_flight
+        assert known_dates is None
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        stats.pages += 1
+        stats.rows += 1
+        yield {"Date": "2025/07/01", "Symbol": symbol}
+
+    options = WatchlistOptions(output_path=str(tmp_path), concurrency=2)
+    with patch(
+        "playwright_stock_scraper.usecase.ScrapeEngines",
+        return_value=make_engines(fake_iter_symbol_rows),
+    ) as mock_engines:
+        stats = await run_watchlist(["AAA", "BBB", "CCC", "AAA"], options)
+
+    mock_engines.assert_called_once_with("auto")
+    assert max_in_flight == 2
+    assert [s.symbol for s in stats] == ["AAA", "BBB", "CCC"]
+    assert [(s.rows, s.pages) for s in stats] == [(1, 1)] * 3
+    with open(tmp_path / "BBB.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == [{"Date": "2025/07/01", "Symbol": "BBB"}]
+
+
+@pytest.mark.asyncio
+async def test_run_watchlist_keeps_going_after_failed_symbol(tmp_path, capsys):
+    async def fake_iter_symbol_rows(symbol, known_dates=None, stats=None):
+        assert known_dates is None and stats is not None
+        if symbol == "BAD":
+            raise Error("page.goto: net::ERR_NAME_NOT_RESOLVED")
+        if symbol == "HTTP":
+            raise UnparseablePage("a.next_page is script-driven")
+        yield {"Date": "2025/07/01"}
+
+    options = WatchlistOptions(
+        output_format="json", output_path=str(tmp_path), engine="http"
+    )
+    with patch(
+        "playwright_stock_scraper.usecase.ScrapeEngines",
+        return_value=make_engines(fake_iter_symbol_rows),
+    ) as mock_engines:
+        stats = await run_watchlist(["BAD", "GOOD", "HTTP"], options)
+
+    mock_engines.assert_called_once_with("http")
+    assert "ERR_NAME_NOT_RESOLVED" in stats[0].error
+    assert stats[1].error is None
+    assert "script-driven" in stats[2].error
+    assert json.loads((tmp_path / "GOOD.json").read_text(encoding="utf-8")) == [
+        {"Date": "2025/07/01"}
+    ]
+    assert not (tmp_path / "BAD.json").exists()
+    assert "📊 Watchlist: 3 symbols, 2 failed" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_run_queued_watchlist_shares_work_and_retries_failures(tmp_path):
+    calls = []
+
+    async def fake_iter_symbol_rows(symbol, known_dates=None, stats=None):
+        assert known_dates is None and stats is not None
+        calls.append(symbol)
+        if symbol == "BAD":
+            raise Error("page.goto: net::ERR_NAME_NOT_RESOLVED")
+        stats.rows += 1
+        yield {"Date": "2025/07/01"}
+
+    queue_path = str(tmp_path / "jobs.sqlite3")
+    options = WatchlistOptions(output_path=str(tmp_path), concurrency=2)
+    with patch(
+        "playwright_stock_scraper.usecase.ScrapeEngines",
+        return_value=make_engines(fake_iter_symbol_rows),
+    ):
+        first = await run_queued_watchlist(["AAA", "BAD"], queue_path, options, "w1")
+        # A second worker finds nothing left, even for symbols it adds again
+        second = await run_queued_watchlist(["AAA"], queue_path, options, "w2")
+
+    assert calls.count("AAA") == 1
+    assert calls.count("BAD") == 3
+    assert [s.symbol for s in first] == ["AAA", "BAD", "BAD", "BAD"]
+    assert not second
+    with JobQueue(queue_path, "minkabu") as jobs:
+        assert jobs.results() == {"AAA": {"rows": 1, "pages": 0}}
+        assert jobs.counts()[FAILED] == 1
+
+
+@pytest.mark.asyncio
+@patch("playwright_stock_scraper.usecase.run_queued_watchlist", new_callable=AsyncMock)
+async def test_run_scraping_and_save_with_queue(mock_run_queued):
+    await run_scraping_and_save("AAA", "json", queue_path="jobs.sqlite3")
+
+    mock_run_queued.assert_awaited_once_with(
+        ["AAA"], "jobs.sqlite3", WatchlistOptions("json", queue_path="jobs.sqlite3")
+    )
+
+
+@pytest.mark.asyncio
+@patch("playwright_stock_scraper.usecase.run_watchlist", new_callable=AsyncMock)
+async def test_run_scraping_and_save_with_symbol_list(mock_run_watchlist):
+    await run_scraping_and_save(["AAA", "BBB"], "json", output_path="outputs/test")
+
+    mock_run_watchlist.assert_awaited_once_with(
+        ["AAA", "BBB"], WatchlistOptions("json", "outputs/test", False, False)
+    )
+
+
+def test_load_watchlist_skips_comments_and_blank_lines(tmp_path):
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("# core\n281A\n\n7203  # Toyota\n", encoding="utf-8")
+
+    assert load_watchlist(watchlist) == ["281A", "7203"]
@@ -1,15 +1,273 @@
-from playwright_stock_scraper.scraper import scrape
-from utils.writer import save_csv, save_json
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+
+from playwright_stock_scraper.http_engine import UnparseablePage
+from playwright_stock_scraper.scraper import (
+    HOST_LIMITS,
+    ScrapeEngines,
+    SymbolStats,
+    iter_rows,
+    scrape,
+)
+from utils.job_queue import JobQueue, default_owner, leased_batches
+from utils.playwright import WAIT_METRICS
+from utils.rate_limit import RATE_LIMITER
+from utils.reader import load_csv, load_json, load_jsonl
+from utils.writer import (
+    CsvStreamWriter,
+    JsonLinesStreamWriter,
+    save_csv,
+    save_json,
+)
+
+# Formats that can be written row by row while the scraper is still paging
+STREAM_WRITERS = {"csv": CsvStreamWriter, "jsonl": JsonLinesStreamWriter}
+MAX_CONCURRENT_SYMBOLS = 4
+QUEUE_NAME = "minkabu"
+
+
+@dataclass
+class WatchlistOptions:
+    output_format: str = "csv"
+    output_path: str = "outputs/playwright_stock_scraper"
+    incremental: bool = False
+    streaming: bool = False
+    concurrency: int = MAX_CONCURRENT_SYMBOLS
+    engine: str = "auto"
+    # Shared SQLite job queue; symbols are pulled from it instead of scraped in turn
+    queue_path: str | None = None
 
 
 async def run_scraping_and_save(
-    symbol: str,
+    symbol: str | list[str],
     output_format: str = "csv",
     output_path: str = "outputs/playwright_stock_scraper",
+    **flags,
 ):
-    data = await scrape(symbol)
+    # flags: incremental, streaming and engine, as in WatchlistOptions
+    options = WatchlistOptions(output_format, output_path, **flags)
+    if options.queue_path:
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        await run_queued_watchlist(symbols, options.queue_path, options)
+        return
+    if not isinstance(symbol, str):
+        await run_watchlist(symbol, options)
+        return
+
+    engine = options.engine
     output_file = f"{output_path}/{symbol.upper()}.{output_format}"
+    existing = (
+        load_saved_rows(output_file, output_format) if options.incremental else []
+    )
+    if existing:
+        await refresh_saved_rows(symbol, output_format, output_file, existing, engine)
+        return
+
+    if output_format == "jsonl" or (
+        options.streaming and output_format in STREAM_WRITERS
+    ):
+        await stream_rows(symbol, output_format, output_file, engine)
+        return
+
+    data = await scrape(symbol, engine=engine)
+    save_rows(data, output_format, output_file)
+
+
+async def run_watchlist(
+    symbols: list[str], options: WatchlistOptions | None = None
+) -> list[SymbolStats]:
+    options = options or WatchlistOptions()
+    semaphore = asyncio.Semaphore(options.concurrency)
+    RATE_LIMITER.configure(HOST_LIMITS)
+    started = time.perf_counter()
+
+    async with ScrapeEngines(options.engine) as engines:
+        stats = await asyncio.gather(
+            *(
+                scrape_watchlist_symbol(engines, symbol, options, semaphore)
+                for symbol in dict.fromkeys(symbols)
+            )
+        )
+
+    WAIT_METRICS.print_summary()
+    RATE_LIMITER.print_summary()
+    print_watchlist_summary(stats, time.perf_counter() - started)
+    return stats
+
+
+async def run_queued_watchlist(
+    symbols: list[str],
+    queue_path: str,
+    options: WatchlistOptions | None = None,
+    owner: str | None = None,
+) -> list[SymbolStats]:
+    """Enqueue ``symbols`` and scrape whatever this worker leases from the queue.
+
+    Failed symbols go back to the queue for another attempt, on this worker
+    or any other one sharing the file.
+    """
+    options = options or WatchlistOptions()
+    owner = owner or default_owner()
+    semaphore = asyncio.Semaphore(options.concurrency)
+    RATE_LIMITER.configure(HOST_LIMITS)
+    started = time.perf_counter()
+    stats: list[SymbolStats] = []
+
+    with JobQueue(queue_path, QUEUE_NAME) as jobs:
+        jobs.enqueue_many({s.upper(): {"symbol": s} for s in symbols})
+        async with ScrapeEngines(options.engine) as engines:
+            async for batch in leased_batches(jobs, owner, options.concurrency):
+                batch_stats = await asyncio.gather(
+                    *(
+                        scrape_watchlist_symbol(
+                            engines, job.payload["symbol"], options, semaphore
+                        )
+                        for job in batch
+                    )
+                )
+                for job, symbol_stats in zip(batch, batch_stats):
+                    if symbol_stats.error:
+                        jobs.fail(job, symbol_stats.error)
+                    else:
+                        jobs.complete(
+                            job,
+                            {"rows": symbol_stats.rows, "pages": symbol_stats.pages},
+                        )
+                stats.extend(batch_stats)
+        jobs.print_summary()
+
+    WAIT_METRICS.print_summary()
+    RATE_LIMITER.print_summary()
+    print_watchlist_summary(stats, time.perf_counter() - started)
+    return stats
+
+
+async def scrape_watchlist_symbol(
+    engines: ScrapeEngines,
+    symbol: str,
+    options: WatchlistOptions,
+    semaphore: asyncio.Semaphore,
+) -> SymbolStats:
+    stats = SymbolStats(symbol)
+    output_file = f"{options.output_path}/{symbol.upper()}.{options.output_format}"
+    async with semaphore:
+        try:
+            await save_symbol_rows(engines, stats, options, output_file)
+        except (PlaywrightError, UnparseablePage, httpx.HTTPError) as e:
+            # One broken symbol must not abort the rest of the watchlist
+            stats.error = str(e)
+            print(f"❌ Failed to scrape {symbol}: {e}")
+    return stats
+
+
+async def save_symbol_rows(
+    engines: ScrapeEngines,
+    stats: SymbolStats,
+    options: WatchlistOptions,
+    output_file: str,
+):
+    output_format = options.output_format
+    existing = (
+        load_saved_rows(output_file, output_format) if options.incremental else []
+    )
+    known_dates = {row["Date"] for row in existing} or None
+    rows = engines.iter_symbol_rows(stats.symbol, known_dates=known_dates, stats=stats)
+
+    if not existing and (
+        output_format == "jsonl"
+        or (options.streaming and output_format in STREAM_WRITERS)
+    ):
+        with STREAM_WRITERS[output_format](output_file) as writer:
+            await writer.write_from(rows)
+        return
+
+    data = [row async for row in rows]
+    if existing:
+        merge_saved_rows(data, existing, output_format, output_file)
+    else:
+        save_rows(data, output_format, output_file)
+
+
+def print_watchlist_summary(stats: list[SymbolStats], elapsed_seconds: float):
+    for s in stats:
+        status = f"❌ {s.error}" if s.error else "✅"
+        print(
+            f"📈 {s.symbol}: {s.rows} rows, {s.pages} pages, "
+            f"{s.elapsed_seconds:.1f}s {status}"
+        )
+    failed = sum(1 for s in stats if s.error)
+    print(
+        f"📊 Watchlist: {len(stats)} symbols, {failed} failed, "
+        f"{sum(s.rows for s in stats)} rows in {elapsed_seconds:.1f}s"
+    )
+
+
+def load_watchlist(input_file) -> list[str]:
+    symbols = []
+    with open(input_file, encoding="utf-8") as f:
+        for line in f:
+            symbol = line.split("#", 1)[0].strip()
+            if symbol:
+                symbols.append(symbol)
+    return symbols
+
+
+def save_rows(data: list[dict], output_format: str, output_file: str):
     if output_format == "json":
         save_json(data, output_file)
     else:
         save_csv(data, output_file)
+
+
+async def stream_rows(
+    symbol: str, output_format: str, output_file: str, engine: str = "auto"
+):
+    # Each result page is written as soon as it is parsed instead of at the end
+    with STREAM_WRITERS[output_format](output_file) as writer:
+        await writer.write_from(iter_rows(symbol, engine=engine))
+
+
+def load_saved_rows(output_file: str, output_format: str) -> list[dict]:
+    if not Path(output_file).exists():
+        return []
+    if output_format == "json":
+        return load_json(output_file)
+    if output_format == "jsonl":
+        return load_jsonl(output_file)
+    return load_csv(output_file)
+
+
+async def refresh_saved_rows(
+    symbol: str,
+    output_format: str,
+    output_file: str,
+    existing: list[dict],
+    engine: str = "auto",
+):
+    known_dates = {row["Date"] for row in existing}
+    data = await scrape(symbol, known_dates=known_dates, engine=engine)
+    if not data:
+        print(f"✅ {symbol.upper()} is already up to date")
+        return
+
+    merge_saved_rows(data, existing, output_format, output_file)
+
+
+def merge_saved_rows(
+    data: list[dict], existing: list[dict], output_format: str, output_file: str
+):
+    if not data:
+        return
+
+    # Every format keeps the page order, newest rows first
+    if output_format == "json":
+        save_json(data + existing, output_file)
+        return
+    writer = STREAM_WRITERS[output_format]
+    with writer(output_file) as stream:
+        stream.write_rows(data + existing)
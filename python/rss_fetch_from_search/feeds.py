@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from utils.metrics import METRICS
+from utils.rate_limit import RATE_LIMITER
+
+# Servers that refuse HEAD get a GET whose body is never read
+HEAD_NOT_ALLOWED = {405, 501}
+
+
+class FeedVerifier:
+    """Confirms derived feed URLs with HEAD requests over the shared pooled client.
+
+    ``verify_many`` checks a whole list in one concurrent burst (bounded by the
+    host rate limit); ``verify`` checks a single URL inline. A URL counts as
+    verified when it answers 200 with a feed content type; anything else is
+    left to page-based extraction.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def verify(self, url: str) -> str | None:
+        """The verified feed URL (after redirects), or None."""
+        return await self.check(url)
+
+    async def verify_many(self, urls: list[str]) -> dict[str, str | None]:
+        unique = list(dict.fromkeys(urls))
+        if not unique:
+            return {}
+        METRICS.count("rss.feed_batches")
+        with METRICS.span("rss.feed_verify", size=str(len(unique))):
+            results = await asyncio.gather(*(self.check(url) for url in unique))
+        return dict(zip(unique, results))
+
+    async def check(self, url: str) -> str | None:
+        try:
+            async with RATE_LIMITER.slot(url):
+                response = await self.client.head(url)
+                if response.status_code in HEAD_NOT_ALLOWED:
+                    async with self.client.stream("GET", url) as response:
+                        pass
+        except httpx.HTTPError as e:
+            print(f"❌ Could not verify {url}: {e}")
+            METRICS.count("rss.feed_verify", result="error")
+            return None
+
+        content_type = response.headers.get("content-type", "")
+        if response.status_code == 200 and (
+            "atom" in content_type or "xml" in content_type
+        ):
+            METRICS.count("rss.feed_verify", result="verified")
+            return str(response.url)
+        METRICS.count("rss.feed_verify", result=f"http_{response.status_code}")
+        return None
@@ -1,16 +1,83 @@
-import asyncio
+import math
+import sys
+from typing import Any
 
-from playwright.async_api import Error
+from rss_fetch_from_search.scraper import HedgeConfig
+from rss_fetch_from_search.sharding import ShardsFailed
+from rss_fetch_from_search.usecase import fetch_rss, fetch_rss_from_queue
+from utils.error_handling import run_scraper
 
-from rss_fetch_from_search.usecase import fetch_rss
-from utils.error_handling import handle_playwright_error
+METRICS_PATH = "outputs/rss_fetch_from_search/metrics.json"
+SHARDS_OPTION = "--shards="
+QUEUE_OPTION = "--queue="
+HEDGE_OPTION = "--hedge"
+HEDGE_DELAY_OPTION = "--hedge-delay="
+HEDGE_RACE_OPTION = "--hedge-race"
+USAGE = (
+    "❌ Usage: python main.py [--retry-failed] [--shards=<N>] [--queue=<file>] "
+    "[--hedge[=<extra searches per run>]] [--hedge-delay=<seconds>] [--hedge-race]"
+)
+
+
+def parse_count(arg: str, option: str) -> int:
+    value = arg.removeprefix(option)
+    if not value.isdigit() or int(value) < 1:
+        print(USAGE)
+        sys.exit(1)
+    return int(value)
+
+
+def parse_seconds(arg: str, option: str) -> float:
+    try:
+        value = float(arg.removeprefix(option))
+    except ValueError:
+        value = -1.0
+    if value < 0 or not math.isfinite(value):
+        print(USAGE)
+        sys.exit(1)
+    return value
+
+
+def parse_hedge(args: list[str]) -> HedgeConfig | None:
+    """Hedging is on with any --hedge option; --hedge-race races every engine."""
+    options: dict[str, Any] = {}
+    hedging = False
+    for arg in args:
+        if arg == HEDGE_OPTION:
+            hedging = True
+        elif arg.startswith(f"{HEDGE_OPTION}="):
+            options["max_extra_per_run"] = parse_count(arg, f"{HEDGE_OPTION}=")
+        elif arg.startswith(HEDGE_DELAY_OPTION):
+            options["delay_seconds"] = parse_seconds(arg, HEDGE_DELAY_OPTION)
+        elif arg == HEDGE_RACE_OPTION:
+            options["max_extra_per_tech"] = None
+    if not hedging and not options:
+        return None
+    return HedgeConfig(**options)
 
 
 def main():
+    retry_failed = "--retry-failed" in sys.argv[1:]
+    shards = 1
+    queue_path = None
+    hedge = parse_hedge(sys.argv[1:])
+    for arg in sys.argv[1:]:
+        if arg.startswith(QUEUE_OPTION):
+            queue_path = arg.removeprefix(QUEUE_OPTION)
+        elif arg.startswith(SHARDS_OPTION):
+            shards = parse_count(arg, SHARDS_OPTION)
+
+    if queue_path:
+        run_scraper(fetch_rss_from_queue(queue_path, hedge=hedge), METRICS_PATH)
+        return
     try:
-        asyncio.run(fetch_rss())
-    except Error as e:
-        handle_playwright_error(e)
+        run_scraper(
+            fetch_rss(retry_failed=retry_failed, shards=shards, hedge=hedge),
+            METRICS_PATH,
+        )
+    except ShardsFailed as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,41 @@
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from html.parser import HTMLParser
 from typing import Dict, List, Optional
 from urllib.parse import quote, urljoin, urlparse
 
+import httpx
 from playwright.async_api import Error as PlaywrightError
-from playwright.async_api import Page, async_playwright
-
-from utils.playwright import create_browser, create_context
+from playwright.async_api import Page
+
+from rss_fetch_from_search.feeds import FeedVerifier
+from utils.blocking import THIRD_PARTY_HOSTS, BlockingPolicy
+from utils.cache import TTLCache
+from utils.circuit_breaker import (
+    BREAKERS,
+    BreakerConfig,
+    CircuitOpenError,
+    report_degraded,
+)
+from utils.endpoints import base_host, base_url
+from utils.http_client import create_http_client
+from utils.journal import Checkpoint
+from utils.metrics import METRICS
+from utils.playwright import (
+    WAIT_METRICS,
+    BrowserPool,
+    PagePool,
+    create_context,
+    leased_browser,
+    navigate,
+    wait_for_selector_state,
+    wait_for_url_match,
+)
+from utils.rate_limit import RATE_LIMITER, HostLimit
+from utils.retry import RetryPolicy, retry
+from utils.single_flight import SingleFlight
 
 BING_EXCLUDE_SITES = [
     "reddit.com",
@@ -13,8 +43,63 @@ BING_EXCLUDE_SITES = [
     "zhihu.com",
     "linkedin.com",
 ]
+# First path segments github.com keeps for itself, never a repo owner
+GITHUB_RESERVED_PATHS = frozenset(
+    {
+        "about",
+        "apps",
+        "collections",
+        "enterprise",
+        "events",
+        "explore",
+        "features",
+        "issues",
+        "login",
+        "marketplace",
+        "notifications",
+        "orgs",
+        "pricing",
+        "pulls",
+        "search",
+        "settings",
+        "sponsors",
+        "topics",
+        "trending",
+        "users",
+    }
+)
 
 CONCURRENCY = 3
+HOST_LIMITS = {
+    "search.brave.com": HostLimit(rate=0.5, burst=2, max_in_flight=2),
+    "mojeek.com": HostLimit(rate=0.5, burst=2, max_in_flight=2),
+    "bing.com": HostLimit(rate=1.0, burst=2, max_in_flight=2),
+    "github.com": HostLimit(rate=3.0, burst=6, max_in_flight=CONCURRENCY),
+}
+# Keyed by engine name; a CAPTCHA or timeout streak sends searches to the
+# other engines until a probe after reset_seconds goes through cleanly
+ENGINE_BREAKERS = {
+    "brave": BreakerConfig(failure_threshold=2, reset_seconds=120.0),
+    "mojeek": BreakerConfig(failure_threshold=2, reset_seconds=120.0),
+    "bing": BreakerConfig(failure_threshold=3, reset_seconds=60.0),
+}
+# Hedged searches are extra load on the engines; --hedge caps them per run
+HEDGE_RUN_BUDGET = 25
+# Another engine is usually a better bet than a second try on a slow one
+SEARCH_RETRY = RetryPolicy(max_attempts=2, base_delay=1.0)
+REDIRECT_RETRY = RetryPolicy(max_attempts=3, base_delay=0.5)
+# Only result links, redirects and <head> are read, so nothing visual is needed
+BLOCKING_POLICY = BlockingPolicy(
+    name="rss",
+    resource_types=frozenset({"image", "stylesheet", "font", "media"}),
+    hosts=THIRD_PARTY_HOSTS,
+    url_globs=("**/_private/browser/stats",),
+)
+REDIRECT_WAIT_MILLISECONDS = 5000
+# Redirects (search result -> repo, renamed repo -> new name) rarely change
+REDIRECT_TTL_SECONDS = 30 * 24 * 60 * 60
+RSS_LINK_WAIT_MILLISECONDS = 5000
+RSS_LINK_SELECTOR = 'link[rel="alternate"][type="application/atom+xml"]'
 
 FALLBACK_ORDERS = [
     ["brave", "mojeek", "bing"],
@@ -25,10 +110,10 @@ FALLBACK_ORDERS = [
 
 async def search_brave_and_get_top_result(page: Page, keyword: str) -> str | None:
     query = f'"{keyword}" releases site:github.com'
-    brave_url = f"https://search.brave.com/search?q={query}"
+    brave_url = f"{base_url('brave')}/search?q={query}"
 
     # print(f"🔍 Brave URL: {brave_url}")
-    await page.goto(brave_url, timeout=30000, wait_until="load")
+    await navigate(page, brave_url, timeout=30000, wait_until="load")
     await handle_simple_captcha(page, "I'm not a robot")
     # await page.screenshot(path=f"screenshots/{keyword.replace(' ', '_')}_brave.png")
 
@@ -37,7 +122,7 @@ async def search_brave_and_get_top_result(page: Page, keyword: str) -> str | Non
 
     for i in range(min(count, 5)):
         url = await result_links.nth(i).get_attribute("href")
-        if url and "github.com" in url and "/releases" in url:
+        if url and base_host("github") in url and "/releases" in url:
             return url
 
     return None
@@ -45,10 +130,10 @@ async def search_brave_and_get_top_result(page: Page, keyword: str) -> str | Non
 
 async def search_mojeek_and_get_top_result(page: Page, keyword: str) -> str | None:
     query = f'"{keyword}" site:github.com'
-    mojeek_url = f"https://www.mojeek.com/search?q={query}"
+    mojeek_url = f"{base_url('mojeek')}/search?q={query}"
 
     # print(f"🔍 Mojeek URL: {mojeek_url}")
-    await page.goto(mojeek_url, timeout=30000, wait_until="load")
+    await navigate(page, mojeek_url, timeout=30000, wait_until="load")
     await handle_simple_captcha(page, "I'm not a robot")
     # await page.screenshot(path=f"screenshots/{keyword.replace(' ', '_')}_mojeek.png")
 
@@ -61,7 +146,7 @@ async def search_mojeek_and_get_top_result(page: Page, keyword: str) -> str | No
         item = result_items.nth(i)
         link = item.locator("a").nth(0)
         url = await link.get_attribute("href")
-        if url and "github.com" in url:
+        if url and base_host("github") in url:
             urls.append(url)
 
     best_base_url = choose_best_url(urls, keyword)
@@ -70,7 +155,7 @@ async def search_mojeek_and_get_top_result(page: Page, keyword: str) -> str | No
 
     releases_url = best_base_url.rstrip("/") + "/releases"
     try:
-        await page.goto(releases_url, timeout=10000)
+        await navigate(page, releases_url, timeout=10000)
         if "Not Found" not in await page.title():
             return releases_url
     except (PlaywrightError, TimeoutError) as e:
@@ -87,14 +172,16 @@ async def search_bing_and_get_top_result(
     exclude_sites = " ".join(f"-site:{site}" for site in BING_EXCLUDE_SITES)
     search_query = f"{query} {exclude_sites}"
 
-    bing_url = f"https://www.bing.com/search?q={search_query}&setlang=en-us&cc=US"
+    bing_url = f"{base_url('bing')}/search?q={search_query}&setlang=en-us&cc=US"
 
     try:
-        await page.goto(bing_url, timeout=30000, wait_until="load")
+        await navigate(page, bing_url, timeout=30000, wait_until="load")
         await page.wait_for_selector("li.b_algo h2 a", timeout=10000)
     except (PlaywrightError, TimeoutError) as e:
+        # Raised, not None: a failed search must not be cached as "no result"
         print(f"❌ Bing search failed: {e}")
-        return None
+        report_degraded(type(e).__name__)
+        raise
 
     copilot_locator = page.locator("div.b_tpcn > a")
     if await copilot_locator.count() > 0:
@@ -113,6 +200,49 @@ async def search_bing_and_get_top_result(
     return None
 
 
+@dataclass
+class HedgeConfig:
+    # Seconds to wait on the running engines before starting the next one
+    delay_seconds: float = 3.0
+    # Extra searches one tech may start while earlier engines are still running
+    # (None = race every engine in the fallback order)
+    max_extra_per_tech: int | None = 1
+    # Extra searches the whole run may spend on hedging (None = unlimited)
+    max_extra_per_run: int | None = HEDGE_RUN_BUDGET
+    extra_spent: int = 0
+
+    def allows_extra(self, extra_for_tech: int) -> bool:
+        if (
+            self.max_extra_per_tech is not None
+            and extra_for_tech >= self.max_extra_per_tech
+        ):
+            return False
+        return (
+            self.max_extra_per_run is None or self.extra_spent < self.max_extra_per_run
+        )
+
+    def split(self, parts: int) -> "HedgeConfig":
+        """This config for one of ``parts`` processes, with a share of the run budget."""
+        if self.max_extra_per_run is None:
+            return replace(self, extra_spent=0)
+        budget = max(1, self.max_extra_per_run // max(1, parts))
+        return replace(self, max_extra_per_run=budget, extra_spent=0)
+
+
+@dataclass
+class FetchSession:
+    http_client: httpx.AsyncClient | None = None
+    search_cache: TTLCache | None = None
+    hedge: HedgeConfig | None = None
+    # Source URL -> final github.com URL, kept across runs
+    redirect_cache: TTLCache | None = None
+    # One feed extraction per owner/repo per run, shared by keyword aliases
+    extractions: SingleFlight = field(default_factory=SingleFlight)
+    # Verifies derived releases.atom URLs before any page is read
+    feeds: FeedVerifier | None = None
+    pages: PagePool | None = None
+
+
 SEARCH_ENGINES = {
     "brave": search_brave_and_get_top_result,
     "mojeek": search_mojeek_and_get_top_result,
@@ -130,8 +260,10 @@ async def handle_simple_captcha(
         if not await captcha_button.count():
             return False
 
+        # Solved or not, a CAPTCHA means the engine is rate limiting us
+        report_degraded("captcha")
         await captcha_button.click(timeout=3000)
-        await page.wait_for_timeout(wait_ms)
+        await wait_for_selector_state(page, selector, wait_ms, state="detached")
         return True
 
     except (PlaywrightError, TimeoutError) as e:
@@ -139,93 +271,415 @@ async def handle_simple_captcha(
         return False
 
 
-async def fetch_techs_rss(techs: Dict[str, Dict]) -> list[Dict]:
-    results = []
-    semaphore = asyncio.Semaphore(CONCURRENCY)
+async def search_top_result(
+    page: Page, engine: str, keyword: str, cache: TTLCache | None = None
+) -> str | None:
+    if cache is not None:
+        cached = cache.get((engine, keyword))
+        METRICS.count("rss.search_cache", engine=engine, hit=str(cached.found))
+        if cached.found:
+            return cached.value
+
+    breaker = BREAKERS.get(engine)
+    degraded = False
+
+    async def attempt(_attempt: int) -> str | None:
+        nonlocal degraded
+        with breaker.call() as call:
+            url = await SEARCH_ENGINES[engine](page, keyword)
+            degraded = call.failure is not None
+            return url
+
+    try:
+        with METRICS.span("rss.search", engine=engine):
+            url = await retry(attempt, SEARCH_RETRY, f"rss.search.{engine}")
+    except CircuitOpenError:
+        METRICS.count("rss.search_skipped", engine=engine)
+        print(f"🔌 Skipping {engine} for {keyword}: circuit is {breaker.state}")
+        return None
+    METRICS.count("rss.search_results", engine=engine, found=str(bool(url)))
+
+    # A CAPTCHA page says nothing about the keyword; search it again next run
+    if cache is not None and not degraded:
+        cache.set((engine, keyword), url)
+    return url
 
-    async with async_playwright() as p:
-        browser = await create_browser(p, headless=True)
-        context = await create_context(browser)
-
-        async def fetch_tech(index: int, tech: Dict):
-            async with semaphore:
-                page = await context.new_page()
-                order = FALLBACK_ORDERS[index % len(FALLBACK_ORDERS)]
-                try:
-                    url, rss = await get_tech_info_with_fallbacks(
-                        page, tech["name"], order
-                    )
-                    tech.update({"url": url, "rss": rss})
-                except (PlaywrightError, TimeoutError, ValueError) as e:
-                    print(f"❌ Error for {tech['name']}: {e}")
-                    tech.update({"url": None, "rss": None})
-                finally:
-                    await page.close()
-                    results.append(tech)
-                    await asyncio.sleep(1)
 
+class HedgedSearch:
+    """Race search engines for one keyword, staggered by ``HedgeConfig.delay_seconds``.
+
+    The primary page runs the first engine; hedged engines get their own pages,
+    which are closed together with any losing searches once a winner is found.
+    """
+
+    def __init__(self, page: Page, name: str, session: FetchSession):
+        self.page = page
+        self.name = name
+        self.session = session
+        self.idle_pages = [page]
+        self.opened_pages: list[Page] = []
+        self.running: dict[asyncio.Task, Page] = {}
+
+    async def start(self, engine: str):
+        if self.idle_pages:
+            page = self.idle_pages.pop()
+        else:
+            page = await self.page.context.new_page()
+            self.opened_pages.append(page)
+        task = asyncio.create_task(
+            search_top_result(page, engine, self.name, self.session.search_cache)
+        )
+        self.running[task] = page
+
+    def collect(self, done: set[asyncio.Task]) -> str | None:
+        for task in done:
+            self.idle_pages.append(self.running.pop(task))
+            if task.exception() is not None:
+                print(f"❌ Search failed for {self.name}: {task.exception()}")
+                continue
+            url = task.result()
+            if url and not is_excluded_url(url):
+                return url
+        return None
+
+    async def run(self, order: list[str], hedge: HedgeConfig) -> str | None:
+        remaining = list(order)
+        extra = 0
         try:
-            await asyncio.gather(
-                *(fetch_tech(i, t) for i, t in enumerate(techs.values()))
-            )
+            await self.start(remaining.pop(0))
+            while self.running:
+                can_hedge = bool(remaining) and hedge.allows_extra(extra)
+                done, _ = await asyncio.wait(
+                    self.running,
+                    timeout=hedge.delay_seconds if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    extra += 1
+                    hedge.extra_spent += 1
+                    await self.start(remaining.pop(0))
+                    continue
+                url = self.collect(done)
+                if url:
+                    return url
+                if remaining and not self.running:
+                    await self.start(remaining.pop(0))
+            return None
+        finally:
+            await self.close()
+
+    async def close(self):
+        for task in self.running:
+            task.cancel()
+        await asyncio.gather(*self.running, return_exceptions=True)
+        self.running.clear()
+        for page in self.opened_pages:
+            await page.close()
+
+
+async def fetch_techs_rss(
+    techs: Dict[str, Dict],
+    pool: BrowserPool | None = None,
+    search_cache: TTLCache | None = None,
+    hedge: HedgeConfig | None = None,
+    journal: Checkpoint | None = None,
+) -> list[Dict]:
+    async with open_fetch_session(pool, search_cache, hedge) as session:
+        return await fetch_batch(techs, session, journal)
+
+
+@asynccontextmanager
+async def open_fetch_session(
+    pool: BrowserPool | None = None,
+    search_cache: TTLCache | None = None,
+    hedge: HedgeConfig | None = None,
+) -> AsyncIterator[FetchSession]:
+    """Browser context, pages, HTTP client and per-run state for any number of batches."""
+    RATE_LIMITER.configure(HOST_LIMITS)
+    BREAKERS.configure(ENGINE_BREAKERS)
+
+    async with leased_browser(pool) as browser, create_http_client() as client:
+        context = await create_context(browser, BLOCKING_POLICY)
+        pages = PagePool(context, size=CONCURRENCY)
+        session = FetchSession(
+            http_client=client,
+            search_cache=search_cache,
+            hedge=hedge,
+            redirect_cache=(
+                search_cache.sibling("redirects", REDIRECT_TTL_SECONDS)
+                if search_cache is not None
+                else None
+            ),
+            feeds=FeedVerifier(client),
+            pages=pages,
+        )
+        try:
+            yield session
         finally:
+            await pages.close()
             await context.close()
-            await browser.close()
-
+            print_session_summary(session)
+
+
+def print_session_summary(session: FetchSession):
+    if session.pages is not None:
+        pages = session.pages
+        print(f"📄 Pages created: {pages.created}, recycled: {pages.recycled}")
+    WAIT_METRICS.print_summary()
+    RATE_LIMITER.print_summary()
+    BREAKERS.print_summary()
+    if session.hedge is not None:
+        print(f"🏁 Hedged searches spent: {session.hedge.extra_spent}")
+    if session.redirect_cache is not None:
+        stats = session.redirect_cache.stats
+        print(f"↪️ Redirect map: {stats.hits} hits, {stats.misses} misses")
+    if session.extractions.stats.saved:
+        print(
+            f"🔗 Repos shared between keywords: "
+            f"{session.extractions.stats.saved} extractions saved"
+        )
+
+
+async def fetch_batch(
+    techs: Dict[str, Dict], session: FetchSession, journal: Checkpoint | None = None
+) -> list[Dict]:
+    results = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    pages = session.pages
+    if pages is None:
+        raise ValueError("fetch_batch needs a session from open_fetch_session")
+    known = await verify_cached_feeds(techs, session)
+
+    async def fetch_tech(index: int, tech: Dict):
+        async with semaphore:
+            order = FALLBACK_ORDERS[index % len(FALLBACK_ORDERS)]
+            url: str | None
+            rss: str | None
+            try:
+                if tech["name"] in known:
+                    url, rss = known[tech["name"]]
+                else:
+                    async with pages.lease() as page:
+                        url, rss = await get_tech_info_with_fallbacks(
+                            page, tech["name"], order, session
+                        )
+                tech.update({"url": url, "rss": rss})
+                METRICS.count("rss.techs", result="found" if rss else "missing")
+            except (PlaywrightError, TimeoutError, ValueError) as e:
+                print(f"❌ Error for {tech['name']}: {e}")
+                tech.update({"url": None, "rss": None})
+                METRICS.count("rss.techs", result="error")
+            finally:
+                results.append(tech)
+            # Checkpoint only techs that ran to completion, not cancelled ones
+            if journal is not None:
+                journal.append(tech["name"], tech)
+
+    await asyncio.gather(*(fetch_tech(i, t) for i, t in enumerate(techs.values())))
     return results
 
 
-async def get_tech_info_with_fallbacks(
-    page: Page, name: str, order: list[str]
-) -> tuple[str | None, str | None]:
+async def verify_cached_feeds(
+    techs: Dict[str, Dict], session: FetchSession
+) -> dict[str, tuple[str, str]]:
+    """Feeds of techs whose repo earlier runs already found, checked in one burst.
+
+    Returns name -> (repo URL, feed URL) for the feeds that verified; the
+    other techs go through search and page-based extraction as usual.
+    """
+    if session.feeds is None:
+        return {}
+    candidates = {}
+    for index, tech in enumerate(techs.values()):
+        order = FALLBACK_ORDERS[index % len(FALLBACK_ORDERS)]
+        repo_url = cached_repo_url(tech["name"], order, session)
+        feed_url = derive_feed_url(repo_url) if repo_url else None
+        if repo_url and feed_url:
+            candidates[tech["name"]] = (repo_url, feed_url)
+
+    verified = await session.feeds.verify_many(
+        [feed_url for _, feed_url in candidates.values()]
+    )
+    known = {
+        name: (repo_url, feed)
+        for name, (repo_url, feed_url) in candidates.items()
+        if (feed := verified[feed_url])
+    }
+    if candidates:
+        METRICS.count("rss.link_source", len(known), source="cached_repo")
+        print(
+            f"🎯 {len(known)}/{len(candidates)} feeds confirmed from cached repos "
+            f"before any page load"
+        )
+    return known
+
+
+def cached_repo_url(name: str, order: list[str], session: FetchSession) -> str | None:
+    """The repo a sequential search would reach from cached results alone, if any."""
+    if session.search_cache is None:
+        return None
     for engine in order:
-        search_fn = SEARCH_ENGINES[engine]
-        url = await search_fn(page, name)
-        # print(url)
+        cached = session.search_cache.peek((engine, name))
+        if not cached.found:
+            # This engine would be searched live, with an unknown result
+            return None
+        url = cached.value
         if url and not is_excluded_url(url):
-            resolved_url = await resolve_redirect(page, url)
-            if not resolved_url:
-                return None, None
-            # print(resolved_url)
-            rss = await extract_rss_links(page, resolved_url)
-            return resolved_url, rss
-    return None, None
+            if session.redirect_cache is not None:
+                redirect = session.redirect_cache.peek(url)
+                if redirect.found and redirect.value:
+                    return redirect.value
+            return url if is_canonical_github_url(url) else None
+    return None
 
 
-async def resolve_redirect(page: Page, url: str, max_retries: int = 3) -> str:
-    for i, _ in enumerate(range(1, max_retries + 1), start=1):
-        try:
-            await page.goto(url, wait_until="load", timeout=10000 * i)
-            await page.wait_for_load_state("networkidle", timeout=5000 * i)
+async def get_tech_info_with_fallbacks(
+    page: Page, name: str, order: list[str], session: FetchSession | None = None
+) -> tuple[str | None, str | None]:
+    session = session or FetchSession()
+    if session.hedge is not None:
+        url = await HedgedSearch(page, name, session).run(order, session.hedge)
+    else:
+        url = await search_sequential(page, name, order, session)
 
-            await page.wait_for_timeout(3000 * i)
+    if not url:
+        return None, None
+
+    redirects = session.redirect_cache
+    with METRICS.span("rss.resolve_redirect"):
+        resolved_url = await resolve_redirect(page, url, cache=redirects)
+    if not resolved_url:
+        return None, None
+    # print(resolved_url)
+
+    async def extract() -> tuple[str, str | None]:
+        with METRICS.span("rss.extract_rss_links"):
+            rss = await extract_rss_links(
+                page, resolved_url, session.http_client, redirects, session.feeds
+            )
+        return renamed_url(redirects, resolved_url), rss
+
+    repo = extract_repo_path(resolved_url) if is_github_url(resolved_url) else None
+    if repo is None:
+        return await extract()
+
+    # Aliases ("nextjs", "next.js") land on the same repo; GitHub paths ignore case
+    key = repo.lower()
+    if key in session.extractions.tasks:
+        METRICS.count("rss.navigations_saved")
+        print(f"🔗 {name}: reusing the feed of {repo}")
+    return await session.extractions.do(key, extract)
+
+
+def renamed_url(redirects: TTLCache | None, url: str) -> str:
+    # A renamed repo found while reading the page is reported by its new name
+    if redirects is not None:
+        renamed = redirects.get(url)
+        if renamed.found and renamed.value:
+            return renamed.value
+    return url
 
-            final_url = page.url
-            if urlparse(final_url).netloc.lower() == "github.com":
-                return final_url
 
+async def search_sequential(
+    page: Page, name: str, order: list[str], session: FetchSession
+) -> str | None:
+    for engine in order:
+        try:
+            url = await search_top_result(page, engine, name, session.search_cache)
         except (PlaywrightError, TimeoutError) as e:
-            print(f"❌ Exception on attempt {i} ({type(e).__name__}): {e}")
+            print(f"❌ {engine} search failed for {name}: {e}")
+            continue
+        # print(url)
+        if url and not is_excluded_url(url):
+            return url
+    return None
 
-        await asyncio.sleep(1)
 
-    return url
+async def resolve_redirect(
+    page: Page,
+    url: str,
+    policy: RetryPolicy = REDIRECT_RETRY,
+    cache: TTLCache | None = None,
+) -> str:
+    canonical = is_canonical_github_url(url)
+    if cache is not None:
+        # A canonical URL only needs a known rename; not having one is no miss
+        cached = cache.peek(url) if canonical else cache.get(url)
+        if cached.found and cached.value:
+            METRICS.count("rss.redirect", source="cache")
+            return cached.value
+    if canonical:
+        # Already a repo URL: nothing to follow, so skip the page load
+        METRICS.count("rss.redirect", source="canonical")
+        return url
+
+    METRICS.count("rss.redirect", source="navigation")
+    breaker = BREAKERS.for_url(url)
+
+    async def attempt(i: int) -> str:
+        # Later attempts also get longer budgets, for slow redirect chains
+        with breaker.call():
+            await navigate(page, url, wait_until="load", timeout=10000 * i)
+            await wait_for_url_match(
+                page, is_github_url, REDIRECT_WAIT_MILLISECONDS * i
+            )
+            if not is_github_url(page.url):
+                raise TimeoutError(f"{page.url} did not redirect to GitHub")
+            return page.url
+
+    try:
+        final_url = await retry(attempt, policy, "rss.resolve_redirect")
+    except (PlaywrightError, TimeoutError, CircuitOpenError) as e:
+        print(f"❌ Could not resolve {url} ({type(e).__name__}): {e}")
+        return url
+    record_redirect(cache, url, final_url)
+    return final_url
 
 
-async def extract_rss_links(page: Page, url: str) -> Optional[str]:
+def record_redirect(cache: TTLCache | None, source_url: str, final_url: str):
+    # Failures are not recorded: the next run should try again
+    if cache is not None and final_url != source_url and is_github_url(final_url):
+        cache.set(source_url, final_url)
+
+
+async def extract_rss_links(
+    page: Page,
+    url: str,
+    http_client: httpx.AsyncClient | None = None,
+    redirects: TTLCache | None = None,
+    feeds: FeedVerifier | None = None,
+) -> Optional[str]:
     if not url:
         return None
 
+    feed_url = derive_feed_url(url) if feeds is not None else None
+    if feeds is not None and feed_url is not None:
+        verified = await feeds.verify(feed_url)
+        if verified:
+            METRICS.count("rss.link_source", source="derived")
+            return verified
+
+    if http_client is not None:
+        links = await extract_rss_links_via_http(http_client, url, redirects)
+        if links is not None:
+            METRICS.count("rss.link_source", source="http")
+            return links[0] if links else None
+
+    METRICS.count("rss.link_source", source="browser")
+
     try:
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(5000)
+        await navigate(page, url, timeout=60000, wait_until="domcontentloaded")
+        await wait_for_selector_state(
+            page, RSS_LINK_SELECTOR, RSS_LINK_WAIT_MILLISECONDS
+        )
     except (PlaywrightError, TimeoutError) as e:
         print(f"❌ Failed to load page {url}: {e}")
         return None
+    record_redirect(redirects, url, page.url)
 
     rss_candidates = []
 
-    link_tags = page.locator('link[rel="alternate"][type="application/atom+xml"]')
+    link_tags = page.locator(RSS_LINK_SELECTOR)
     try:
         count = await link_tags.count()
         for i in range(count):
@@ -241,6 +695,87 @@ async def extract_rss_links(page: Page, url: str) -> Optional[str]:
     return rss_list[0] if rss_list else None
 
 
+class AlternateLinkParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: list[str] = []
+        self.head_done = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "body":
+            self.head_done = True
+            return
+        if tag != "link":
+            return
+        attributes = dict(attrs)
+        href = attributes.get("href")
+        if (
+            href
+            and attributes.get("rel") == "alternate"
+            and attributes.get("type") == "application/atom+xml"
+        ):
+            self.hrefs.append(href)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            self.head_done = True
+
+
+async def extract_rss_links_via_http(
+    client: httpx.AsyncClient, url: str, redirects: TTLCache | None = None
+) -> Optional[list[str]]:
+    """Read only the document head over HTTP.
+
+    Returns the alternate feed links found there, or None when the response
+    cannot be judged without a browser (error status, non-HTML, cut-off head).
+    Redirects followed on the way (renamed repos) go into ``redirects``.
+    """
+    parser = AlternateLinkParser()
+    try:
+        async with RATE_LIMITER.slot(url), client.stream("GET", url) as response:
+            content_type = response.headers.get("content-type", "")
+            if response.status_code != 200 or "html" not in content_type:
+                return None
+            async for chunk in response.aiter_text():
+                parser.feed(chunk)
+                if parser.head_done:
+                    break
+            final_url = str(response.url)
+    except httpx.HTTPError as e:
+        print(f"❌ HTTP fetch failed for {url}: {e}")
+        return None
+
+    if not parser.head_done:
+        return None
+
+    record_redirect(redirects, url, final_url)
+    return list(dict.fromkeys(urljoin(final_url, href) for href in parser.hrefs))
+
+
+def derive_feed_url(url: str) -> str | None:
+    """Every GitHub repo publishes its releases at <owner>/<repo>/releases.atom."""
+    repo_path = extract_repo_path(url) if is_github_url(url) else None
+    if repo_path is None:
+        return None
+    return f"{base_url('github')}/{repo_path}/releases.atom"
+
+
+def is_github_url(url: str) -> bool:
+    return urlparse(url).netloc.lower() == base_host("github")
+
+
+def is_canonical_github_url(url: str) -> bool:
+    """A github.com repo URL (any page of it) that needs no redirect resolving."""
+    github = urlparse(base_url("github"))
+    parsed = urlparse(url)
+    return (
+        parsed.scheme == github.scheme
+        and parsed.netloc.lower() == github.netloc.lower()
+        and (repo_path := extract_repo_path(url)) is not None
+        and repo_path.split("/")[0].lower() not in GITHUB_RESERVED_PATHS
+    )
+
+
 def is_excluded_url(url: str) -> bool:
     domain = urlparse(url).netloc
     return any(excluded in domain for excluded in BING_EXCLUDE_SITES)
@@ -0,0 +1,189 @@
+"""
+Sharded runs: the keyword list split across worker processes
+
+Each shard runs fetch_techs_rss in its own process with its own Chromium
+and event loop, and reports every finished tech to the coordinator over a
+queue. The coordinator is the only writer of the journal and shows
+progress across shards; a shard that crashes only loses its unfinished
+techs, which stay out of the journal so the next run retries them.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from rss_fetch_from_search.scraper import HedgeConfig, fetch_techs_rss
+from utils.cache import TTLCache
+from utils.journal import Journal
+from utils.metrics import METRICS
+from utils.rate_limit import RATE_LIMITER
+
+POLL_SECONDS = 0.5
+
+
+def split_shards(techs: Dict[str, Dict], shards: int) -> list[Dict[str, Dict]]:
+    """Deal techs round-robin, so slow neighbours in the input are spread out."""
+    parts: list[Dict[str, Dict]] = [{} for _ in range(max(1, shards))]
+    for index, (key, tech) in enumerate(techs.items()):
+        parts[index % len(parts)][key] = tech
+    return [part for part in parts if part]
+
+
+class ShardReporter:
+    """The shard's journal: forwards finished techs to the coordinator."""
+
+    def __init__(self, index: int, events: Any):
+        self.index = index
+        self.events = events
+
+    def append(self, key: str, value: Any):
+        self.events.put(("done", self.index, key, value))
+
+    def send_metrics(self):
+        self.events.put(("metrics", self.index, METRICS.snapshot(), None))
+
+    def finish(self):
+        self.events.put(("finished", self.index, None, None))
+
+    def close(self):
+        # Flush queued events before the process exits
+        self.events.close()
+        self.events.join_thread()
+
+
+@dataclass(frozen=True)
+class ShardSettings:
+    search_cache_path: str
+    shards: int
+    hedge: HedgeConfig | None = None
+
+
+async def fetch_shard(
+    techs: Dict[str, Dict], reporter: ShardReporter, settings: ShardSettings
+):
+    # Each shard spends its share of the run's hedging budget
+    hedge = settings.hedge.split(settings.shards) if settings.hedge else None
+    with TTLCache(settings.search_cache_path, namespace="search") as search_cache:
+        await fetch_techs_rss(
+            techs, search_cache=search_cache, hedge=hedge, journal=reporter
+        )
+
+
+def run_shard(index: int, techs: Dict[str, Dict], events: Any, settings: ShardSettings):
+    # Every process gets its own limiter, so each keeps its share of the budget
+    RATE_LIMITER.split(settings.shards)
+    reporter = ShardReporter(index, events)
+    try:
+        asyncio.run(fetch_shard(techs, reporter, settings))
+        reporter.finish()
+    finally:
+        reporter.send_metrics()
+        reporter.close()
+
+
+class ShardsFailed(Exception):
+    pass
+
+
+@dataclass
+class ShardProgress:
+    total: int
+    done: int = 0
+    finished: bool = False
+    exitcode: int | None = None
+
+    @property
+    def clean(self) -> bool:
+        return self.finished and self.exitcode == 0
+
+
+class ShardCoordinator:
+    def __init__(
+        self,
+        parts: list[Dict[str, Dict]],
+        journal: Journal,
+        target: Callable[..., None] = run_shard,
+        hedge: HedgeConfig | None = None,
+    ):
+        self.parts = parts
+        self.journal = journal
+        self.target = target
+        self.hedge = hedge
+        self.progress = [ShardProgress(total=len(part)) for part in parts]
+        self.records: Dict[str, Dict] = {}
+
+    def handle(self, event: tuple):
+        kind, index, key, value = event
+        shard = self.progress[index]
+        if kind == "done":
+            self.journal.append(key, value)
+            self.records[key] = value
+            shard.done += 1
+            status = "✅" if value.get("rss") else "➖"
+            print(
+                f"{status} [shard {index + 1}/{len(self.parts)}] {key} "
+                f"({shard.done}/{shard.total}, {self.done()}/{self.total()} overall)"
+            )
+        elif kind == "metrics":
+            METRICS.merge(key)
+        elif kind == "finished":
+            shard.finished = True
+
+    def done(self) -> int:
+        return sum(shard.done for shard in self.progress)
+
+    def total(self) -> int:
+        return sum(shard.total for shard in self.progress)
+
+    def run(self, search_cache_path: str) -> Dict[str, Dict]:
+        # spawn: a fork of a process with a running event loop is not safe
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        settings = ShardSettings(search_cache_path, len(self.parts), self.hedge)
+        processes = [
+            context.Process(
+                target=self.target,
+                args=(index, part, events, settings),
+                name=f"rss-shard-{index + 1}",
+            )
+            for index, part in enumerate(self.parts)
+        ]
+        for process in processes:
+            process.start()
+        print(f"🧩 Started {len(processes)} shards for {self.total()} techs")
+
+        try:
+            while True:
+                alive = any(process.is_alive() for process in processes)
+                try:
+                    self.handle(events.get(timeout=POLL_SECONDS))
+                except queue.Empty:
+                    if not alive:
+                        break
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        for index, process in enumerate(processes):
+            self.report_exit(index, process.exitcode)
+        return self.records
+
+    def failed(self) -> list[int]:
+        """Indexes of the shards that crashed or did not report finishing."""
+        return [index for index, shard in enumerate(self.progress) if not shard.clean]
+
+    def report_exit(self, index: int, exitcode: int | None):
+        shard = self.progress[index]
+        shard.exitcode = exitcode
+        if shard.clean:
+            METRICS.count("rss.shards", result="finished")
+            return
+        METRICS.count("rss.shards", result="failed")
+        print(
+            f"💥 Shard {index + 1} exited with code {exitcode}: "
+            f"{shard.total - shard.done} techs left for the next run"
+        )
@@ -0,0 +1,163 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from rss_fetch_from_search.feeds import FeedVerifier
+from rss_fetch_from_search.scraper import (
+    FetchSession,
+    derive_feed_url,
+    extract_rss_links,
+    fetch_batch,
+)
+from utils.cache import TTLCache
+from utils.metrics import METRICS
+
+
+def atom_handler(requests: list[httpx.Request]):
+    def handler(request):
+        requests.append(request)
+        if request.url.path.startswith("/missing/"):
+            return httpx.Response(404, headers={"content-type": "text/html"})
+        return httpx.Response(200, headers={"content-type": "application/atom+xml"})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_feed_verifier_checks_many_urls_in_one_concurrent_burst():
+    requests: list[httpx.Request] = []
+    in_flight = peak = 0
+    handler = atom_handler(requests)
+
+    async def slow_handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return handler(request)
+
+    urls = [f"https://github.com/{owner}/repo/releases.atom" for owner in "abc"]
+    missing = "https://github.com/missing/repo/releases.atom"
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(slow_handler)) as c:
+        results = await FeedVerifier(c).verify_many(urls + [missing, urls[0]])
+
+    assert results == {url: url for url in urls} | {missing: None}
+    assert [request.method for request in requests] == ["HEAD"] * 4
+    assert peak > 1
+    assert METRICS.counters[("rss.feed_batches", ())] == 1
+    assert METRICS.counters[("rss.feed_verify", (("result", "http_404"),))] == 1
+
+
+@pytest.mark.asyncio
+async def test_feed_verifier_falls_back_to_get_when_head_is_refused():
+    def handler(request):
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(200, headers={"content-type": "application/xml"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        verified = await FeedVerifier(client).verify(
+            "https://github.com/a/b/releases.atom"
+        )
+
+    assert verified == "https://github.com/a/b/releases.atom"
+
+
+def test_derive_feed_url():
+    assert derive_feed_url("https://github.com/tiangolo/fastapi/tree/master") == (
+        "https://github.com/tiangolo/fastapi/releases.atom"
+    )
+    assert derive_feed_url("https://github.com/tiangolo") is None
+    assert derive_feed_url("https://example.com/owner/repo") is None
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_uses_verified_derived_feed():
+    mock_page = AsyncMock()
+    requests: list[httpx.Request] = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(atom_handler(requests))
+    ) as client:
+        result = await extract_rss_links(
+            mock_page,
+            "https://github.com/tiangolo/fastapi",
+            client,
+            feeds=FeedVerifier(client),
+        )
+
+    assert result == "https://github.com/tiangolo/fastapi/releases.atom"
+    assert [request.method for request in requests] == ["HEAD"]
+    mock_page.goto.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_extracts_from_page_when_derived_feed_fails():
+    requests: list[httpx.Request] = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(atom_handler(requests))
+    ) as client:
+        with patch(
+            "rss_fetch_from_search.scraper.extract_rss_links_via_http",
+            AsyncMock(return_value=["https://github.com/missing/repo/tags.atom"]),
+        ) as via_http:
+            result = await extract_rss_links(
+                AsyncMock(),
+                "https://github.com/missing/repo",
+                client,
+                feeds=FeedVerifier(client),
+            )
+
+    assert result == "https://github.com/missing/repo/tags.atom"
+    via_http.assert_awaited_once()
+    assert METRICS.counters[("rss.feed_verify", (("result", "http_404"),))] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_batch_confirms_feeds_of_cached_repos_before_page_loads(tmp_path):
+    techs = {
+        "react": {"name": "react"},
+        "vue": {"name": "vue"},
+        "gone": {"name": "gone"},
+        "renamed": {"name": "renamed"},
+    }
+    requests: list[httpx.Request] = []
+
+    with TTLCache(tmp_path / "cache.sqlite3") as cache:
+        cache.set(("brave", "react"), None)
+        cache.set(("mojeek", "react"), "https://github.com/facebook/react/releases")
+        cache.set(("bing", "vue"), "https://github.com/vuejs/core")
+        cache.set(("bing", "gone"), "https://github.com/missing/repo")
+        cache.set(("brave", "renamed"), "https://www.bing.com/ck/a?u=abc")
+        redirects = cache.sibling("redirects")
+        redirects.set("https://www.bing.com/ck/a?u=abc", "https://github.com/new/repo")
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(atom_handler(requests))
+        ) as client:
+            session = FetchSession(
+                search_cache=cache,
+                redirect_cache=redirects,
+                feeds=FeedVerifier(client),
+                pages=MagicMock(),
+            )
+            with patch(
+                "rss_fetch_from_search.scraper.get_tech_info_with_fallbacks",
+                new=AsyncMock(return_value=(None, None)),
+            ) as mock_search:
+                results = await fetch_batch(techs, session)
+        hits = cache.stats.hits
+
+    by_name = {tech["name"]: tech for tech in results}
+    assert by_name["react"]["rss"] == "https://github.com/facebook/react/releases.atom"
+    assert by_name["renamed"]["url"] == "https://github.com/new/repo"
+    # vue's first engine was never searched; gone's feed did not verify
+    searched = {call.args[1] for call in mock_search.await_args_list}
+    assert searched == {"vue", "gone"}
+    assert len(requests) == 3
+    assert hits == 0
@@ -0,0 +1,48 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rss_fetch_from_search import main as main_module
+from rss_fetch_from_search.scraper import HEDGE_RUN_BUDGET, HedgeConfig
+
+
+def test_parse_hedge_is_off_without_hedge_options():
+    assert main_module.parse_hedge(["--shards=2"]) is None
+
+
+def test_parse_hedge_reads_budget_delay_and_full_race():
+    hedge = main_module.parse_hedge(["--hedge=4", "--hedge-delay=0.5", "--hedge-race"])
+
+    assert hedge == HedgeConfig(
+        delay_seconds=0.5, max_extra_per_tech=None, max_extra_per_run=4
+    )
+    # A full race starts every engine in the order, however many there are
+    assert all(hedge.allows_extra(extra) for extra in range(3))
+
+
+def test_parse_hedge_defaults_to_one_extra_search_per_tech():
+    hedge = main_module.parse_hedge(["--hedge"])
+
+    assert hedge == HedgeConfig()
+    assert hedge.max_extra_per_run == HEDGE_RUN_BUDGET
+    assert hedge.allows_extra(0) and not hedge.allows_extra(1)
+
+
+@pytest.mark.parametrize("arg", ["--hedge-delay=soon", "--hedge-delay=-1"])
+def test_parse_hedge_rejects_bad_delay(arg, capsys):
+    with pytest.raises(SystemExit) as e:
+        main_module.parse_hedge(["--hedge", arg])
+
+    assert (e.value.code, "Usage" in capsys.readouterr().out) == (1, True)
+
+
+@patch("rss_fetch_from_search.main.run_scraper")
+@patch("rss_fetch_from_search.main.fetch_rss", new_callable=MagicMock)
+def test_main_passes_hedge_to_fetch_rss(mock_fetch, _mock_run_scraper, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "--hedge-race"])
+
+    main_module.main()
+
+    hedge = mock_fetch.call_args.kwargs["hedge"]
+    assert hedge.max_extra_per_tech is None
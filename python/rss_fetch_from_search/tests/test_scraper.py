@@ -1,24 +1,38 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from urllib.parse import urlparse
 
+import httpx
 import pytest
 from playwright.async_api import Error as PlaywrightError
 
 from rss_fetch_from_search.scraper import (
+    FetchSession,
+    HedgeConfig,
+    HedgedSearch,
     choose_best_url,
     create_context,
     extract_repo_path,
     extract_rss_links,
+    extract_rss_links_via_http,
     fetch_techs_rss,
     get_tech_info_with_fallbacks,
     handle_simple_captcha,
+    is_canonical_github_url,
     is_excluded_url,
     resolve_redirect,
     score_repo_path,
     search_bing_and_get_top_result,
     search_brave_and_get_top_result,
     search_mojeek_and_get_top_result,
+    search_sequential,
+    search_top_result,
 )
+from utils.cache import TTLCache
+from utils.circuit_breaker import BREAKERS, BreakerConfig, report_degraded
+from utils.journal import Journal
+from utils.metrics import METRICS
+from utils.network import NETWORK_STATS
 
 
 @pytest.mark.asyncio
@@ -165,6 +179,96 @@ async def test_search_bing_returns_none_if_no_results():
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_search_bing_raises_when_results_never_load():
+    mock_page = MagicMock()
+    mock_page.goto = AsyncMock()
+    mock_page.wait_for_selector = AsyncMock(side_effect=TimeoutError("no results"))
+
+    with pytest.raises(TimeoutError):
+        await search_bing_and_get_top_result(mock_page, "FastAPI")
+
+
+@pytest.mark.asyncio
+async def test_search_top_result_uses_cache(tmp_path):
+    engine = AsyncMock(return_value="https://github.com/facebook/react/releases")
+
+    with TTLCache(tmp_path / "cache.sqlite3") as cache, patch.dict(
+        "rss_fetch_from_search.scraper.SEARCH_ENGINES", {"brave": engine}
+    ):
+        first = await search_top_result(MagicMock(), "brave", "react", cache)
+        second = await search_top_result(MagicMock(), "brave", "react", cache)
+
+        assert cache.stats.hits == 1
+
+    assert first == second == "https://github.com/facebook/react/releases"
+    engine.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_search_top_result_caches_empty_results(tmp_path):
+    engine = AsyncMock(return_value=None)
+
+    with TTLCache(tmp_path / "cache.sqlite3") as cache, patch.dict(
+        "rss_fetch_from_search.scraper.SEARCH_ENGINES", {"bing": engine}
+    ):
+        assert await search_top_result(MagicMock(), "bing", "nothing", cache) is None
+        assert await search_top_result(MagicMock(), "bing", "nothing", cache) is None
+
+    engine.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_search_sequential_skips_failed_engine_without_caching(tmp_path):
+    bing = AsyncMock(side_effect=PlaywrightError("Target page crashed"))
+    brave = AsyncMock(return_value="https://github.com/facebook/react")
+
+    with TTLCache(tmp_path / "cache.sqlite3") as cache, patch.dict(
+        "rss_fetch_from_search.scraper.SEARCH_ENGINES", {"bing": bing, "brave": brave}
+    ):
+        session = FetchSession(search_cache=cache)
+        url = await search_sequential(MagicMock(), "react", ["bing", "brave"], session)
+
+        assert url == "https://github.com/facebook/react"
+        assert not cache.get(("bing", "react")).found
+
+
+@pytest.mark.asyncio
+async def test_search_top_result_routes_around_open_breaker():
+    BREAKERS.configure({"brave": BreakerConfig(failure_threshold=2)})
+    engine = AsyncMock(side_effect=PlaywrightError("net::ERR_TIMED_OUT"))
+
+    with patch.dict(
+        "rss_fetch_from_search.scraper.SEARCH_ENGINES", {"brave": engine}
+    ), patch("utils.retry.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(PlaywrightError):
+            await search_top_result(MagicMock(), "brave", "react")
+        assert await search_top_result(MagicMock(), "brave", "react") is None
+
+    assert engine.await_count == 2
+    assert BREAKERS.get("brave").state == "open"
+
+
+@pytest.mark.asyncio
+async def test_search_top_result_trips_breaker_on_captcha(tmp_path):
+    BREAKERS.configure({"mojeek": BreakerConfig(failure_threshold=2)})
+
+    async def captcha_engine(_page, _keyword):
+        report_degraded("captcha")
+        return None
+
+    with TTLCache(tmp_path / "cache.sqlite3") as cache, patch.dict(
+        "rss_fetch_from_search.scraper.SEARCH_ENGINES", {"mojeek": captcha_engine}
+    ):
+        for _ in range(2):
+            assert (
+                await search_top_result(MagicMock(), "mojeek", "react", cache) is None
+            )
+            # Not cached as "no result": the next search runs the engine again
+            assert not cache.get(("mojeek", "react")).found
+        assert BREAKERS.get("mojeek").state == "open"
+
+
 @pytest.mark.asyncio
 async def test_handle_simple_captcha_success():
     mock_page = MagicMock()
@@ -178,13 +282,15 @@ async def test_handle_simple_captcha_success():
         return mock_locator
 
     mock_page.locator = locator_stub
-    mock_page.wait_for_timeout = AsyncMock()
+    mock_page.wait_for_selector = AsyncMock()
 
     result = await handle_simple_captcha(mock_page)
     assert result is True
 
     mock_locator.click.assert_awaited_once_with(timeout=3000)
-    mock_page.wait_for_timeout.assert_awaited_once()
+    mock_page.wait_for_selector.assert_awaited_once_with(
+        'button:has-text("I\'m not a robot")', state="detached", timeout=5000
+    )
 
 
 @pytest.mark.asyncio
@@ -215,14 +321,12 @@ async def test_fetch_techs_rss_success():
     mock_context = AsyncMock()
     mock_page = AsyncMock()
 
-    mock_playwright_context = AsyncMock()
-    mock_playwright_context.__aenter__.return_value = MagicMock()
+    mock_lease = AsyncMock()
+    mock_lease.__aenter__.return_value = mock_browser
 
     with patch(
-        "rss_fetch_from_search.scraper.async_playwright",
-        return_value=mock_playwright_context,
-    ), patch(
-        "rss_fetch_from_search.scraper.create_browser", return_value=mock_browser
+        "rss_fetch_from_search.scraper.leased_browser",
+        return_value=mock_lease,
     ), patch(
         "rss_fetch_from_search.scraper.create_context", return_value=mock_context
     ), patch.object(
@@ -250,10 +354,36 @@ async def test_fetch_techs_rss_success():
     assert result[1]["rss"] == "https://github.com/numpy/numpy/releases.atom"
 
 
+@pytest.mark.asyncio
+async def test_fetch_techs_rss_journals_each_finished_tech(tmp_path):
+    techs = {"fastapi": {"name": "FastAPI"}, "numpy": {"name": "NumPy"}}
+    mock_lease = AsyncMock()
+    mock_lease.__aenter__.return_value = AsyncMock()
+
+    with patch(
+        "rss_fetch_from_search.scraper.leased_browser", return_value=mock_lease
+    ), patch(
+        "rss_fetch_from_search.scraper.create_context", return_value=AsyncMock()
+    ), patch(
+        "rss_fetch_from_search.scraper.get_tech_info_with_fallbacks",
+        side_effect=[
+            ("https://github.com/tiangolo/fastapi", "https://example.com/a.atom"),
+            PlaywrightError("Target page, context or browser has been closed"),
+        ],
+    ), Journal(
+        tmp_path / "journal.jsonl"
+    ) as journal:
+        await fetch_techs_rss(techs, journal=journal)
+        records = journal.load()
+
+    assert records["FastAPI"]["rss"] == "https://example.com/a.atom"
+    assert records["NumPy"] == {"name": "NumPy", "url": None, "rss": None}
+
+
 @pytest.mark.asyncio
 async def test_block_static_resources_behavior():
     mock_browser = AsyncMock()
-    mock_context = AsyncMock()
+    mock_context = AsyncMock(on=MagicMock())
     mock_browser.new_context.return_value = mock_context
 
     route_callbacks = []
@@ -270,17 +400,20 @@ async def test_block_static_resources_behavior():
 
     for resource_type in ["image", "stylesheet", "font"]:
         mock_route = AsyncMock()
-        mock_request = MagicMock(resource_type=resource_type)
+        mock_request = MagicMock(
+            resource_type=resource_type, url="https://github.com/x.png"
+        )
         await block_static_resources(mock_route, mock_request)
         mock_route.abort.assert_awaited_once()
-        mock_route.continue_.assert_not_called()
+        mock_route.fallback.assert_not_called()
         mock_route.abort.reset_mock()
 
     mock_route = AsyncMock()
-    mock_request = MagicMock(resource_type="script")
+    mock_request = MagicMock(resource_type="script", url="https://github.com/x.js")
     await block_static_resources(mock_route, mock_request)
-    mock_route.continue_.assert_awaited_once()
+    mock_route.fallback.assert_awaited_once()
     mock_route.abort.assert_not_called()
+    assert NETWORK_STATS.summary()["blocked"] == 3
 
 
 @pytest.mark.asyncio
@@ -313,6 +446,41 @@ async def test_get_tech_info_with_valid_rss():
         assert rss_url == "https://github.com/tiangolo/fastapi/releases.atom"
 
 
+@pytest.mark.asyncio
+async def test_get_tech_info_coalesces_aliases_of_one_repo():
+    engines = {
+        "brave": AsyncMock(
+            side_effect=lambda _page, keyword: {
+                "nextjs": "https://github.com/vercel/next.js",
+                "next.js": "https://github.com/Vercel/Next.js/releases",
+            }[keyword]
+        )
+    }
+
+    async def slow_extract(*_args):
+        await asyncio.sleep(0.01)
+        return "https://github.com/vercel/next.js/releases.atom"
+
+    session = FetchSession()
+    with patch.dict("rss_fetch_from_search.scraper.SEARCH_ENGINES", engines), patch(
+        "rss_fetch_from_search.scraper.extract_rss_links",
+        new=AsyncMock(side_effect=slow_extract),
+    ) as mock_extract:
+        results = await asyncio.gather(
+            get_tech_info_with_fallbacks(AsyncMock(), "nextjs", ["brave"], session),
+            get_tech_info_with_fallbacks(AsyncMock(), "next.js", ["brave"], session),
+        )
+        again = await get_tech_info_with_fallbacks(
+            AsyncMock(), "nextjs", ["brave"], session
+        )
+
+    mock_extract.assert_awaited_once()
+    assert results[0] == results[1] == again
+    assert results[0][1] == "https://github.com/vercel/next.js/releases.atom"
+    assert session.extractions.stats.saved == 2
+    assert METRICS.counters[("rss.navigations_saved", ())] == 2
+
+
 @pytest.mark.asyncio
 async def test_get_tech_info_with_all_fallbacks_fail():
     mock_page = AsyncMock()
@@ -344,6 +512,107 @@ async def test_get_tech_info_with_all_fallbacks_fail():
         mock_extract.assert_not_awaited()
 
 
+def delayed_engine(delay: float, url: str | None):
+    async def search(_page, _keyword):
+        await asyncio.sleep(delay)
+        return url
+
+    return search
+
+
+def page_with_context():
+    page = AsyncMock()
+    page.context = MagicMock()
+    page.context.new_page = AsyncMock(return_value=AsyncMock())
+    return page
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_starts_next_engine_after_delay():
+    engines = {
+        "slow": delayed_engine(1.0, "https://github.com/slow/repo"),
+        "fast": delayed_engine(0.01, "https://github.com/fast/repo"),
+    }
+    page = page_with_context()
+    hedge = HedgeConfig(delay_seconds=0.05)
+
+    with patch.dict("rss_fetch_from_search.scraper.SEARCH_ENGINES", engines):
+        url = await HedgedSearch(page, "repo", FetchSession(hedge=hedge)).run(
+            ["slow", "fast"], hedge
+        )
+
+    assert url == "https://github.com/fast/repo"
+    assert hedge.extra_spent == 1
+    page.context.new_page.assert_awaited_once()
+    page.context.new_page.return_value.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_falls_through_failed_engines_without_hedging():
+    engines = {
+        "broken": AsyncMock(side_effect=PlaywrightError("captcha")),
+        "empty": AsyncMock(return_value=None),
+        "good": AsyncMock(return_value="https://github.com/good/repo"),
+    }
+    page = page_with_context()
+    hedge = HedgeConfig(delay_seconds=5)
+
+    with patch.dict("rss_fetch_from_search.scraper.SEARCH_ENGINES", engines):
+        url = await HedgedSearch(page, "repo", FetchSession(hedge=hedge)).run(
+            ["broken", "empty", "good"], hedge
+        )
+
+    assert url == "https://github.com/good/repo"
+    assert hedge.extra_spent == 0
+    page.context.new_page.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_respects_run_budget():
+    engines = {
+        "a": delayed_engine(0.05, None),
+        "b": delayed_engine(0.01, None),
+        "c": delayed_engine(0.01, "https://github.com/c/repo"),
+    }
+    page = page_with_context()
+    hedge = HedgeConfig(delay_seconds=0, max_extra_per_run=1)
+
+    with patch.dict("rss_fetch_from_search.scraper.SEARCH_ENGINES", engines):
+        url = await HedgedSearch(page, "repo", FetchSession(hedge=hedge)).run(
+            ["a", "b", "c"], hedge
+        )
+
+    assert url == "https://github.com/c/repo"
+    assert hedge.extra_spent == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_cancels_losers_and_closes_pages():
+    cancelled = asyncio.Event()
+
+    async def hanging(_page, _keyword):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    engines = {"hang": hanging, "win": delayed_engine(0, "https://github.com/w/r")}
+    page = page_with_context()
+    hedged_page = AsyncMock()
+    page.context.new_page = AsyncMock(return_value=hedged_page)
+    hedge = HedgeConfig(delay_seconds=0)
+
+    with patch.dict("rss_fetch_from_search.scraper.SEARCH_ENGINES", engines):
+        url = await HedgedSearch(page, "r", FetchSession(hedge=hedge)).run(
+            ["hang", "win"], hedge
+        )
+
+    assert url == "https://github.com/w/r"
+    assert cancelled.is_set()
+    hedged_page.close.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_resolve_redirect_success_github():
     mock_page = AsyncMock()
@@ -358,6 +627,7 @@ async def test_resolve_redirect_success_github():
 
     assert result == "https://github.com/user/repo"
     mock_page.goto.assert_called_with(original_url, wait_until="load", timeout=10000)
+    mock_page.wait_for_url.assert_awaited_once()
     assert urlparse(result).netloc == "github.com"
 
 
@@ -371,9 +641,12 @@ async def test_resolve_redirect_fail_non_github():
     mock_page.wait_for_timeout = AsyncMock()
 
     url = "https://example.com/some-redirect"
-    result = await resolve_redirect(mock_page, url)
+    with patch("utils.retry.asyncio.sleep", new=AsyncMock()):
+        result = await resolve_redirect(mock_page, url)
 
     assert result == url  # fallback to original URL
+    assert mock_page.goto.await_count == 3
+    assert mock_page.goto.await_args.kwargs["timeout"] == 30000
 
 
 @pytest.mark.asyncio
@@ -387,6 +660,48 @@ async def test_resolve_redirect_exception_handling():
     assert result == url  # fallback
 
 
+@pytest.mark.asyncio
+async def test_resolve_redirect_skips_navigation_for_canonical_github_url():
+    mock_page = AsyncMock()
+
+    url = "https://github.com/tiangolo/fastapi/releases"
+    assert await resolve_redirect(mock_page, url) == url
+
+    mock_page.goto.assert_not_awaited()
+    assert not is_canonical_github_url("https://github.com/topics/python")
+
+
+@pytest.mark.asyncio
+async def test_resolve_redirect_uses_and_fills_redirect_map(tmp_path):
+    mock_page = AsyncMock()
+    mock_page.url = "https://github.com/user/repo"
+    url = "https://www.bing.com/ck/a?u=abc"
+
+    with TTLCache(tmp_path / "cache.sqlite3", namespace="redirects") as cache:
+        assert await resolve_redirect(mock_page, url, cache=cache) == mock_page.url
+        assert await resolve_redirect(mock_page, url, cache=cache) == mock_page.url
+        # A known rename wins over the canonical-URL shortcut
+        cache.set("https://github.com/old/name", "https://github.com/new/name")
+        renamed = await resolve_redirect(
+            mock_page, "https://github.com/old/name", cache=cache
+        )
+
+    mock_page.goto.assert_awaited_once()
+    assert renamed == "https://github.com/new/name"
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_resolve_redirect_does_not_remember_failures(tmp_path):
+    mock_page = AsyncMock()
+    mock_page.goto.side_effect = PlaywrightError("Target closed")
+    url = "https://example.com/fail"
+
+    with TTLCache(tmp_path / "cache.sqlite3") as cache:
+        assert await resolve_redirect(mock_page, url, cache=cache) == url
+        assert cache.get(url).found is False
+
+
 @pytest.mark.asyncio
 async def test_extract_rss_links_success():
     mock_page = AsyncMock()
@@ -464,6 +779,130 @@ async def test_extract_rss_links_empty_url():
     assert result is None
 
 
+RELEASES_HEAD = """<!DOCTYPE html>
+<html><head>
+<title>Releases · tiangolo/fastapi</title>
+<link rel="alternate" type="application/atom+xml" title="Release notes"
+      href="https://github.com/tiangolo/fastapi/releases.atom">
+</head>
+"""
+
+
+def mock_http_client(handler, **kwargs) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_via_http_stops_after_head():
+    body_read = False
+
+    async def stream():
+        nonlocal body_read
+        yield RELEASES_HEAD.encode()
+        body_read = True
+        yield b"<body>" + b"x" * 1024 + b"</body></html>"
+
+    def handler(_):
+        return httpx.Response(
+            200, headers={"content-type": "text/html"}, content=stream()
+        )
+
+    async with mock_http_client(handler) as client:
+        links = await extract_rss_links_via_http(
+            client, "https://github.com/tiangolo/fastapi/releases"
+        )
+
+    assert links == ["https://github.com/tiangolo/fastapi/releases.atom"]
+    assert body_read is False
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_via_http_resolves_relative_href():
+    html = '<html><head><link rel="alternate" type="application/atom+xml" '
+    html += 'href="/owner/repo/releases.atom"></head><body></body></html>'
+
+    def handler(_):
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=html)
+
+    async with mock_http_client(handler) as client:
+        links = await extract_rss_links_via_http(
+            client, "https://github.com/owner/repo/releases"
+        )
+
+    assert links == ["https://github.com/owner/repo/releases.atom"]
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_via_http_records_repo_renames(tmp_path):
+    def handler(request):
+        if request.url.path.startswith("/old/"):
+            return httpx.Response(
+                301, headers={"location": "https://github.com/new/repo/releases"}
+            )
+        return httpx.Response(
+            200, headers={"content-type": "text/html"}, text=RELEASES_HEAD
+        )
+
+    with TTLCache(tmp_path / "cache.sqlite3") as redirects:
+        async with mock_http_client(handler, follow_redirects=True) as client:
+            await extract_rss_links_via_http(
+                client, "https://github.com/old/repo/releases", redirects
+            )
+
+        assert redirects.get("https://github.com/old/repo/releases").value == (
+            "https://github.com/new/repo/releases"
+        )
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_via_http_undecided_on_error_status():
+    def handler(_):
+        return httpx.Response(429, headers={"content-type": "text/html"})
+
+    async with mock_http_client(handler) as client:
+        links = await extract_rss_links_via_http(client, "https://github.com/a/b")
+
+    assert links is None
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_prefers_http_path():
+    mock_page = AsyncMock()
+
+    def handler(_):
+        return httpx.Response(
+            200, headers={"content-type": "text/html"}, text=RELEASES_HEAD + "<body>"
+        )
+
+    async with mock_http_client(handler) as client:
+        result = await extract_rss_links(
+            mock_page, "https://github.com/tiangolo/fastapi/releases", client
+        )
+
+    assert result == "https://github.com/tiangolo/fastapi/releases.atom"
+    mock_page.goto.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_extract_rss_links_falls_back_to_browser_when_http_undecided():
+    mock_page = AsyncMock()
+    mock_locator = MagicMock()
+    mock_tag = AsyncMock()
+    mock_tag.get_attribute = AsyncMock(return_value="/feed.atom")
+    mock_locator.count = AsyncMock(return_value=1)
+    mock_locator.nth.return_value = mock_tag
+    mock_page.locator = MagicMock(return_value=mock_locator)
+
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async with mock_http_client(handler) as client:
+        result = await extract_rss_links(mock_page, "https://example.com/p", client)
+
+    assert result == "https://example.com/feed.atom"
+    mock_page.goto.assert_awaited_once()
+
+
 @pytest.mark.parametrize(
     "url,expected",
     [
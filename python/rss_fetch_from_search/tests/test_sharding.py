@@ -0,0 +1,76 @@
+import os
+
+from rss_fetch_from_search.scraper import HEDGE_RUN_BUDGET, HedgeConfig
+from rss_fetch_from_search.sharding import (
+    ShardCoordinator,
+    ShardReporter,
+    split_shards,
+)
+from utils.journal import Journal
+from utils.metrics import METRICS
+
+
+def fake_shard(index, techs, events, _settings):
+    reporter = ShardReporter(index, events)
+    for tech in techs.values():
+        if tech["name"] == "crash":
+            # Die like a killed browser process would, without any cleanup
+            os._exit(3)
+        reporter.append(tech["name"], {**tech, "rss": f"{tech['name']}.atom"})
+    METRICS.count("rss.techs", len(techs), result="found")
+    reporter.finish()
+    reporter.send_metrics()
+    reporter.close()
+
+
+def test_split_shards_deals_round_robin():
+    techs = {str(i): {"name": f"t{i}"} for i in range(5)}
+
+    parts = split_shards(techs, 2)
+
+    assert [list(part) for part in parts] == [["0", "2", "4"], ["1", "3"]]
+    assert len(split_shards(techs, 8)) == 5
+
+
+def test_hedge_budget_is_shared_between_shards():
+    hedge = HedgeConfig(extra_spent=3)
+
+    shard = hedge.split(4)
+
+    assert hedge.max_extra_per_run == HEDGE_RUN_BUDGET
+    assert shard.max_extra_per_run == HEDGE_RUN_BUDGET // 4
+    assert shard.extra_spent == 0
+    assert HedgeConfig(max_extra_per_run=2).split(4).max_extra_per_run == 1
+
+
+def test_coordinator_journals_and_counts_progress(tmp_path, capsys):
+    parts = [{"0": {"name": "fastapi"}}, {"1": {"name": "django"}}]
+    with Journal(tmp_path / "techs.journal.jsonl") as journal:
+        coordinator = ShardCoordinator(parts, journal)
+        coordinator.handle(("done", 1, "django", {"name": "django", "rss": None}))
+
+        assert coordinator.done() == 1
+        assert journal.load() == {"django": {"name": "django", "rss": None}}
+    assert "[shard 2/2] django (1/1, 1/2 overall)" in capsys.readouterr().out
+
+
+def test_coordinator_runs_shards_in_processes_and_isolates_crashes(tmp_path):
+    techs = {
+        "0": {"name": "fastapi"},
+        "1": {"name": "crash"},
+        "2": {"name": "react"},
+        "3": {"name": "django"},
+    }
+    with Journal(tmp_path / "techs.journal.jsonl") as journal:
+        coordinator = ShardCoordinator(split_shards(techs, 2), journal, fake_shard)
+        records = coordinator.run(str(tmp_path / "cache.sqlite3"))
+        journaled = journal.load()
+
+    assert set(records) == set(journaled) == {"fastapi", "react"}
+    assert records["react"]["rss"] == "react.atom"
+    assert coordinator.failed() == [1]
+    counters = METRICS.counters
+    assert counters[("rss.shards", (("result", "finished"),))] == 1
+    assert counters[("rss.shards", (("result", "failed"),))] == 1
+    # Only the shard that finished sent its counters back
+    assert counters[("rss.techs", (("result", "found"),))] == 2
@@ -1,14 +1,22 @@
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 
 from rss_fetch_from_search import usecase
+from rss_fetch_from_search.scraper import HedgeConfig
+from rss_fetch_from_search.sharding import ShardsFailed
+from utils.job_queue import JobQueue
+from utils.journal import Journal
 
 
 @pytest.mark.asyncio
-async def test_fetch_rss():
-    mocked_data = {"react": {"rss": "https://github.com/facebook/react/releases.atom"}}
+async def test_fetch_rss(tmp_path):
+    mocked_data = [
+        {"name": "react", "rss": "https://github.com/facebook/react/releases.atom"}
+    ]
+    cache_path = tmp_path / "search_cache.sqlite3"
+    journal_path = tmp_path / "techs.journal.jsonl"
 
     with patch(
         "rss_fetch_from_search.usecase.load_dist", return_value={"react": {}}
@@ -20,7 +28,9 @@ async def test_fetch_rss():
         "rss_fetch_from_search.usecase.save_json"
     ) as mock_save:
 
-        await usecase.fetch_rss()
+        await usecase.fetch_rss(
+            search_cache_path=str(cache_path), journal_path=str(journal_path)
+        )
 
         input_path = (
             Path(__file__).parent.parent.parent
@@ -29,5 +39,160 @@ async def test_fetch_rss():
         output_path = "outputs/rss_fetch_from_search/techs.json"
 
         mock_load.assert_called_once_with(input_path)
-        mock_fetch.assert_awaited_once_with({"react": {}})
+        mock_fetch.assert_awaited_once_with(
+            {"react": {}}, search_cache=ANY, hedge=None, journal=ANY
+        )
+        assert cache_path.exists()
         mock_save.assert_called_once_with(mocked_data, output_path)
+        # A finished run clears its checkpoints
+        assert not journal_path.exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "retry_failed, expected_pending",
+    [
+        (False, {"2": {"name": "nextjs"}}),
+        (True, {"1": {"name": "django"}, "2": {"name": "nextjs"}}),
+    ],
+)
+async def test_fetch_rss_resumes_from_journal(tmp_path, retry_failed, expected_pending):
+    techs = {"0": {"name": "fastapi"}, "1": {"name": "django"}, "2": {"name": "nextjs"}}
+    journal_path = tmp_path / "techs.journal.jsonl"
+    fastapi = {"name": "fastapi", "url": "u", "rss": "https://example.com/a.atom"}
+    hedge = HedgeConfig()
+    with Journal(journal_path) as journal:
+        journal.append("fastapi", fastapi)
+        journal.append("django", {"name": "django", "url": None, "rss": None})
+
+    async def fake_fetch_techs_rss(pending, **_kwargs):
+        return [{"name": t["name"], "rss": "r"} for t in pending.values()]
+
+    with patch("rss_fetch_from_search.usecase.load_dist", return_value=techs), patch(
+        "rss_fetch_from_search.usecase.fetch_techs_rss",
+        new=AsyncMock(side_effect=fake_fetch_techs_rss),
+    ) as mock_fetch, patch("rss_fetch_from_search.usecase.save_json") as mock_save:
+        await usecase.fetch_rss(
+            search_cache_path=str(tmp_path / "cache.sqlite3"),
+            journal_path=str(journal_path),
+            retry_failed=retry_failed,
+            hedge=hedge,
+        )
+
+    assert mock_fetch.await_args.args[0] == expected_pending
+    assert mock_fetch.await_args.kwargs["hedge"] is hedge
+    saved = mock_save.call_args.args[0]
+    assert saved[0] == fastapi
+    assert [t["name"] for t in saved] == ["fastapi", "django", "nextjs"]
+    assert (saved[1]["rss"] is None) is not retry_failed
+
+
+def fake_shard_run(exitcodes: list[int]):
+    def run(coordinator, _search_cache_path):
+        assert [list(part.values()) for part in coordinator.parts] == [
+            [{"name": "django"}],
+            [{"name": "react"}],
+        ]
+        records = {}
+        for index, exitcode in enumerate(exitcodes):
+            if exitcode == 0:
+                name = coordinator.parts[index][str(index + 1)]["name"]
+                record = {"name": name, "url": "u", "rss": f"{name}.atom"}
+                coordinator.handle(("done", index, name, record))
+                coordinator.handle(("finished", index, None, None))
+                records[name] = record
+            coordinator.report_exit(index, exitcode)
+        return records
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_fetch_rss_sharded_merges_in_input_order(tmp_path):
+    techs = {"0": {"name": "fastapi"}, "1": {"name": "django"}, "2": {"name": "react"}}
+    journal_path = tmp_path / "techs.journal.jsonl"
+    with Journal(journal_path) as journal:
+        journal.append("fastapi", {"name": "fastapi", "url": "u", "rss": "a.atom"})
+
+    with patch("rss_fetch_from_search.usecase.load_dist", return_value=techs), patch(
+        "rss_fetch_from_search.usecase.ShardCoordinator.run",
+        autospec=True,
+        side_effect=fake_shard_run([0, 0]),
+    ), patch("rss_fetch_from_search.usecase.save_json") as mock_save:
+        await usecase.fetch_rss(
+            search_cache_path=str(tmp_path / "cache.sqlite3"),
+            journal_path=str(journal_path),
+            shards=2,
+        )
+
+    saved = mock_save.call_args.args[0]
+    assert [t["name"] for t in saved] == ["fastapi", "django", "react"]
+    assert saved[1]["rss"] == "django.atom"
+    assert not journal_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_fetch_rss_sharded_keeps_checkpoints_when_a_shard_crashes(tmp_path):
+    techs = {"0": {"name": "fastapi"}, "1": {"name": "django"}, "2": {"name": "react"}}
+    journal_path = tmp_path / "techs.journal.jsonl"
+    with Journal(journal_path) as journal:
+        journal.append("fastapi", {"name": "fastapi", "url": "u", "rss": "a.atom"})
+
+    with patch("rss_fetch_from_search.usecase.load_dist", return_value=techs), patch(
+        "rss_fetch_from_search.usecase.ShardCoordinator.run",
+        autospec=True,
+        # django's shard crashed; react finished
+        side_effect=fake_shard_run([3, 0]),
+    ), patch("rss_fetch_from_search.usecase.save_json") as mock_save:
+        with pytest.raises(ShardsFailed):
+            await usecase.fetch_rss(
+                search_cache_path=str(tmp_path / "cache.sqlite3"),
+                journal_path=str(journal_path),
+                shards=2,
+            )
+
+    mock_save.assert_not_called()
+    with Journal(journal_path) as journal:
+        # The next run only has django left to do
+        assert set(journal.load()) == {"fastapi", "react"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_rss_from_queue_skips_work_done_by_other_workers(tmp_path):
+    techs = {"0": {"name": "fastapi"}, "1": {"name": "django"}, "2": {"name": "react"}}
+    queue_path = str(tmp_path / "jobs.sqlite3")
+    with JobQueue(queue_path, "rss") as jobs:
+        jobs.enqueue_many({"react": techs["2"]})
+        jobs.complete(jobs.lease("other")[0], {"name": "react", "rss": "r.atom"})
+
+    async def fake_fetch_batch(pending, _session, journal):
+        for tech in pending.values():
+            if tech["name"] != "django":
+                journal.append(tech["name"], {**tech, "url": "u", "rss": "a.atom"})
+        return []
+
+    session = MagicMock()
+    session.__aenter__.return_value = "session"
+
+    with patch("rss_fetch_from_search.usecase.load_dist", return_value=techs), patch(
+        "rss_fetch_from_search.usecase.open_fetch_session", return_value=session
+    ) as mock_open, patch(
+        "rss_fetch_from_search.usecase.fetch_batch",
+        new=AsyncMock(side_effect=fake_fetch_batch),
+    ) as mock_fetch, patch(
+        "rss_fetch_from_search.usecase.save_json"
+    ) as mock_save:
+        await usecase.fetch_rss_from_queue(
+            queue_path, search_cache_path=str(tmp_path / "cache.sqlite3"), owner="w1"
+        )
+
+    assert list(mock_fetch.await_args_list[0].args[0]) == ["fastapi", "django"]
+    # django never finished, so it went back to the queue until out of attempts
+    assert mock_fetch.await_count == 3
+    # Every batch ran in the worker's one browser session
+    mock_open.assert_called_once()
+    assert {call.args[1] for call in mock_fetch.await_args_list} == {"session"}
+    saved = mock_save.call_args.args[0]
+    assert [t["name"] for t in saved] == ["fastapi", "django", "react"]
+    assert saved[1]["rss"] is None
+    assert saved[2]["rss"] == "r.atom"
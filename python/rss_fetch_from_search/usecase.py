@@ -1,16 +1,137 @@
+import asyncio
 from pathlib import Path
+from typing import Dict
 
 from rss_fetch_from_search.reader import load_dist
-from rss_fetch_from_search.scraper import fetch_techs_rss
+from rss_fetch_from_search.scraper import (
+    CONCURRENCY,
+    HedgeConfig,
+    fetch_batch,
+    fetch_techs_rss,
+    open_fetch_session,
+)
+from rss_fetch_from_search.sharding import (
+    ShardCoordinator,
+    ShardsFailed,
+    split_shards,
+)
+from utils.cache import TTLCache
+from utils.job_queue import JobCheckpoint, JobQueue, default_owner, leased_batches
+from utils.journal import Journal
 from utils.writer import save_json
 
+SEARCH_CACHE_PATH = "outputs/rss_fetch_from_search/search_cache.sqlite3"
+JOURNAL_PATH = "outputs/rss_fetch_from_search/techs.journal.jsonl"
+OUTPUT_PATH = "outputs/rss_fetch_from_search/techs.json"
+INPUT_PATH = (
+    Path(__file__).parent.parent / "inputs/rss_fetch_from_search/tech_keywords.json"
+)
+QUEUE_NAME = "rss"
+# A few techs per lease, so a crashed worker holds back little work
+QUEUE_BATCH_SIZE = CONCURRENCY * 2
 
-async def fetch_rss():
-    input_path = (
-        Path(__file__).parent.parent / "inputs/rss_fetch_from_search/tech_keywords.json"
-    )
-    techs = load_dist(input_path)
 
-    data = await fetch_techs_rss(techs)
+async def fetch_rss(
+    search_cache_path: str = SEARCH_CACHE_PATH,
+    journal_path: str = JOURNAL_PATH,
+    retry_failed: bool = False,
+    shards: int = 1,
+    hedge: HedgeConfig | None = None,
+):
+    techs = load_dist(INPUT_PATH)
 
-    save_json(data, "outputs/rss_fetch_from_search/techs.json")
+    with TTLCache(search_cache_path, namespace="search") as search_cache, Journal(
+        journal_path
+    ) as journal:
+        resumed, pending = split_resumed_techs(techs, journal.load(), retry_failed)
+        if resumed:
+            print(f"⏭ Resuming: {len(resumed)} techs already in {journal_path}")
+
+        if shards > 1:
+            # Workers open the cache themselves; keep this connection out of their way
+            coordinator = ShardCoordinator(
+                split_shards(pending, shards), journal, hedge=hedge
+            )
+            records = await asyncio.to_thread(coordinator.run, search_cache_path)
+            data = order_by_input(techs, {r["name"]: r for r in resumed} | records)
+            failed = coordinator.failed()
+        else:
+            data = resumed + await fetch_techs_rss(
+                pending, search_cache=search_cache, hedge=hedge, journal=journal
+            )
+            failed = []
+        stats = search_cache.stats
+        print(
+            f"🗄 Search cache: {stats.hits} hits, {stats.negative_hits} negative hits, "
+            f"{stats.misses} misses"
+        )
+
+        if failed:
+            # Lost techs would read as "no feed"; keep the checkpoints so the
+            # next run only retries them
+            raise ShardsFailed(
+                f"{len(failed)} of {shards} shards failed; {OUTPUT_PATH} was not "
+                f"written, rerun to finish the techs missing from {journal_path}"
+            )
+        save_json(data, OUTPUT_PATH)
+        # The run is complete; the next one starts from scratch
+        journal.clear()
+
+
+async def fetch_rss_from_queue(
+    queue_path: str,
+    search_cache_path: str = SEARCH_CACHE_PATH,
+    owner: str | None = None,
+    hedge: HedgeConfig | None = None,
+):
+    """Work through the shared queue with any number of other workers.
+
+    Every worker enqueues the keyword list (known keys are skipped), then
+    leases batches until none are left and writes techs.json from all results.
+    """
+    techs = load_dist(INPUT_PATH)
+    owner = owner or default_owner()
+
+    with JobQueue(queue_path, QUEUE_NAME) as jobs, TTLCache(
+        search_cache_path, namespace="search"
+    ) as search_cache:
+        added = jobs.enqueue_many({tech["name"]: tech for tech in techs.values()})
+        print(f"📬 Worker {owner}: {added} new techs queued in {queue_path}")
+
+        # One browser, client and page pool for every batch this worker leases
+        async with open_fetch_session(
+            search_cache=search_cache, hedge=hedge
+        ) as session:
+            async for batch in leased_batches(jobs, owner, QUEUE_BATCH_SIZE):
+                checkpoint = JobCheckpoint(jobs, batch)
+                try:
+                    await fetch_batch(
+                        {job.key: job.payload for job in batch}, session, checkpoint
+                    )
+                finally:
+                    checkpoint.close()
+
+        jobs.print_summary()
+        save_json(order_by_input(techs, jobs.results()), OUTPUT_PATH)
+
+
+def split_resumed_techs(
+    techs: Dict[str, Dict], done: Dict[str, Dict], retry_failed: bool = False
+) -> tuple[list[Dict], Dict[str, Dict]]:
+    resumed = []
+    pending = {}
+    for key, tech in techs.items():
+        record = done.get(tech.get("name", ""))
+        if record is None or (retry_failed and record.get("rss") is None):
+            pending[key] = tech
+        else:
+            resumed.append(record)
+    return resumed, pending
+
+
+def order_by_input(techs: Dict[str, Dict], records: Dict[str, Dict]) -> list[Dict]:
+    """Records in input-key order; techs without one (a crashed shard) have no feed."""
+    return [
+        records.get(tech.get("name", "")) or {**tech, "url": None, "rss": None}
+        for tech in techs.values()
+    ]
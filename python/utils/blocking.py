@@ -0,0 +1,129 @@
+import re
+from dataclasses import dataclass
+
+from utils.network import NETWORK_STATS, NetworkStats
+
+# Playwright only intercepts requests matching a registered route pattern, so
+# resource types are turned into file-extension patterns instead of a `**/*`
+# route that sends every request (allowed or not) through Python.
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpe?g", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "stylesheet": ("css",),
+    "font": ("woff2?", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m4a", "m3u8"),
+}
+
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "analytics.google.com",
+    "plausible.io",
+    "hotjar.com",
+    "segment.io",
+)
+AD_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "adservice.google.com",
+    "bat.bing.com",
+    "amazon-adsystem.com",
+)
+TELEMETRY_HOSTS = (
+    "collector.github.com",
+    "browser-intake-datadoghq.com",
+    "sentry.io",
+    "newrelic.com",
+    "nr-data.net",
+)
+
+
+@dataclass(frozen=True)
+class BlockingPolicy:
+    """What a scraper does not need to download, installed as narrow routes.
+
+    ``resource_types`` are matched by file extension and confirmed against the
+    request's resource type; set ``exact_types`` to route every request
+    instead, for types that extensions cannot catch (e.g. extensionless
+    images). ``hosts`` also block their subdomains; ``url_globs`` use
+    Playwright's glob syntax.
+    """
+
+    name: str
+    resource_types: frozenset[str] = frozenset()
+    hosts: tuple[str, ...] = ()
+    url_globs: tuple[str, ...] = ()
+    exact_types: bool = False
+
+    def __post_init__(self):
+        unknown = self.resource_types - set(RESOURCE_TYPE_EXTENSIONS)
+        if unknown and not self.exact_types:
+            raise ValueError(
+                f"Resource types {sorted(unknown)} have no URL pattern; "
+                "use exact_types=True to block them"
+            )
+
+    def type_pattern(self) -> re.Pattern | None:
+        extensions = [
+            ext
+            for resource_type in sorted(self.resource_types)
+            for ext in RESOURCE_TYPE_EXTENSIONS.get(resource_type, ())
+        ]
+        if not extensions:
+            return None
+        return re.compile(rf"\.(?:{'|'.join(extensions)})(?:[?#]|$)", re.IGNORECASE)
+
+    def host_pattern(self) -> re.Pattern | None:
+        if not self.hosts:
+            return None
+        hosts = "|".join(re.escape(host) for host in self.hosts)
+        return re.compile(rf"^[a-z]+://(?:[^/?#@]+\.)?(?:{hosts})(?::\d+)?(?:[/?#]|$)")
+
+    def routes(self) -> list[tuple[str | re.Pattern, str]]:
+        routes: list[tuple[str | re.Pattern, str]] = []
+        if self.resource_types:
+            if self.exact_types:
+                routes.append(("**/*", "resource_type"))
+            else:
+                pattern = self.type_pattern()
+                if pattern is not None:
+                    routes.append((pattern, "resource_type"))
+        host_pattern = self.host_pattern()
+        if host_pattern is not None:
+            routes.append((host_pattern, "host"))
+        routes.extend((glob, "url_glob") for glob in self.url_globs)
+        return routes
+
+    def describe(self) -> dict:
+        return {
+            "resource_types": sorted(self.resource_types),
+            "hosts": len(self.hosts),
+            "url_globs": list(self.url_globs),
+            "exact_types": self.exact_types,
+            "routes": len(self.routes()),
+        }
+
+    async def install(self, target, network: NetworkStats = NETWORK_STATS):
+        """Register the policy's routes on a browser context or page."""
+        network.record_policy(self.name, self.describe())
+        for url, rule in self.routes():
+            await target.route(url, self.handler(rule, network))
+
+    def handler(self, rule: str, network: NetworkStats):
+        async def block(route, request):
+            resource_type = getattr(request, "resource_type", "")
+            # Extension and catch-all routes can match other types; pass those on
+            if rule == "resource_type" and resource_type not in self.resource_types:
+                await route.fallback()
+                return
+            network.record_blocked(request, rule)
+            await route.abort()
+
+        return block
+
+
+NO_BLOCKING = BlockingPolicy(name="none")
+STATIC_RESOURCES = BlockingPolicy(
+    name="static", resource_types=frozenset({"image", "stylesheet", "font"})
+)
+THIRD_PARTY_HOSTS = ANALYTICS_HOSTS + AD_HOSTS + TELEMETRY_HOSTS
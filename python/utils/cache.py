@@ -0,0 +1,180 @@
+import copy
+import json
+import sqlite3
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_NEGATIVE_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    negative_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+@dataclass
+class CacheLookup:
+    found: bool
+    value: Any = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class TTLCache:
+    """SQLite-backed key/value cache with per-entry expiry.
+
+    ``None`` values are cached as negative entries whose TTL doubles every
+    time the lookup comes back empty again, up to a week.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        namespace: str = "default",
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def sibling(self, namespace: str, ttl: float | None = None) -> "TTLCache":
+        """Another namespace in the same file, sharing this cache's connection.
+
+        Only the original cache should be closed.
+        """
+        cache = copy.copy(self)
+        cache.namespace = namespace
+        cache.ttl = self.ttl if ttl is None else ttl
+        cache.stats = CacheStats()
+        return cache
+
+    @staticmethod
+    def encode_key(key: Hashable) -> str:
+        parts = list(key) if isinstance(key, tuple) else [key]
+        return json.dumps(parts, ensure_ascii=False)
+
+    def peek(self, key: Hashable) -> CacheLookup:
+        """Like ``get``, but leaves the stats and the entry's LRU position alone."""
+        row = self.lookup(self.encode_key(key))
+        if row is None:
+            return CacheLookup(found=False)
+        return CacheLookup(found=True, value=None if row[2] else json.loads(row[0]))
+
+    def lookup(self, encoded: str) -> tuple | None:
+        row = self.conn.execute(
+            "SELECT value, expires_at, negative_count FROM cache_entries "
+            "WHERE namespace = ? AND key = ?",
+            (self.namespace, encoded),
+        ).fetchone()
+        if row is None or row[1] <= self.clock():
+            return None
+        return row
+
+    def get(self, key: Hashable) -> CacheLookup:
+        encoded = self.encode_key(key)
+        now = self.clock()
+        row = self.lookup(encoded)
+        if row is None:
+            self.stats.misses += 1
+            return CacheLookup(found=False)
+
+        self.conn.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, self.namespace, encoded),
+        )
+        self.conn.commit()
+        if row[2]:
+            self.stats.negative_hits += 1
+            return CacheLookup(found=True, value=None)
+        self.stats.hits += 1
+        return CacheLookup(found=True, value=json.loads(row[0]))
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        encoded = self.encode_key(key)
+        now = self.clock()
+        negative_count = 0
+        if value is None:
+            row = self.conn.execute(
+                "SELECT negative_count FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, encoded),
+            ).fetchone()
+            previous = row[0] if row else 0
+            negative_count = previous + 1
+            ttl = min(
+                DEFAULT_NEGATIVE_TTL_SECONDS * 2**previous,
+                DEFAULT_MAX_NEGATIVE_TTL_SECONDS,
+            )
+        elif ttl is None:
+            ttl = self.ttl
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(namespace, key, value, expires_at, accessed_at, negative_count) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.namespace,
+                encoded,
+                None if value is None else json.dumps(value, ensure_ascii=False),
+                now + ttl,
+                now,
+                negative_count,
+            ),
+        )
+        self.stats.writes += 1
+        self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        (count,) = self.conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        cursor = self.conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache_entries WHERE namespace = ? "
+            "ORDER BY expires_at <= ? DESC, accessed_at ASC LIMIT ?)",
+            (self.namespace, self.namespace, self.clock(), overflow),
+        )
+        self.stats.evictions += cursor.rowcount
@@ -0,0 +1,176 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from utils.metrics import METRICS
+from utils.retry import is_retryable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    # Failed calls in a row that open the breaker
+    failure_threshold: int = 3
+    # Seconds an open breaker rejects calls before letting one probe through
+    reset_seconds: float = 60.0
+
+
+DEFAULT_BREAKER_CONFIG = BreakerConfig()
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+@dataclass
+class BreakerCall:
+    admitted_at: float
+    failure: str | None = None
+
+
+# The call in progress, so helpers deep in a search (e.g. CAPTCHA handling)
+# can mark it as degraded without threading the breaker through every function
+CURRENT_CALL: ContextVar[BreakerCall | None] = ContextVar("breaker_call", default=None)
+
+
+def report_degraded(reason: str):
+    call = CURRENT_CALL.get()
+    if call is not None:
+        call.failure = reason
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe -> closed.
+
+    A call fails when it raises a network/timeout error or is marked with
+    report_degraded (a CAPTCHA page); cancelled calls count as neither.
+    Calls admitted before the breaker last opened are stragglers: their
+    outcome says nothing about the site now, so only the half-open probe
+    decides whether an open breaker closes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: BreakerConfig = DEFAULT_BREAKER_CONFIG,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.config = config
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe: BreakerCall | None = None
+
+    def allow(self) -> BreakerCall | None:
+        if self.state == OPEN and self.opened_at is not None:
+            if self.clock() - self.opened_at < self.config.reset_seconds:
+                return None
+            self.transition(HALF_OPEN)
+        call = BreakerCall(admitted_at=self.clock())
+        if self.state == HALF_OPEN:
+            if self.probe is not None:
+                return None
+            self.probe = call
+        return call
+
+    def is_current(self, call: BreakerCall) -> bool:
+        if call is self.probe:
+            return True
+        if self.state != CLOSED:
+            return False
+        return self.opened_at is None or call.admitted_at > self.opened_at
+
+    def record_success(self, call: BreakerCall):
+        if not self.is_current(call):
+            return
+        self.failures = 0
+        self.probe = None
+        if self.state != CLOSED:
+            self.transition(CLOSED)
+
+    def record_failure(self, call: BreakerCall, reason: str):
+        if not self.is_current(call):
+            return
+        self.failures += 1
+        self.probe = None
+        METRICS.count("breaker.failures", breaker=self.name, reason=reason)
+        if self.state == HALF_OPEN or self.failures >= self.config.failure_threshold:
+            self.opened_at = self.clock()
+            if self.state != OPEN:
+                self.transition(OPEN)
+
+    def transition(self, state: str):
+        print(f"🔌 Circuit {self.name}: {self.state} -> {state}")
+        METRICS.count("breaker.transitions", breaker=self.name, state=state)
+        self.state = state
+
+    @contextmanager
+    def call(self) -> Iterator[BreakerCall]:
+        call = self.allow()
+        if call is None:
+            METRICS.count("breaker.rejected", breaker=self.name)
+            raise CircuitOpenError(f"circuit for {self.name} is {self.state}")
+        token = CURRENT_CALL.set(call)
+        try:
+            yield call
+        except BaseException as e:
+            if is_retryable(e):
+                self.record_failure(call, type(e).__name__)
+            elif call is self.probe:
+                # Cancellations and our own bugs say nothing about the site
+                self.probe = None
+            raise
+        finally:
+            CURRENT_CALL.reset(token)
+        if call.failure is not None:
+            self.record_failure(call, call.failure)
+        else:
+            self.record_success(call)
+
+
+class CircuitBreakers:
+    """Breakers by key (a search engine or a host), shared like RATE_LIMITER."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.configs: dict[str, BreakerConfig] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def configure(self, configs: dict[str, BreakerConfig]):
+        self.configs.update(configs)
+        for key, config in configs.items():
+            if key in self.breakers:
+                self.breakers[key].config = config
+
+    def reset(self):
+        self.configs.clear()
+        self.breakers.clear()
+
+    def get(self, key: str) -> CircuitBreaker:
+        key = key.lower()
+        if key not in self.breakers:
+            config = self.configs.get(key, DEFAULT_BREAKER_CONFIG)
+            self.breakers[key] = CircuitBreaker(key, config, self.clock)
+        return self.breakers[key]
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        return self.get(urlparse(url).netloc or url)
+
+    def print_summary(self):
+        for name, breaker in self.breakers.items():
+            rejected = METRICS.counters.get(
+                ("breaker.rejected", (("breaker", name),)), 0
+            )
+            if breaker.state != CLOSED or rejected:
+                print(f"🔌 {name}: {breaker.state}, {rejected:.0f} calls routed around")
+
+
+BREAKERS = CircuitBreakers()
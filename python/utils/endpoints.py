@@ -0,0 +1,24 @@
+import os
+from urllib.parse import urlparse
+
+BASE_URL_ENV_PREFIX = "SCRAPER_BASE_URL_"
+
+# Overridable per site with e.g. SCRAPER_BASE_URL_MINKABU=http://127.0.0.1:8001,
+# which is how the benchmark suite points the scrapers at its fixture server
+DEFAULT_BASE_URLS = {
+    "brave": "https://search.brave.com",
+    "mojeek": "https://www.mojeek.com",
+    "bing": "https://www.bing.com",
+    "github": "https://github.com",
+    "fotosource": "https://fotosource.com",
+    "minkabu": "https://minkabu.jp",
+}
+
+
+def base_url(site: str) -> str:
+    env_name = f"{BASE_URL_ENV_PREFIX}{site.upper()}"
+    return os.environ.get(env_name, DEFAULT_BASE_URLS[site]).rstrip("/")
+
+
+def base_host(site: str) -> str:
+    return urlparse(base_url(site)).netloc.lower()
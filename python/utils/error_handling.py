@@ -1,8 +1,23 @@
+import asyncio
 import sys
+from collections.abc import Coroutine
+from typing import Any
 
 from playwright.async_api import Error
 
+from utils.metrics import export_metrics
+
 
 def handle_playwright_error(e: Error):
     print(f"❌ Playwright Error: {e}")
     sys.exit(1)
+
+
+def run_scraper(main: Coroutine[Any, Any, Any], metrics_path: str):
+    # Metrics are exported even when the run fails; that is when they matter most
+    try:
+        asyncio.run(main)
+    except Error as e:
+        handle_playwright_error(e)
+    finally:
+        export_metrics(metrics_path)
@@ -0,0 +1,34 @@
+from typing import cast
+
+import httpx
+
+from utils.playwright import DEFAULT_BROWSER_CONTEXT_ARGS
+
+DEFAULT_HTTP_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+
+DEFAULT_HTTP_HEADERS = {
+    # Reuse the browser identity so HTTP and Playwright requests look alike
+    "User-Agent": str(DEFAULT_BROWSER_CONTEXT_ARGS["user_agent"]),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    **cast(dict[str, str], DEFAULT_BROWSER_CONTEXT_ARGS["extra_http_headers"]),
+}
+
+
+def create_http_client(
+    timeout: float = DEFAULT_HTTP_TIMEOUT_SECONDS,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    **kwargs,
+) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    return httpx.AsyncClient(
+        headers=DEFAULT_HTTP_HEADERS,
+        timeout=timeout,
+        limits=limits,
+        follow_redirects=True,
+        **kwargs,
+    )
@@ -0,0 +1,326 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from utils.metrics import METRICS
+
+DEFAULT_VISIBILITY_TIMEOUT = 10 * 60
+DEFAULT_MAX_ATTEMPTS = 3
+POLL_SECONDS = 5.0
+# Leases are renewed this many times per visibility timeout while a batch runs
+HEARTBEATS_PER_LEASE = 3
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    UNIQUE (queue, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (queue, state, available_at);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+    result TEXT,
+    worker TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Job:
+    id: int
+    key: str
+    payload: Any
+    attempts: int
+    owner: str
+
+
+class JobQueue:
+    """Durable work queue in a SQLite file, shared by every worker that opens it.
+
+    ``lease`` hands out pending jobs, and jobs whose lease expired because
+    their worker died, to one worker at a time; ``complete`` and ``fail``
+    are ignored for a lease another worker has since taken. Jobs are unique
+    per key, so every worker can enqueue the full input without duplicates.
+
+    Several hosts may share the file only on a filesystem with working
+    POSIX locks; leases use wall-clock time, so their clocks must agree.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        queue: str = "default",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.queue = queue
+        self.clock = clock
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode, so transactions are only the explicit ones below
+        self.conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two workers cannot both
+        # read the same pending row and then lease it
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue_many(
+        self, payloads: dict[str, Any], max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> int:
+        """Add jobs by key; keys already in the queue, finished or not, are kept."""
+        now = self.clock()
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs "
+                "(queue, key, payload, state, max_attempts, available_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.queue,
+                        key,
+                        json.dumps(payload, ensure_ascii=False),
+                        PENDING,
+                        max_attempts,
+                        now,
+                    )
+                    for key, payload in payloads.items()
+                ],
+            )
+            return conn.total_changes - before
+
+    def lease(
+        self,
+        owner: str,
+        limit: int = 1,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+    ) -> list[Job]:
+        now = self.clock()
+        with self.transaction() as conn:
+            # A worker that died on its last attempt leaves nothing to re-lease
+            expired = conn.execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, "
+                "last_error = 'lease expired' "
+                "WHERE queue = ? AND state = ? AND lease_expires_at <= ? "
+                "AND attempts >= max_attempts",
+                (FAILED, self.queue, LEASED, now),
+            ).rowcount
+            rows = conn.execute(
+                "SELECT id, key, payload, attempts, state FROM jobs WHERE queue = ? "
+                "AND ((state = ? AND available_at <= ?) "
+                "OR (state = ? AND lease_expires_at <= ?)) "
+                "ORDER BY id LIMIT ?",
+                (self.queue, PENDING, now, LEASED, now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, "
+                "lease_owner = ?, lease_expires_at = ? WHERE id = ?",
+                [(LEASED, owner, now + visibility_timeout, row[0]) for row in rows],
+            )
+
+        if expired:
+            METRICS.count("queue.jobs", expired, queue=self.queue, outcome="expired")
+        for row in rows:
+            if row[4] == LEASED:
+                METRICS.count("queue.jobs", queue=self.queue, outcome="re-leased")
+                print(f"♻️ Re-leasing {self.queue}/{row[1]}, its lease expired")
+        return [
+            Job(
+                id=row[0],
+                key=row[1],
+                payload=json.loads(row[2]),
+                attempts=row[3] + 1,
+                owner=owner,
+            )
+            for row in rows
+        ]
+
+    def heartbeat(
+        self, job: Job, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT
+    ) -> bool:
+        """Extend a lease for a long job; False when the lease was lost."""
+        with self.transaction() as conn:
+            return bool(
+                conn.execute(
+                    "UPDATE jobs SET lease_expires_at = ? "
+                    "WHERE id = ? AND state = ? AND lease_owner = ?",
+                    (self.clock() + visibility_timeout, job.id, LEASED, job.owner),
+                ).rowcount
+            )
+
+    def complete(self, job: Job, result: Any = None) -> bool:
+        now = self.clock()
+        with self.transaction() as conn:
+            if not self.release(conn, job, DONE, None, now):
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO job_results "
+                "(job_id, result, worker, finished_at) VALUES (?, ?, ?, ?)",
+                (job.id, json.dumps(result, ensure_ascii=False), job.owner, now),
+            )
+        METRICS.count("queue.jobs", queue=self.queue, outcome="done")
+        return True
+
+    def fail(self, job: Job, error: str, retry_delay: float = 0.0) -> bool:
+        """Put the job back for another attempt, or fail it for good."""
+        now = self.clock()
+        with self.transaction() as conn:
+            attempts, max_attempts = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job.id,)
+            ).fetchone()
+            state = FAILED if attempts >= max_attempts else PENDING
+            if not self.release(conn, job, state, error, now + retry_delay):
+                return False
+        METRICS.count("queue.jobs", queue=self.queue, outcome=state)
+        return True
+
+    def release(
+        self,
+        conn: sqlite3.Connection,
+        job: Job,
+        state: str,
+        error: str | None,
+        available_at: float,
+    ) -> bool:
+        updated = conn.execute(
+            "UPDATE jobs SET state = ?, last_error = ?, available_at = ?, "
+            "lease_owner = NULL, lease_expires_at = NULL "
+            "WHERE id = ? AND state = ? AND lease_owner = ?",
+            (state, error, available_at, job.id, LEASED, job.owner),
+        ).rowcount
+        if not updated:
+            print(f"⚠️ Lost the lease on {self.queue}/{job.key}, dropping the result")
+            METRICS.count("queue.jobs", queue=self.queue, outcome="lost_lease")
+        return bool(updated)
+
+    def counts(self) -> dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT state, COUNT(*) FROM jobs WHERE queue = ? GROUP BY state",
+            (self.queue,),
+        ).fetchall()
+        return {state: 0 for state in (PENDING, LEASED, DONE, FAILED)} | dict(rows)
+
+    def remaining(self) -> int:
+        counts = self.counts()
+        return counts[PENDING] + counts[LEASED]
+
+    def results(self) -> dict[str, Any]:
+        """Results of the finished jobs, in enqueue order."""
+        rows = self.conn.execute(
+            "SELECT jobs.key, job_results.result FROM jobs "
+            "JOIN job_results ON job_results.job_id = jobs.id "
+            "WHERE jobs.queue = ? AND jobs.state = ? ORDER BY jobs.id",
+            (self.queue, DONE),
+        ).fetchall()
+        return {key: json.loads(result) for key, result in rows}
+
+    def print_summary(self):
+        counts = self.counts()
+        print(
+            f"📬 Queue {self.queue}: {counts[DONE]} done, {counts[FAILED]} failed, "
+            f"{counts[PENDING]} pending, {counts[LEASED]} leased"
+        )
+
+
+async def leased_batches(
+    jobs: JobQueue,
+    owner: str,
+    batch_size: int = 1,
+    visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+    poll_seconds: float = POLL_SECONDS,
+) -> AsyncIterator[list[Job]]:
+    """Lease batches until no job is left, waiting out other workers' leases.
+
+    While the caller works on a batch, its leases are renewed in the
+    background, so a job may run longer than ``visibility_timeout``; only a
+    worker that stops heartbeating (it died) lets its jobs expire.
+    """
+    while True:
+        batch = jobs.lease(owner, batch_size, visibility_timeout)
+        if batch:
+            heartbeat = asyncio.create_task(
+                keep_leases(jobs, batch, visibility_timeout)
+            )
+            try:
+                yield batch
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+        elif not jobs.remaining():
+            return
+        else:
+            # The rest is leased elsewhere; it finishes or its lease expires
+            await asyncio.sleep(poll_seconds)
+
+
+async def keep_leases(jobs: JobQueue, batch: list[Job], visibility_timeout: float):
+    live = list(batch)
+    while live:
+        await asyncio.sleep(visibility_timeout / HEARTBEATS_PER_LEASE)
+        # Finished jobs (and leases lost to another worker) drop out
+        live = [job for job in live if jobs.heartbeat(job, visibility_timeout)]
+
+
+class JobCheckpoint:
+    """Checkpoint (see utils.journal) that completes a batch's jobs by key.
+
+    Closing it puts the jobs that never finished back in the queue.
+    """
+
+    def __init__(self, jobs: JobQueue, batch: list[Job]):
+        self.jobs = jobs
+        self.unfinished = {job.key: job for job in batch}
+
+    def append(self, key: str, value: Any):
+        job = self.unfinished.pop(key, None)
+        if job is not None:
+            self.jobs.complete(job, value)
+
+    def close(self):
+        for job in self.unfinished.values():
+            self.jobs.fail(job, "not finished")
+        self.unfinished.clear()
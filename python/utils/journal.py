@@ -0,0 +1,68 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Protocol
+
+
+class Checkpoint(Protocol):
+    """Anything finished items can be recorded to, like a Journal."""
+
+    def append(self, key: str, value: Any): ...
+
+    def close(self): ...
+
+
+class Journal:
+    """Append-only JSON Lines checkpoint file, one record per finished item.
+
+    Every ``append`` is flushed and fsynced before it returns, so a crash
+    loses at most the record being written. On load the last record per key
+    wins and a torn final line is ignored.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.closed = False
+        if self.path.stat().st_size and not self.ends_with_newline():
+            # Terminate a line torn by a crash so the next record starts clean
+            os.write(self.fd, b"\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self.closed:
+            os.close(self.fd)
+            self.closed = True
+
+    def ends_with_newline(self) -> bool:
+        with self.path.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def load(self) -> dict[str, Any]:
+        records: dict[str, Any] = {}
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"⚠️ Skipping unreadable journal line in {self.path}")
+                    continue
+                records[entry["key"]] = entry["value"]
+        return records
+
+    def append(self, key: str, value: Any):
+        line = json.dumps({"key": key, "value": value}, ensure_ascii=False)
+        # One write() per record keeps each line whole
+        os.write(self.fd, (line + "\n").encode("utf-8"))
+        os.fsync(self.fd)
+
+    def clear(self):
+        self.close()
+        self.path.unlink(missing_ok=True)
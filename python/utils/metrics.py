@@ -0,0 +1,192 @@
+import asyncio
+import math
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from utils.writer import save_json
+
+METRICS_PATH_ENV = "SCRAPER_METRICS_PATH"
+PERCENTILES = (50, 95, 99)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    # Nearest-rank, so p99 of a short run is its slowest sample
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def label_key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+@dataclass
+class SpanStats:
+    durations: list[float] = field(default_factory=list)
+    errors: int = 0
+    cancelled: int = 0
+
+
+class Metrics:
+    """Spans and counters around the hot stages, exported once per run.
+
+    Spans are keyed by stage name plus labels (``engine="brave"``) and keep
+    every duration, which is cheap at our volumes and gives exact percentiles.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.spans: dict[tuple[str, LabelKey], SpanStats] = {}
+        self.counters: dict[tuple[str, LabelKey], float] = {}
+        # Extra sections (e.g. network accounting) with summary(), reset(),
+        # prometheus_lines() and print_summary(), exported alongside the spans
+        self.reports: dict[str, Any] = {}
+
+    def register(self, name: str, report: Any):
+        self.reports[name] = report
+
+    def reset(self):
+        self.spans.clear()
+        self.counters.clear()
+        for report in self.reports.values():
+            report.reset()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Raw spans and counters, picklable, for merging into another process."""
+        return {"spans": dict(self.spans), "counters": dict(self.counters)}
+
+    def merge(self, snapshot: dict[str, Any]):
+        for key, stats in snapshot["spans"].items():
+            merged = self.spans.setdefault(key, SpanStats())
+            merged.durations.extend(stats.durations)
+            merged.errors += stats.errors
+            merged.cancelled += stats.cancelled
+        for key, value in snapshot["counters"].items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def span(self, stage: str, **labels: str) -> Iterator[None]:
+        stats = self.spans.setdefault((stage, label_key(labels)), SpanStats())
+        started = self.clock()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # e.g. the losing engines of a hedged search
+            stats.cancelled += 1
+            raise
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            stats.durations.append(self.clock() - started)
+
+    def count(self, name: str, value: float = 1, **labels: str):
+        key = (name, label_key(labels))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self) -> dict[str, Any]:
+        spans = []
+        for (stage, labels), stats in self.spans.items():
+            millis = [d * 1000 for d in stats.durations]
+            entry: dict = {
+                "stage": stage,
+                "labels": dict(labels),
+                "count": len(millis),
+                "errors": stats.errors,
+                "cancelled": stats.cancelled,
+                "total_seconds": round(sum(stats.durations), 3),
+            }
+            for pct in PERCENTILES:
+                entry[f"p{pct}_ms"] = round(percentile(millis, pct), 2)
+            entry["max_ms"] = round(max(millis, default=0.0), 2)
+            spans.append(entry)
+        spans.sort(key=lambda s: s["total_seconds"], reverse=True)
+
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(self.counters.items())
+        ]
+        reports = {name: report.summary() for name, report in self.reports.items()}
+        return {"spans": spans, "counters": counters, **reports}
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP scraper_stage_seconds Wall-clock time spent in a scraper stage.",
+            "# TYPE scraper_stage_seconds summary",
+        ]
+        for (stage, labels), stats in sorted(self.spans.items()):
+            key = (("stage", stage),) + labels
+            for pct in PERCENTILES:
+                quantile = format_labels(key + (("quantile", str(pct / 100)),))
+                value = percentile(stats.durations, pct)
+                lines.append(f"scraper_stage_seconds{quantile} {value:.6f}")
+            lines.append(
+                f"scraper_stage_seconds_sum{format_labels(key)} "
+                f"{sum(stats.durations):.6f}"
+            )
+            lines.append(
+                f"scraper_stage_seconds_count{format_labels(key)} {len(stats.durations)}"
+            )
+
+        lines.append("# TYPE scraper_stage_errors_total counter")
+        for (stage, labels), stats in sorted(self.spans.items()):
+            key = (("stage", stage),) + labels
+            lines.append(
+                f"scraper_stage_errors_total{format_labels(key)} {stats.errors}"
+            )
+
+        lines.append("# TYPE scraper_events_total counter")
+        for (name, labels), value in sorted(self.counters.items()):
+            key = (("name", name),) + labels
+            lines.append(f"scraper_events_total{format_labels(key)} {value:g}")
+        for report in self.reports.values():
+            lines.extend(report.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_file: str | Path):
+        path = Path(output_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".prom":
+            path.write_text(self.to_prometheus(), encoding="utf-8")
+            print(f"✅ Saved metrics to Prometheus text file({path})")
+        else:
+            save_json(self.summary(), path)
+
+    def print_summary(self, limit: int = 10):
+        for entry in self.summary()["spans"][:limit]:
+            labels = ",".join(f"{k}={v}" for k, v in entry["labels"].items())
+            print(
+                f"📊 {entry['stage']}{f'[{labels}]' if labels else ''}: "
+                f"{entry['count']}x, {entry['total_seconds']:.2f}s total, "
+                f"p95 {entry['p95_ms']:.0f}ms, {entry['errors']} errors"
+            )
+        for report in self.reports.values():
+            report.print_summary()
+
+
+METRICS = Metrics()
+
+
+def export_metrics(default_path: str, metrics: Metrics = METRICS):
+    # SCRAPER_METRICS_PATH overrides the location; a .prom suffix selects the text format
+    metrics.print_summary()
+    metrics.export(os.environ.get(METRICS_PATH_ENV, default_path))
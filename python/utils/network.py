@@ -0,0 +1,184 @@
+import heapq
+import weakref
+from dataclasses import asdict, dataclass
+from urllib.parse import urlparse
+
+from playwright.async_api import Error as PlaywrightError
+
+from utils.metrics import METRICS, format_labels
+
+SLOWEST_RESPONSES = 10
+
+
+@dataclass
+class TrafficStats:
+    requests: int = 0
+    finished: int = 0
+    failed: int = 0
+    blocked: int = 0
+    # Response body + header bytes as transferred (chunked and HTTP/2 included);
+    # requests whose sizes were gone by the time they finished are unsized
+    bytes: int = 0
+    unsized: int = 0
+
+
+@dataclass(order=True)
+class SlowResponse:
+    duration_ms: float
+    url: str
+    host: str
+    resource_type: str
+
+
+def request_host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class NetworkStats:
+    """Request/response accounting for every context built by create_context.
+
+    Listens to the context's request events, so nothing is added to the
+    request path itself: the figures show which hosts and resource types
+    cost bandwidth and time, and how much the blocked resources saved.
+    """
+
+    def __init__(self, slowest: int = SLOWEST_RESPONSES):
+        self.slowest_limit = slowest
+        self.hosts: dict[str, TrafficStats] = {}
+        self.resource_types: dict[str, TrafficStats] = {}
+        self.slowest: list[SlowResponse] = []
+        self.blocked_requests: weakref.WeakSet = weakref.WeakSet()
+        self.blocked_by_rule: dict[str, int] = {}
+        self.policies: dict[str, dict] = {}
+
+    def reset(self):
+        self.hosts.clear()
+        self.resource_types.clear()
+        self.slowest.clear()
+        self.blocked_requests = weakref.WeakSet()
+        self.blocked_by_rule.clear()
+        self.policies.clear()
+
+    def attach(self, context):
+        context.on("request", self.on_request)
+        context.on("requestfinished", self.on_finished)
+        context.on("requestfailed", self.on_failed)
+
+    def stats_for(self, request) -> tuple[TrafficStats, TrafficStats]:
+        host = request_host(request.url)
+        resource_type = request.resource_type or "other"
+        return (
+            self.hosts.setdefault(host, TrafficStats()),
+            self.resource_types.setdefault(resource_type, TrafficStats()),
+        )
+
+    def on_request(self, request):
+        for stats in self.stats_for(request):
+            stats.requests += 1
+
+    async def on_finished(self, request):
+        self.record_finished(request)
+        try:
+            sizes = await request.sizes()
+        except PlaywrightError:
+            # The page or context closed before the sizes could be read
+            size = None
+        else:
+            size = max(0, sizes["responseBodySize"]) + max(
+                0, sizes["responseHeadersSize"]
+            )
+        for stats in self.stats_for(request):
+            if size is None:
+                stats.unsized += 1
+            else:
+                stats.bytes += size
+
+    def record_finished(self, request):
+        for stats in self.stats_for(request):
+            stats.finished += 1
+        # responseEnd is relative to startTime and -1 when the timing is unknown
+        duration_ms = request.timing.get("responseEnd", -1)
+        if duration_ms < 0:
+            return
+        slow = SlowResponse(
+            duration_ms=round(duration_ms, 1),
+            url=request.url,
+            host=request_host(request.url),
+            resource_type=request.resource_type,
+        )
+        if len(self.slowest) < self.slowest_limit:
+            heapq.heappush(self.slowest, slow)
+        else:
+            heapq.heappushpop(self.slowest, slow)
+
+    def on_failed(self, request):
+        # Aborts from our own blocking route also surface as failed requests
+        if request in self.blocked_requests:
+            self.blocked_requests.discard(request)
+            return
+        for stats in self.stats_for(request):
+            stats.failed += 1
+
+    def record_blocked(self, request, rule: str = "resource_type"):
+        self.blocked_requests.add(request)
+        self.blocked_by_rule[rule] = self.blocked_by_rule.get(rule, 0) + 1
+        for stats in self.stats_for(request):
+            stats.blocked += 1
+
+    def record_policy(self, name: str, description: dict):
+        self.policies[name] = description
+
+    def summary(self) -> dict:
+        def table(key: str, entries: dict[str, TrafficStats]) -> list[dict]:
+            rows = [{key: name, **asdict(stats)} for name, stats in entries.items()]
+            return sorted(rows, key=lambda r: (r["bytes"], r["requests"]), reverse=True)
+
+        return {
+            "requests": sum(s.requests for s in self.hosts.values()),
+            "blocked": sum(s.blocked for s in self.hosts.values()),
+            "bytes": sum(s.bytes for s in self.hosts.values()),
+            "blocked_by_rule": dict(sorted(self.blocked_by_rule.items())),
+            "policies": self.policies,
+            "hosts": table("host", self.hosts),
+            "resource_types": table("resource_type", self.resource_types),
+            "slowest": [asdict(s) for s in sorted(self.slowest, reverse=True)],
+        }
+
+    def prometheus_lines(self) -> list[str]:
+        lines = ["# TYPE scraper_network_requests_total counter"]
+        for host, stats in sorted(self.hosts.items()):
+            for outcome in ("finished", "failed", "blocked"):
+                labels = format_labels((("host", host), ("outcome", outcome)))
+                lines.append(
+                    f"scraper_network_requests_total{labels} {getattr(stats, outcome)}"
+                )
+        lines.append("# TYPE scraper_network_bytes_total counter")
+        for host, stats in sorted(self.hosts.items()):
+            labels = format_labels((("host", host),))
+            lines.append(f"scraper_network_bytes_total{labels} {stats.bytes}")
+        lines.append("# TYPE scraper_network_blocked_total counter")
+        for rule, blocked in sorted(self.blocked_by_rule.items()):
+            labels = format_labels((("rule", rule),))
+            lines.append(f"scraper_network_blocked_total{labels} {blocked}")
+        return lines
+
+    def print_summary(self, limit: int = 5):
+        summary = self.summary()
+        if not summary["requests"]:
+            return
+        print(
+            f"🌐 Network: {summary['requests']} requests, "
+            f"{summary['bytes'] / 1024:.0f} KiB, {summary['blocked']} blocked "
+            f"by {', '.join(summary['policies']) or 'no policy'}"
+        )
+        for entry in summary["hosts"][:limit]:
+            print(
+                f"   {entry['host']}: {entry['requests']} requests, "
+                f"{entry['bytes'] / 1024:.0f} KiB, {entry['blocked']} blocked"
+            )
+        for slow in summary["slowest"][:limit]:
+            print(f"   🐢 {slow['duration_ms']:.0f}ms {slow['url']}")
+
+
+NETWORK_STATS = NetworkStats()
+METRICS.register("network", NETWORK_STATS)
@@ -1,3 +1,17 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from playwright.async_api import Error
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+
+from utils.blocking import STATIC_RESOURCES, BlockingPolicy
+from utils.network import NETWORK_STATS, NetworkStats
+from utils.rate_limit import RATE_LIMITER, HostRateLimiter
+
 DEFAULT_BROWSER_ARGS = [
     # Hides automation-related browser features like navigator.webdriver
     "--disable-blink-features=AutomationControlled",
@@ -63,19 +77,411 @@ DEFAULT_BROWSER_CONTEXT_ARGS = {
     # No preloaded cookies or local storage; use clean session by default
     "storage_state": None,
 }
-BLOCKED_RESOURCES = {"image", "stylesheet", "font"}
 
 
-async def create_context(browser):
+async def create_context(
+    browser,
+    policy: BlockingPolicy = STATIC_RESOURCES,
+    network: NetworkStats = NETWORK_STATS,
+):
     context = await browser.new_context(**DEFAULT_BROWSER_CONTEXT_ARGS)
+    network.attach(context)
+    await policy.install(context, network)
+    return context
 
-    async def block_static_resources(route, request):
-        resource_type = getattr(request, "resource_type", "")
-        if resource_type in BLOCKED_RESOURCES:
-            await route.abort()
-        else:
-            await route.continue_()
 
-    await context.route("**/*", block_static_resources)
+@dataclass
+class PooledBrowser:
+    index: int
+    browser: Any = None
+    uses: int = 0
+    leases: int = 0
+    launches: int = 0
 
-    return context
+
+class BrowserPool:
+    """Leases long-lived Chromium instances to scrapers instead of one launch per run.
+
+    Browsers are launched lazily, health-checked on every lease and relaunched
+    when they are disconnected or have served ``max_uses`` leases.
+    """
+
+    def __init__(
+        self,
+        playwright,
+        size: int = 1,
+        max_uses: int | None = None,
+        launch_options: dict | None = None,
+    ):
+        if size < 1:
+            raise ValueError("Browser pool size must be at least 1")
+        self.playwright = playwright
+        self.size = size
+        self.max_uses = max_uses
+        self.launch_options = launch_options or {}
+        self.slots = [PooledBrowser(index=i) for i in range(size)]
+        self.idle: asyncio.Queue[PooledBrowser] = asyncio.Queue()
+        for slot in self.slots:
+            self.idle.put_nowait(slot)
+        self.lease_waits: list[float] = []
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        report = self.report()
+        print(
+            f"♻️ Browser pool: {report['leases']} leases, "
+            f"avg wait {report['wait_seconds_avg']:.3f}s, "
+            f"max wait {report['wait_seconds_max']:.3f}s"
+        )
+
+    async def acquire(self) -> PooledBrowser:
+        started = time.perf_counter()
+        slot = await self.idle.get()
+        self.lease_waits.append(time.perf_counter() - started)
+        try:
+            if not self.is_healthy(slot):
+                await self.relaunch(slot)
+        except BaseException:
+            self.idle.put_nowait(slot)
+            raise
+        slot.uses += 1
+        slot.leases += 1
+        return slot
+
+    async def release(self, slot: PooledBrowser, failed: bool = False):
+        if failed or (self.max_uses is not None and slot.uses >= self.max_uses):
+            await self.retire(slot)
+        self.idle.put_nowait(slot)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Any]:
+        slot = await self.acquire()
+        failed = False
+        try:
+            yield slot.browser
+        except BaseException:
+            failed = not self.is_healthy(slot)
+            raise
+        finally:
+            await self.release(slot, failed=failed)
+
+    @asynccontextmanager
+    async def context(
+        self, policy: BlockingPolicy = STATIC_RESOURCES
+    ) -> AsyncIterator[Any]:
+        async with self.lease() as browser:
+            context = await create_context(browser, policy)
+            try:
+                yield context
+            finally:
+                await context.close()
+
+    def is_healthy(self, slot: PooledBrowser) -> bool:
+        if slot.browser is None:
+            return False
+        if self.max_uses is not None and slot.uses >= self.max_uses:
+            return False
+        return bool(slot.browser.is_connected())
+
+    async def relaunch(self, slot: PooledBrowser):
+        await self.retire(slot)
+        slot.browser = await create_browser(self.playwright, **self.launch_options)
+        slot.uses = 0
+        slot.launches += 1
+
+    async def retire(self, slot: PooledBrowser):
+        browser, slot.browser = slot.browser, None
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Error as e:
+            print(f"❌ Failed to close pooled browser #{slot.index}: {e}")
+
+    async def close(self):
+        for slot in self.slots:
+            await self.retire(slot)
+
+    def report(self) -> dict:
+        waits = sorted(self.lease_waits)
+        return {
+            "leases": len(waits),
+            "wait_seconds_avg": sum(waits) / len(waits) if waits else 0.0,
+            "wait_seconds_max": waits[-1] if waits else 0.0,
+            "browsers": [
+                {
+                    "index": s.index,
+                    "launches": s.launches,
+                    "leases": s.leases,
+                    "reuses": max(s.leases - s.launches, 0),
+                }
+                for s in self.slots
+            ],
+        }
+
+
+DEFAULT_PAGE_MAX_USES = 50
+
+
+@dataclass
+class PooledPage:
+    page: Any
+    uses: int = 0
+
+
+class PagePool:
+    """Bounded set of pages on one context, reset between leases.
+
+    Pages are created lazily, sent to about:blank with their routes
+    cleared on release, and recycled after ``max_uses`` leases or when the
+    lease raised. Leases must not leave event listeners on the page; with
+    none registered Playwright dismisses dialogs itself.
+    """
+
+    def __init__(self, context, size: int = 1, max_uses: int = DEFAULT_PAGE_MAX_USES):
+        if size < 1:
+            raise ValueError("Page pool size must be at least 1")
+        self.context = context
+        self.max_uses = max_uses
+        self.idle: asyncio.Queue[PooledPage | None] = asyncio.Queue()
+        for _ in range(size):
+            self.idle.put_nowait(None)
+        self.entries: list[PooledPage] = []
+        self.created = 0
+        self.recycled = 0
+
+    async def __aenter__(self) -> "PagePool":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def acquire(self) -> PooledPage:
+        entry = await self.idle.get()
+        if entry is not None:
+            return entry
+        try:
+            entry = PooledPage(page=await self.context.new_page())
+        except BaseException:
+            self.idle.put_nowait(None)
+            raise
+        self.entries.append(entry)
+        self.created += 1
+        return entry
+
+    async def release(self, entry: PooledPage, failed: bool = False):
+        entry.uses += 1
+        if not failed and entry.uses < self.max_uses:
+            try:
+                await self.reset(entry)
+                self.idle.put_nowait(entry)
+                return
+            except Error as e:
+                print(f"❌ Failed to reset pooled page: {e}")
+        await self.discard(entry)
+        self.idle.put_nowait(None)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Any]:
+        entry = await self.acquire()
+        failed = False
+        try:
+            yield entry.page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            await self.release(entry, failed=failed)
+
+    async def reset(self, entry: PooledPage):
+        await entry.page.unroute_all(behavior="ignoreErrors")
+        await entry.page.goto("about:blank")
+
+    async def discard(self, entry: PooledPage):
+        self.entries.remove(entry)
+        self.recycled += 1
+        try:
+            await entry.page.close()
+        except Error as e:
+            print(f"❌ Failed to close pooled page: {e}")
+
+    async def close(self):
+        for entry in list(self.entries):
+            await entry.page.close()
+        self.entries.clear()
+
+
+async def navigate(page, url: str, limiter: HostRateLimiter | None = None, **kwargs):
+    async with (limiter or RATE_LIMITER).slot(url):
+        return await page.goto(url, **kwargs)
+
+
+@asynccontextmanager
+async def leased_browser(pool: BrowserPool | None = None) -> AsyncIterator[Any]:
+    async with AsyncExitStack() as stack:
+        if pool is None:
+            playwright = await stack.enter_async_context(async_playwright())
+            pool = await stack.enter_async_context(BrowserPool(playwright))
+        yield await stack.enter_async_context(pool.lease())
+
+
+@dataclass
+class WaitRecord:
+    name: str
+    elapsed_ms: float
+    budget_ms: float
+    satisfied: bool
+
+
+class WaitMetrics:
+    def __init__(self) -> None:
+        self.records: list[WaitRecord] = []
+
+    def record(self, name: str, elapsed_ms: float, budget_ms: float, satisfied: bool):
+        self.records.append(WaitRecord(name, elapsed_ms, budget_ms, satisfied))
+
+    def summary(self) -> dict[str, dict]:
+        summary: dict[str, dict] = {}
+        for record in self.records:
+            entry = summary.setdefault(
+                record.name,
+                {"count": 0, "satisfied": 0, "elapsed_ms": 0.0, "budget_ms": 0.0},
+            )
+            entry["count"] += 1
+            entry["satisfied"] += int(record.satisfied)
+            entry["elapsed_ms"] += record.elapsed_ms
+            entry["budget_ms"] += record.budget_ms
+        return summary
+
+    def print_summary(self):
+        for name, entry in self.summary().items():
+            print(
+                f"⏱ {name}: {entry['satisfied']}/{entry['count']} ready, "
+                f"waited {entry['elapsed_ms']:.0f}ms of {entry['budget_ms']:.0f}ms budget"
+            )
+
+
+WAIT_METRICS = WaitMetrics()
+
+CONTENT_SNAPSHOT_SCRIPT = """
+(selector) => {
+    const el = document.querySelector(selector);
+    return el ? el.innerText : null;
+}
+"""
+CONTENT_CHANGED_SCRIPT = """
+([selector, previous]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.innerText !== previous;
+}
+"""
+
+
+async def wait_for_condition(
+    name: str, budget_ms: float, condition: Awaitable[Any]
+) -> bool:
+    """Await a Playwright wait bounded by ``budget_ms`` and record how long it took.
+
+    Returns False instead of raising when the budget runs out, so callers can
+    treat readiness as best effort just like the fixed sleeps it replaces.
+    """
+    started = time.perf_counter()
+    satisfied = True
+    try:
+        await condition
+    except PlaywrightTimeoutError:
+        satisfied = False
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    WAIT_METRICS.record(name, elapsed_ms, budget_ms, satisfied)
+    return satisfied
+
+
+async def wait_for_url_match(
+    page, url: str | Callable[[str], bool], budget_ms: float
+) -> bool:
+    return await wait_for_condition(
+        "url_matches",
+        budget_ms,
+        page.wait_for_url(url, wait_until="commit", timeout=budget_ms),
+    )
+
+
+async def wait_for_selector_state(
+    page, selector: str, budget_ms: float, state: str = "attached"
+) -> bool:
+    return await wait_for_condition(
+        f"selector_{state}",
+        budget_ms,
+        page.wait_for_selector(selector, state=state, timeout=budget_ms),
+    )
+
+
+async def snapshot_content(page, selector: str) -> str | None:
+    return await page.evaluate(CONTENT_SNAPSHOT_SCRIPT, selector)
+
+
+async def wait_for_content_change(
+    page, selector: str, previous: str | None, budget_ms: float
+) -> bool:
+    return await wait_for_condition(
+        "content_changed",
+        budget_ms,
+        page.wait_for_function(
+            CONTENT_CHANGED_SCRIPT, arg=[selector, previous], timeout=budget_ms
+        ),
+    )
+
+
+async def wait_for_response_received(
+    page, url: str | Callable[[Any], bool], budget_ms: float
+) -> bool:
+    return await wait_for_condition(
+        "response_received",
+        budget_ms,
+        page.wait_for_event(
+            "response",
+            predicate=url if callable(url) else lambda r: url in r.url,
+            timeout=budget_ms,
+        ),
+    )
+
+
+async def wait_for_network_quiet(page, quiet_ms: float, budget_ms: float) -> bool:
+    in_flight: set[Any] = set()
+    last_activity = time.perf_counter()
+
+    def on_request(request):
+        nonlocal last_activity
+        in_flight.add(request)
+        last_activity = time.perf_counter()
+
+    def on_done(request):
+        nonlocal last_activity
+        in_flight.discard(request)
+        last_activity = time.perf_counter()
+
+    async def settle():
+        while True:
+            idle_ms = (time.perf_counter() - last_activity) * 1000
+            if not in_flight and idle_ms >= quiet_ms:
+                return
+            await asyncio.sleep(max(quiet_ms - idle_ms, 10) / 1000)
+
+    async def bounded_settle():
+        try:
+            await asyncio.wait_for(settle(), timeout=budget_ms / 1000)
+        except asyncio.TimeoutError as e:
+            raise PlaywrightTimeoutError("network did not go quiet") from e
+
+    page.on("request", on_request)
+    page.on("requestfinished", on_done)
+    page.on("requestfailed", on_done)
+    try:
+        return await wait_for_condition("network_quiet", budget_ms, bounded_settle())
+    finally:
+        page.remove_listener("request", on_request)
+        page.remove_listener("requestfinished", on_done)
+        page.remove_listener("requestfailed", on_done)
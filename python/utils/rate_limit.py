@@ -0,0 +1,152 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    # Sustained navigations per second
+    rate: float = 2.0
+    # Navigations that may start back to back after the host has been idle
+    burst: int = 4
+    # Navigations to the host that may be in progress at the same time
+    max_in_flight: int = 3
+
+    def share(self, parts: int) -> "HostLimit":
+        if parts <= 1:
+            return self
+        return HostLimit(
+            rate=self.rate / parts,
+            burst=max(1, self.burst // parts),
+            max_in_flight=max(1, self.max_in_flight // parts),
+        )
+
+
+DEFAULT_HOST_LIMIT = HostLimit()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float]):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.updated = clock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def take(self):
+        while True:
+            self.refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class HostState:
+    limit: HostLimit
+    bucket: TokenBucket
+    in_flight: asyncio.Semaphore
+    navigations: int = 0
+    throttled_seconds: float = 0.0
+    waits: list[float] = field(default_factory=list)
+
+
+class HostRateLimiter:
+    """Token bucket plus in-flight cap per host, shared by every navigation.
+
+    Limits are looked up by the longest configured host suffix, so
+    ``bing.com`` also covers ``www.bing.com``.
+    """
+
+    def __init__(
+        self,
+        default: HostLimit = DEFAULT_HOST_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.default = default
+        self.limits: dict[str, HostLimit] = {}
+        self.hosts: dict[str, HostState] = {}
+        self.clock = clock
+        # Processes sharing each host's budget (see split)
+        self.parts = 1
+
+    def configure(self, limits: dict[str, HostLimit]):
+        self.limits.update({host.lower(): limit for host, limit in limits.items()})
+        # Keep buckets whose limit is unchanged so repeated runs share one budget
+        self.hosts = {
+            host: state
+            for host, state in self.hosts.items()
+            if state.limit == self.limit_for(host)
+        }
+
+    def split(self, parts: int):
+        """Keep 1/parts of every host limit, for one of ``parts`` worker processes."""
+        self.parts = parts
+        self.hosts.clear()
+
+    def reset(self):
+        self.limits.clear()
+        self.hosts.clear()
+        self.parts = 1
+
+    def limit_for(self, host: str) -> HostLimit:
+        matches = [
+            configured
+            for configured in self.limits
+            if host == configured or host.endswith(f".{configured}")
+        ]
+        if not matches:
+            return self.default.share(self.parts)
+        return self.limits[max(matches, key=len)].share(self.parts)
+
+    def state_for(self, host: str) -> HostState:
+        if host not in self.hosts:
+            limit = self.limit_for(host)
+            self.hosts[host] = HostState(
+                limit=limit,
+                bucket=TokenBucket(limit.rate, limit.burst, self.clock),
+                in_flight=asyncio.Semaphore(limit.max_in_flight),
+            )
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        host = (urlparse(url).hostname or url).lower()
+        state = self.state_for(host)
+        started = time.perf_counter()
+        async with state.in_flight:
+            await state.bucket.take()
+            waited = time.perf_counter() - started
+            state.navigations += 1
+            state.throttled_seconds += waited
+            state.waits.append(waited)
+            yield
+
+    def report(self) -> dict[str, dict]:
+        return {
+            host: {
+                "navigations": state.navigations,
+                "throttled_seconds": round(state.throttled_seconds, 3),
+                "max_wait_seconds": round(max(state.waits, default=0.0), 3),
+            }
+            for host, state in self.hosts.items()
+        }
+
+    def print_summary(self):
+        for host, entry in self.report().items():
+            print(
+                f"🚦 {host}: {entry['navigations']} navigations, "
+                f"throttled {entry['throttled_seconds']:.2f}s"
+            )
+
+
+RATE_LIMITER = HostRateLimiter()
@@ -0,0 +1,17 @@
+import csv
+import json
+
+
+def load_csv(input_file) -> list[dict]:
+    with open(input_file, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def load_json(input_file):
+    with open(input_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_jsonl(input_file) -> list[dict]:
+    with open(input_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
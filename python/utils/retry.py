@@ -0,0 +1,118 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.metrics import METRICS
+
+T = TypeVar("T")
+
+# Error families that may be retried at all; is_retryable picks the transient ones
+RETRY_CANDIDATES = (TimeoutError, PlaywrightError, httpx.HTTPError, OSError)
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+# Playwright reports connection-level failures as net::ERR_* messages
+NETWORK_ERROR_MARKER = "net::ERR_"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts and transient network failures; not bugs, 4xx or closed pages."""
+    if isinstance(error, (TimeoutError, PlaywrightTimeoutError, ConnectionError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, PlaywrightError):
+        return NETWORK_ERROR_MARKER in str(error)
+    return False
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    multiplier: float = 2.0
+    # "Full jitter": the delay is drawn from [0, backoff], which spreads out
+    # scrapers that failed together instead of retrying them in lockstep
+    jitter: bool = True
+
+    def delay(self, attempt: int, rng: random.Random | None = None) -> float:
+        backoff = min(
+            self.max_delay, self.base_delay * self.multiplier ** (attempt - 1)
+        )
+        if not self.jitter:
+            return backoff
+        return (rng or random).uniform(0, backoff)  # nosec B311
+
+
+class RetryBudget:
+    """Caps retries at ``ratio`` of first attempts (plus ``min_retries``) per run.
+
+    When a site is down, every call failing and retrying would multiply the
+    load on it; the budget turns that into a bounded fraction.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.calls = 0
+        self.retries = 0
+
+    def reset(self):
+        self.calls = 0
+        self.retries = 0
+
+    def record_call(self):
+        self.calls += 1
+
+    def try_spend(self) -> bool:
+        if self.retries >= self.min_retries + self.ratio * self.calls:
+            return False
+        self.retries += 1
+        return True
+
+
+RETRY_BUDGET = RetryBudget()
+
+
+async def retry(
+    call: Callable[[int], Awaitable[T]],
+    policy: RetryPolicy,
+    name: str,
+    budget: RetryBudget | None = None,
+    classify: Callable[[BaseException], bool] = is_retryable,
+) -> T:
+    """Await ``call(attempt)`` until it succeeds, starting at attempt 1.
+
+    The last error is raised when it is not retryable, when attempts run out
+    or when the retry budget is spent.
+    """
+    budget = budget or RETRY_BUDGET
+    budget.record_call()
+    attempt = 1
+    while True:
+        try:
+            return await call(attempt)
+        except RETRY_CANDIDATES as e:
+            if not classify(e):
+                raise
+            if attempt >= policy.max_attempts:
+                METRICS.count("retry.exhausted", call=name)
+                raise
+            if not budget.try_spend():
+                METRICS.count("retry.budget_exhausted", call=name)
+                raise
+            delay = policy.delay(attempt)
+            METRICS.count("retry.attempts", call=name)
+            print(
+                f"🔁 {name}: attempt {attempt} failed ({type(e).__name__}), "
+                f"retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
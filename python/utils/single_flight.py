@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    # Callers that joined a call already in flight
+    joined: int = 0
+    # Callers served from a call that had already finished
+    memoized: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.joined + self.memoized
+
+
+class SingleFlight:
+    """Run one call per key and share its result with every other caller.
+
+    Results are kept for the lifetime of the object (one run); a call that
+    raises is not kept, so the next caller tries again. The shared call runs
+    in its own task, so a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: dict[Hashable, asyncio.Task] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.tasks.get(key)
+        if task is None:
+            self.stats.calls += 1
+            task = asyncio.ensure_future(call())
+            task.add_done_callback(lambda done: self.forget_failed(key, done))
+            self.tasks[key] = task
+        elif task.done():
+            self.stats.memoized += 1
+        else:
+            self.stats.joined += 1
+        return await asyncio.shield(task)
+
+    def forget_failed(self, key: Hashable, task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            if self.tasks.get(key) is task:
+                del self.tasks[key]
@@ -0,0 +1,109 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from utils.blocking import STATIC_RESOURCES, BlockingPolicy
+from utils.network import NetworkStats
+
+POLICY = BlockingPolicy(
+    name="test",
+    resource_types=frozenset({"image", "font"}),
+    hosts=("google-analytics.com", "collector.github.com"),
+    url_globs=("**/_private/browser/stats",),
+)
+
+
+@pytest.mark.parametrize(
+    "url, blocked",
+    [
+        ("https://github.githubassets.com/logo.PNG", True),
+        ("https://avatars.example.com/u/1.jpeg?v=4", True),
+        ("https://example.com/fonts/inter.woff2#v1", True),
+        ("https://example.com/app.js", False),
+        ("https://example.com/png/index.html", False),
+        ("https://example.com/style.css", False),
+    ],
+)
+def test_type_pattern_matches_extensions(url, blocked):
+    pattern = POLICY.type_pattern()
+
+    assert pattern is not None
+    assert bool(pattern.search(url)) is blocked
+
+
+@pytest.mark.parametrize(
+    "url, blocked",
+    [
+        ("https://www.google-analytics.com/g/collect?v=2", True),
+        ("https://google-analytics.com/", True),
+        ("https://collector.github.com:443/github/collect", True),
+        ("https://github.com/collector.github.com/issues", False),
+        ("https://notgoogle-analytics.com/", False),
+        ("https://github.com/facebook/react", False),
+    ],
+)
+def test_host_pattern_blocks_host_and_subdomains(url, blocked):
+    pattern = POLICY.host_pattern()
+
+    assert pattern is not None
+    assert bool(pattern.search(url)) is blocked
+
+
+def test_routes_are_narrow():
+    routes = POLICY.routes()
+
+    assert [rule for _, rule in routes] == ["resource_type", "host", "url_glob"]
+    assert "**/*" not in [url for url, _ in routes]
+    assert not BlockingPolicy(name="none").routes()
+
+
+def test_types_without_extensions_need_exact_types():
+    with pytest.raises(ValueError):
+        BlockingPolicy(name="scripts", resource_types=frozenset({"script"}))
+
+    policy = BlockingPolicy(
+        name="scripts", resource_types=frozenset({"script"}), exact_types=True
+    )
+    assert policy.routes()[0][0] == "**/*"
+
+
+@pytest.mark.asyncio
+async def test_install_blocks_and_reports():
+    context = AsyncMock()
+    network = NetworkStats()
+
+    await POLICY.install(context, network)
+    handlers = {
+        rule: call.args[1]
+        for call, (_, rule) in zip(context.route.await_args_list, POLICY.routes())
+    }
+
+    image = MagicMock(resource_type="image", url="https://example.com/a.png")
+    route = AsyncMock()
+    await handlers["resource_type"](route, image)
+    route.abort.assert_awaited_once()
+
+    # An extension match that is not a blocked type goes on to other routes
+    document = MagicMock(resource_type="document", url="https://example.com/a.svg")
+    route = AsyncMock()
+    await handlers["resource_type"](route, document)
+    route.fallback.assert_awaited_once()
+    route.abort.assert_not_called()
+
+    beacon = MagicMock(resource_type="fetch", url="https://collector.github.com/x")
+    route = AsyncMock()
+    await handlers["host"](route, beacon)
+    route.abort.assert_awaited_once()
+
+    summary = network.summary()
+    assert summary["blocked_by_rule"] == {"host": 1, "resource_type": 1}
+    assert summary["policies"]["test"]["routes"] == 3
+
+
+@pytest.mark.asyncio
+async def test_static_resources_policy_installs_one_route():
+    context = AsyncMock()
+
+    await STATIC_RESOURCES.install(context, NetworkStats())
+
+    context.route.assert_awaited_once()
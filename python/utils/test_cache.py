@@ -0,0 +1,97 @@
+from utils.cache import DEFAULT_NEGATIVE_TTL_SECONDS, CacheLookup, TTLCache
+
+
+def test_ttl_cache_hit_and_expiry(tmp_path, fake_clock):
+    with TTLCache(tmp_path / "cache.sqlite3", ttl=60, clock=fake_clock) as cache:
+        assert cache.get(("brave", "react")).found is False
+
+        cache.set(("brave", "react"), "https://github.com/facebook/react/releases")
+        lookup = cache.get(("brave", "react"))
+        assert lookup.found is True
+        assert lookup.value == "https://github.com/facebook/react/releases"
+
+        fake_clock.advance(61)
+        assert cache.get(("brave", "react")).found is False
+
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+
+
+def test_ttl_cache_persists_between_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    with TTLCache(path) as cache:
+        cache.set("key", {"url": "https://github.com/a/b"})
+
+    with TTLCache(path) as cache:
+        assert cache.get("key").value == {"url": "https://github.com/a/b"}
+
+
+def test_ttl_cache_negative_entries_back_off_exponentially(tmp_path, fake_clock):
+    with TTLCache(tmp_path / "cache.sqlite3", clock=fake_clock) as cache:
+        cache.set("missing", None)
+        lookup = cache.get("missing")
+        assert lookup.found is True
+        assert lookup.value is None
+
+        fake_clock.advance(DEFAULT_NEGATIVE_TTL_SECONDS + 1)
+        assert cache.get("missing").found is False
+
+        cache.set("missing", None)
+        fake_clock.advance(DEFAULT_NEGATIVE_TTL_SECONDS + 1)
+        assert cache.get("missing").found is True
+
+        fake_clock.advance(DEFAULT_NEGATIVE_TTL_SECONDS)
+        assert cache.get("missing").found is False
+        assert cache.stats.negative_hits == 2
+
+
+def test_ttl_cache_evicts_least_recently_used(tmp_path, fake_clock):
+    with TTLCache(tmp_path / "cache.sqlite3", max_entries=2, clock=fake_clock) as cache:
+        cache.set("a", 1)
+        fake_clock.advance(1)
+        cache.set("b", 2)
+        fake_clock.advance(1)
+        cache.get("a")
+        fake_clock.advance(1)
+        cache.set("c", 3)
+
+        assert cache.get("a").found is True
+        assert cache.get("b").found is False
+        assert cache.get("c").found is True
+        assert cache.stats.evictions == 1
+
+
+def test_ttl_cache_namespaces_are_isolated(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    with TTLCache(path, namespace="search") as search, TTLCache(
+        path, namespace="redirect"
+    ) as redirect:
+        search.set("key", "search-value")
+        assert redirect.get("key").found is False
+
+
+def test_ttl_cache_sibling_shares_the_file_with_its_own_namespace(tmp_path, fake_clock):
+    with TTLCache(tmp_path / "cache.sqlite3", ttl=60, clock=fake_clock) as cache:
+        redirects = cache.sibling("redirects", ttl=600)
+        redirects.set("https://github.com/old/repo", "https://github.com/new/repo")
+
+        assert cache.get("https://github.com/old/repo").found is False
+        fake_clock.advance(120)
+        assert redirects.get("https://github.com/old/repo").value == (
+            "https://github.com/new/repo"
+        )
+        assert (redirects.stats.hits, cache.stats.hits) == (1, 0)
+
+
+def test_ttl_cache_peek_leaves_stats_alone(tmp_path, fake_clock):
+    with TTLCache(tmp_path / "cache.sqlite3", ttl=10, clock=fake_clock) as cache:
+        cache.set("react", "https://github.com/facebook/react")
+        cache.set("nothing", None)
+
+        assert cache.peek("react").value == "https://github.com/facebook/react"
+        assert cache.peek("nothing") == CacheLookup(found=True, value=None)
+        assert not cache.peek("vue").found
+        fake_clock.advance(11)
+        assert not cache.peek("react").found
+
+        assert (cache.stats.hits, cache.stats.misses) == (0, 0)
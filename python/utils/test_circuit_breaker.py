@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerConfig,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    report_degraded,
+)
+from utils.metrics import METRICS
+
+CONFIG = BreakerConfig(failure_threshold=2, reset_seconds=30.0)
+
+
+def fail(breaker: CircuitBreaker, error: BaseException):
+    with pytest.raises(type(error)), breaker.call():
+        raise error
+
+
+def test_breaker_opens_after_consecutive_failures(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    fail(breaker, TimeoutError())
+    assert breaker.state == CLOSED
+    fail(breaker, TimeoutError())
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError), breaker.call():
+        pass
+    assert METRICS.counters[("breaker.rejected", (("breaker", "brave"),))] == 1
+
+
+def test_success_resets_the_failure_streak(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    fail(breaker, TimeoutError())
+    with breaker.call():
+        pass
+    fail(breaker, TimeoutError())
+
+    assert breaker.state == CLOSED
+
+
+def test_reported_captchas_trip_the_breaker(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    for _ in range(2):
+        with breaker.call():
+            report_degraded("captcha")
+
+    assert breaker.state == OPEN
+
+
+def test_permanent_errors_do_not_count(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    for _ in range(3):
+        fail(breaker, ValueError("bug"))
+
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+    fail(breaker, TimeoutError())
+    fail(breaker, TimeoutError())
+
+    fake_clock.advance(30.0)
+    with breaker.call():
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError), breaker.call():
+            pass
+
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_for_another_period(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+    fail(breaker, TimeoutError())
+    fail(breaker, TimeoutError())
+
+    fake_clock.advance(30.0)
+    with breaker.call():
+        report_degraded("captcha")
+    assert breaker.state == OPEN
+
+    fake_clock.advance(29.0)
+    assert not breaker.allow()
+
+
+def test_cancelled_probe_frees_the_slot(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+    fail(breaker, TimeoutError())
+    fail(breaker, TimeoutError())
+    fake_clock.advance(30.0)
+
+    fail(breaker, asyncio.CancelledError())
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_report_degraded_outside_a_call_is_ignored():
+    report_degraded("captcha")
+
+
+def test_breakers_are_shared_per_key_and_configurable(fake_clock):
+    breakers = CircuitBreakers(fake_clock)
+    breakers.configure({"bing": CONFIG})
+
+    assert breakers.get("Bing") is breakers.get("bing")
+    assert breakers.get("bing").config is CONFIG
+    assert breakers.for_url("https://github.com/a/b").name == "github.com"
+
+    breakers.reset()
+    assert not breakers.breakers
+
+
+def test_straggler_success_does_not_close_an_open_breaker(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    with breaker.call():
+        fail(breaker, TimeoutError())
+        fail(breaker, TimeoutError())
+        assert breaker.state == OPEN
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_straggler_success_does_not_close_a_half_open_breaker(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    with breaker.call():
+        fail(breaker, TimeoutError())
+        fail(breaker, TimeoutError())
+        fake_clock.advance(30.0)
+        assert breaker.allow()
+
+    assert breaker.state == HALF_OPEN
+
+
+def test_straggler_is_ignored_after_the_breaker_recovers(fake_clock):
+    breaker = CircuitBreaker("brave", CONFIG, fake_clock)
+
+    with breaker.call():
+        fail(breaker, TimeoutError())
+        fail(breaker, TimeoutError())
+        fake_clock.advance(30.0)
+        with breaker.call():
+            assert breaker.state == HALF_OPEN
+        assert breaker.state == CLOSED
+        fail(breaker, TimeoutError())
+
+    # The straggler's success must not wipe out the failure streak it predates
+    assert breaker.failures == 1
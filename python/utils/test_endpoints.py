@@ -0,0 +1,13 @@
+from utils.endpoints import base_host, base_url
+
+
+def test_base_url_defaults():
+    assert base_url("minkabu") == "https://minkabu.jp"
+    assert base_host("github") == "github.com"
+
+
+def test_base_url_env_override(monkeypatch):
+    monkeypatch.setenv("SCRAPER_BASE_URL_GITHUB", "http://127.0.0.1:8123/")
+
+    assert base_url("github") == "http://127.0.0.1:8123"
+    assert base_host("github") == "127.0.0.1:8123"
@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+from utils.job_queue import (
+    DONE,
+    FAILED,
+    LEASED,
+    PENDING,
+    JobCheckpoint,
+    JobQueue,
+    leased_batches,
+)
+
+
+def test_enqueue_is_idempotent_per_key(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        assert jobs.enqueue_many({"react": {"name": "react"}}) == 1
+        assert jobs.enqueue_many({"react": {}, "redis": {"name": "redis"}}) == 1
+
+        batch = jobs.lease("w1", limit=5)
+
+    assert [(job.key, job.payload, job.attempts) for job in batch] == [
+        ("react", {"name": "react"}, 1),
+        ("redis", {"name": "redis"}, 1),
+    ]
+
+
+def test_queues_in_one_file_are_separate(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as rss, JobQueue(
+        tmp_path / "jobs.sqlite3", "stock", fake_clock
+    ) as stock:
+        rss.enqueue_many({"react": {}})
+
+        assert not stock.lease("w1")
+        assert stock.remaining() == 0
+
+
+def test_a_lease_goes_to_one_worker_at_a_time(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as first, JobQueue(
+        tmp_path / "jobs.sqlite3", "rss", fake_clock
+    ) as second:
+        first.enqueue_many({"a": 1, "b": 2})
+
+        assert [job.key for job in first.lease("w1")] == ["a"]
+        assert [job.key for job in second.lease("w2", limit=5)] == ["b"]
+        assert not second.lease("w2")
+        assert first.counts()[LEASED] == 2
+
+
+def test_expired_lease_is_re_leased_and_stale_owner_cannot_complete(
+    tmp_path, fake_clock
+):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"a": 1})
+        (stale,) = jobs.lease("w1", visibility_timeout=60)
+
+        fake_clock.advance(59)
+        assert not jobs.lease("w2")
+        fake_clock.advance(1)
+        (fresh,) = jobs.lease("w2")
+
+        assert fresh.attempts == 2
+        assert not jobs.complete(stale, "late")
+        assert jobs.complete(fresh, "ok")
+        assert jobs.results() == {"a": "ok"}
+
+
+def test_heartbeat_extends_the_lease(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"a": 1})
+        (job,) = jobs.lease("w1", visibility_timeout=60)
+
+        fake_clock.advance(50)
+        assert jobs.heartbeat(job, visibility_timeout=60)
+        fake_clock.advance(50)
+
+        assert not jobs.lease("w2")
+
+
+def test_fail_retries_after_delay_until_max_attempts(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"a": 1}, max_attempts=2)
+
+        assert jobs.fail(jobs.lease("w1")[0], "timeout", retry_delay=30)
+        assert not jobs.lease("w1")
+        fake_clock.advance(30)
+        assert jobs.fail(jobs.lease("w1")[0], "timeout")
+
+        assert jobs.counts() == {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 1}
+        assert jobs.remaining() == 0
+
+
+def test_lease_expiring_on_last_attempt_fails_the_job(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"a": 1}, max_attempts=1)
+        jobs.lease("w1", visibility_timeout=60)
+
+        fake_clock.advance(60)
+
+        assert not jobs.lease("w2")
+        assert jobs.counts()[FAILED] == 1
+
+
+def test_results_follow_enqueue_order(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"b": 1, "a": 2, "c": 3})
+        first, second, third = jobs.lease("w1", limit=3)
+        jobs.complete(third, 3)
+        jobs.complete(first, 1)
+        jobs.fail(second, "broken")
+
+        assert list(jobs.results()) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_leased_batches_waits_for_other_workers(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"a": 1, "b": 2, "c": 3})
+        (held,) = jobs.lease("other")
+        seen = []
+
+        async def finish_held_job():
+            await asyncio.sleep(0.05)
+            jobs.complete(held, "done elsewhere")
+
+        finisher = asyncio.create_task(finish_held_job())
+        async for batch in leased_batches(jobs, "w1", batch_size=2, poll_seconds=0.01):
+            seen.extend(job.key for job in batch)
+            for job in batch:
+                jobs.complete(job, job.payload)
+        await finisher
+
+        assert seen == ["b", "c"]
+        assert jobs.results() == {"a": "done elsewhere", "b": 2, "c": 3}
+
+
+@pytest.mark.asyncio
+async def test_leased_batches_heartbeats_jobs_that_outlive_their_lease(
+    tmp_path, fake_clock
+):
+    with JobQueue(tmp_path / "jobs.sqlite3", "minkabu", fake_clock) as jobs:
+        jobs.enqueue_many({"281A": 1})
+
+        async for (job,) in leased_batches(jobs, "w1", visibility_timeout=0.3):
+            # A full-history symbol: runs twice as long as its lease
+            for _ in range(6):
+                fake_clock.advance(0.1)
+                await asyncio.sleep(0.05)
+                assert jobs.lease("w2", visibility_timeout=0.3) == []
+            assert jobs.complete(job, "rows")
+
+        assert jobs.results() == {"281A": "rows"}
+
+
+def test_job_checkpoint_completes_by_key_and_requeues_the_rest(tmp_path, fake_clock):
+    with JobQueue(tmp_path / "jobs.sqlite3", "rss", fake_clock) as jobs:
+        jobs.enqueue_many({"a": 1, "b": 2})
+        checkpoint = JobCheckpoint(jobs, jobs.lease("w1", limit=2))
+
+        checkpoint.append("a", {"rss": "a.atom"})
+        checkpoint.close()
+
+        assert jobs.results() == {"a": {"rss": "a.atom"}}
+        assert [job.key for job in jobs.lease("w2")] == ["b"]
@@ -0,0 +1,38 @@
+from utils.journal import Journal
+
+
+def test_journal_last_record_per_key_wins(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with Journal(path) as journal:
+        journal.append("react", {"rss": None})
+        journal.append(
+            "django", {"rss": "https://github.com/django/django/releases.atom"}
+        )
+        journal.append(
+            "react", {"rss": "https://github.com/facebook/react/releases.atom"}
+        )
+
+    with Journal(path) as journal:
+        assert journal.load() == {
+            "react": {"rss": "https://github.com/facebook/react/releases.atom"},
+            "django": {"rss": "https://github.com/django/django/releases.atom"},
+        }
+
+
+def test_journal_survives_torn_last_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"key": "react", "value": 1}\n{"key": "dja', encoding="utf-8")
+
+    with Journal(path) as journal:
+        journal.append("django", 2)
+        assert journal.load() == {"react": 1, "django": 2}
+
+
+def test_journal_clear_removes_file(tmp_path):
+    path = tmp_path / "nested" / "journal.jsonl"
+    journal = Journal(path)
+    journal.append("react", 1)
+
+    journal.clear()
+
+    assert not path.exists()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+
+from utils.metrics import METRICS_PATH_ENV, Metrics, export_metrics, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_span_records_durations_and_errors(fake_clock):
+    metrics = Metrics(clock=fake_clock)
+
+    with metrics.span("rss.search", engine="brave"):
+        fake_clock.advance(0.5)
+    with pytest.raises(TimeoutError):
+        with metrics.span("rss.search", engine="brave"):
+            fake_clock.advance(1.5)
+            raise TimeoutError
+    with metrics.span("rss.search", engine="bing"):
+        fake_clock.advance(0.25)
+
+    spans = metrics.summary()["spans"]
+    assert len(spans) == 2
+    brave, bing = spans[0], spans[1]
+    assert brave["labels"] == {"engine": "brave"}
+    assert (brave["count"], brave["errors"], brave["total_seconds"]) == (2, 1, 2.0)
+    assert brave["p50_ms"] == 500
+    assert brave["max_ms"] == 1500
+    assert bing["total_seconds"] == 0.25
+
+
+def test_merge_adds_another_process_snapshot(fake_clock):
+    worker = Metrics(clock=fake_clock)
+    with worker.span("rss.search", engine="brave"):
+        fake_clock.advance(1.0)
+    worker.count("rss.techs", 2, result="found")
+    metrics = Metrics(clock=fake_clock)
+    metrics.count("rss.techs", result="found")
+
+    metrics.merge(worker.snapshot())
+    metrics.merge(worker.snapshot())
+
+    summary = metrics.summary()
+    assert summary["spans"][0]["count"] == 2
+    assert summary["counters"][0]["value"] == 5
+
+
+@pytest.mark.asyncio
+async def test_span_counts_cancellation_separately():
+    metrics = Metrics()
+
+    async def search():
+        with metrics.span("rss.search", engine="mojeek"):
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(search())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    entry = metrics.summary()["spans"][0]
+    assert (entry["errors"], entry["cancelled"]) == (0, 1)
+
+
+def test_prometheus_text_format(fake_clock):
+    metrics = Metrics(clock=fake_clock)
+    with metrics.span("minkabu.parse", bulk="True"):
+        fake_clock.advance(0.2)
+    metrics.count("minkabu.rows", 15)
+    metrics.count("minkabu.rows", 15)
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE scraper_stage_seconds summary" in text
+    assert (
+        'scraper_stage_seconds{stage="minkabu.parse",bulk="True",quantile="0.95"} 0.200000'
+        in text
+    )
+    assert 'scraper_stage_seconds_count{stage="minkabu.parse",bulk="True"} 1' in text
+    assert 'scraper_events_total{name="minkabu.rows"} 30' in text
+    # Each family is contiguous and typed, so stage errors follow their own TYPE
+    errors = text.index("# TYPE scraper_stage_errors_total counter")
+    assert text.index('scraper_stage_seconds_count{stage="minkabu.parse"') < errors
+    assert (
+        errors
+        < text.index('scraper_stage_errors_total{stage="minkabu.parse"')
+        < text.index("# TYPE scraper_events_total counter")
+    )
+
+
+@pytest.mark.parametrize("suffix", [".json", ".prom"])
+def test_export_metrics_honours_env_path(tmp_path, monkeypatch, suffix):
+    metrics = Metrics()
+    metrics.count("fotosource.rows", 90)
+    output_file = tmp_path / "nested" / f"metrics{suffix}"
+    monkeypatch.setenv(METRICS_PATH_ENV, str(output_file))
+
+    export_metrics("outputs/unused/metrics.json", metrics)
+
+    text = output_file.read_text(encoding="utf-8")
+    if suffix == ".json":
+        assert json.loads(text)["counters"] == [
+            {"name": "fotosource.rows", "labels": {}, "value": 90}
+        ]
+    else:
+        assert 'scraper_events_total{name="fotosource.rows"} 90' in text
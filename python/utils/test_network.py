@@ -0,0 +1,106 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from utils.metrics import Metrics
+from utils.network import NetworkStats
+
+
+def make_request(
+    url: str,
+    resource_type: str = "script",
+    response_end: float = -1,
+    body_size: int = 0,
+):
+    request = MagicMock(
+        url=url, resource_type=resource_type, timing={"responseEnd": response_end}
+    )
+    request.sizes = AsyncMock(
+        return_value={"responseBodySize": body_size, "responseHeadersSize": 100}
+    )
+    return request
+
+
+def test_attach_listens_to_context_events():
+    stats = NetworkStats()
+    context = MagicMock()
+
+    stats.attach(context)
+
+    events = [call.args[0] for call in context.on.call_args_list]
+    assert events == ["request", "requestfinished", "requestfailed"]
+
+
+@pytest.mark.asyncio
+async def test_counts_requests_and_bytes_per_host_and_type():
+    stats = NetworkStats()
+    page = make_request("https://github.com/facebook/react", "document", 120.0, 1948)
+    script = make_request("https://github.githubassets.com/app.js", "script", 340.0)
+    script.sizes.return_value["responseBodySize"] = 10140
+    closed = make_request("https://github.githubassets.com/lazy.js", "script", 80.0)
+    closed.sizes.side_effect = PlaywrightError("Target closed")
+    for request in (page, script, closed):
+        stats.on_request(request)
+        await stats.on_finished(request)
+
+    summary = stats.summary()
+
+    assert summary["requests"] == 3
+    assert summary["bytes"] == 12288
+    assets, github = summary["hosts"]
+    assert assets["host"] == "github.githubassets.com"
+    assert (assets["requests"], assets["bytes"], assets["unsized"]) == (2, 10240, 1)
+    assert github["bytes"] == 2048
+    assert summary["resource_types"][0]["resource_type"] == "script"
+    assert [s["duration_ms"] for s in summary["slowest"]] == [340.0, 120.0, 80.0]
+
+
+def test_blocked_requests_are_not_counted_as_failures():
+    stats = NetworkStats()
+    image = make_request("https://cdn.example.com/logo.png", "image")
+    broken = make_request("https://example.com/feed", "fetch")
+    for request in (image, broken):
+        stats.on_request(request)
+    stats.record_blocked(image)
+
+    stats.on_failed(image)
+    stats.on_failed(broken)
+
+    cdn = stats.hosts["cdn.example.com"]
+    assert (cdn.blocked, cdn.failed) == (1, 0)
+    assert stats.hosts["example.com"].failed == 1
+    assert stats.summary()["blocked"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slowest_keeps_only_the_limit():
+    stats = NetworkStats(slowest=2)
+    for i, duration in enumerate([50.0, 400.0, 10.0, 250.0]):
+        await stats.on_finished(
+            make_request(f"https://example.com/{i}", "fetch", duration)
+        )
+    await stats.on_finished(make_request("https://example.com/cached", "fetch", -1))
+
+    assert [s["url"] for s in stats.summary()["slowest"]] == [
+        "https://example.com/1",
+        "https://example.com/3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_registered_network_report_is_exported_and_reset():
+    metrics = Metrics()
+    stats = NetworkStats()
+    metrics.register("network", stats)
+    request = make_request("https://search.brave.com/search?q=x", "document", 1, 412)
+    stats.on_request(request)
+    await stats.on_finished(request)
+
+    assert metrics.summary()["network"]["bytes"] == 512
+    text = metrics.to_prometheus()
+    assert 'scraper_network_bytes_total{host="search.brave.com"} 512' in text
+
+    metrics.reset()
+
+    assert metrics.summary()["network"]["requests"] == 0
@@ -1,7 +1,20 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
-from utils.playwright import create_browser, create_context
+from utils.playwright import (
+    WAIT_METRICS,
+    BrowserPool,
+    PagePool,
+    create_browser,
+    create_context,
+    wait_for_content_change,
+    wait_for_network_quiet,
+    wait_for_selector_state,
+)
 
 
 @pytest.mark.asyncio
@@ -17,3 +30,248 @@ async def test_browser_and_context_startup():
         await page.goto("https://example.com")
         await page.screenshot(path="test_example_com.png")
         await browser.close()
+
+
+def make_mock_browser(connected: bool = True):
+    browser = AsyncMock()
+    browser.is_connected = MagicMock(return_value=connected)
+    return browser
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_reuses_browser_between_leases():
+    browser = make_mock_browser()
+
+    with patch(
+        "utils.playwright.create_browser", new=AsyncMock(return_value=browser)
+    ) as mock_create:
+        async with BrowserPool(MagicMock(), size=1) as pool:
+            async with pool.lease() as first:
+                pass
+            async with pool.lease() as second:
+                pass
+            report = pool.report()
+
+    assert first is second is browser
+    mock_create.assert_awaited_once()
+    browser.close.assert_awaited_once()
+    assert report["leases"] == 2
+    assert report["browsers"] == [{"index": 0, "launches": 1, "leases": 2, "reuses": 1}]
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_relaunches_disconnected_browser():
+    dead = make_mock_browser(connected=False)
+    alive = make_mock_browser()
+
+    with patch(
+        "utils.playwright.create_browser", new=AsyncMock(side_effect=[dead, alive])
+    ):
+        pool = BrowserPool(MagicMock(), size=1)
+        async with pool.lease():
+            pass
+        async with pool.lease() as browser:
+            assert browser is alive
+        await pool.close()
+
+    dead.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_recycles_after_max_uses():
+    browsers = [make_mock_browser(), make_mock_browser()]
+
+    with patch("utils.playwright.create_browser", new=AsyncMock(side_effect=browsers)):
+        pool = BrowserPool(MagicMock(), size=1, max_uses=1)
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+        await pool.close()
+
+    assert first is browsers[0]
+    assert second is browsers[1]
+    browsers[0].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_bounds_concurrent_leases():
+    with patch(
+        "utils.playwright.create_browser",
+        new=AsyncMock(side_effect=lambda *_, **__: make_mock_browser()),
+    ):
+        pool = BrowserPool(MagicMock(), size=2)
+        active = 0
+        peak = 0
+
+        async def worker():
+            nonlocal active, peak
+            async with pool.lease():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(worker() for _ in range(5)))
+        await pool.close()
+
+    assert peak == 2
+    assert pool.report()["leases"] == 5
+
+
+def test_browser_pool_rejects_empty_size():
+    with pytest.raises(ValueError):
+        BrowserPool(MagicMock(), size=0)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_selector_state_records_satisfied_wait():
+    page = AsyncMock()
+    WAIT_METRICS.records.clear()
+
+    ready = await wait_for_selector_state(page, "#table", budget_ms=2000)
+
+    assert ready is True
+    page.wait_for_selector.assert_awaited_once_with(
+        "#table", state="attached", timeout=2000
+    )
+    assert WAIT_METRICS.summary()["selector_attached"]["satisfied"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_content_change_returns_false_on_timeout():
+    page = AsyncMock()
+    page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+    WAIT_METRICS.records.clear()
+
+    ready = await wait_for_content_change(page, "tbody", "old", budget_ms=500)
+
+    assert ready is False
+    summary = WAIT_METRICS.summary()["content_changed"]
+    assert summary["count"] == 1
+    assert summary["satisfied"] == 0
+    assert summary["budget_ms"] == 500
+
+
+class FakeEventPage:
+    def __init__(self) -> None:
+        self.listeners: dict[str, list] = {}
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def remove_listener(self, event, callback):
+        self.listeners[event].remove(callback)
+
+    def emit(self, event, payload):
+        for callback in list(self.listeners.get(event, [])):
+            callback(payload)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_network_quiet_waits_for_in_flight_requests():
+    page = FakeEventPage()
+    request = object()
+
+    waiter = asyncio.create_task(
+        wait_for_network_quiet(page, quiet_ms=20, budget_ms=1000)
+    )
+    await asyncio.sleep(0)
+    page.emit("request", request)
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    page.emit("requestfinished", request)
+    assert await waiter is True
+    assert all(not callbacks for callbacks in page.listeners.values())
+
+
+@pytest.mark.asyncio
+async def test_wait_for_network_quiet_gives_up_after_budget():
+    page = FakeEventPage()
+
+    waiter = asyncio.create_task(
+        wait_for_network_quiet(page, quiet_ms=10, budget_ms=50)
+    )
+    await asyncio.sleep(0)
+    page.emit("request", object())
+
+    assert await waiter is False
+
+
+def make_mock_page():
+    page = AsyncMock()
+    page.on = MagicMock()
+    page.remove_listener = MagicMock()
+    return page
+
+
+def make_mock_context():
+    context = MagicMock()
+    context.new_page = AsyncMock(side_effect=make_mock_page)
+    return context
+
+
+@pytest.mark.asyncio
+async def test_page_pool_resets_and_reuses_page():
+    context = make_mock_context()
+
+    async with PagePool(context, size=1) as pool:
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+
+    assert first is second
+    context.new_page.assert_awaited_once()
+    first.goto.assert_awaited_with("about:blank")
+    first.unroute_all.assert_awaited_with(behavior="ignoreErrors")
+    first.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_page_pool_recycles_after_max_uses():
+    context = make_mock_context()
+
+    async with PagePool(context, size=1, max_uses=2) as pool:
+        pages = []
+        for _ in range(3):
+            async with pool.lease() as page:
+                pages.append(page)
+
+    assert pages[0] is pages[1]
+    assert pages[2] is not pages[0]
+    pages[0].close.assert_awaited_once()
+    assert pool.created == 2
+    assert pool.recycled == 1
+
+
+@pytest.mark.asyncio
+async def test_page_pool_recycles_page_on_error():
+    context = make_mock_context()
+
+    async with PagePool(context, size=1) as pool:
+        with pytest.raises(RuntimeError):
+            async with pool.lease() as broken:
+                raise RuntimeError("navigation crashed")
+        async with pool.lease() as fresh:
+            pass
+
+    assert fresh is not broken
+    broken.goto.assert_not_awaited()
+    broken.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_page_pool_bounds_pages():
+    context = make_mock_context()
+    pool = PagePool(context, size=2)
+
+    async def worker():
+        async with pool.lease():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+    await pool.close()
+
+    assert context.new_page.await_count == 2
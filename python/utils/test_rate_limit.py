@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from utils.rate_limit import HostLimit, HostRateLimiter, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_refills(fake_clock):
+    bucket = TokenBucket(rate=1.0, burst=2, clock=fake_clock)
+
+    await bucket.take()
+    await bucket.take()
+    assert bucket.tokens < 1
+
+    fake_clock.advance(1.0)
+    await asyncio.wait_for(bucket.take(), timeout=0.1)
+
+
+def test_limit_for_matches_longest_host_suffix():
+    limiter = HostRateLimiter()
+    bing = HostLimit(rate=1.0, burst=1, max_in_flight=1)
+    limiter.configure({"bing.com": bing, "github.com": HostLimit(rate=5.0)})
+
+    assert limiter.limit_for("www.bing.com") is bing
+    assert limiter.limit_for("bing.com") is bing
+    assert limiter.limit_for("notbing.com") is limiter.default
+
+
+@pytest.mark.asyncio
+async def test_slot_caps_in_flight_per_host():
+    limiter = HostRateLimiter()
+    limiter.configure({"slow.test": HostLimit(rate=1000, burst=10, max_in_flight=1)})
+    active = {"slow.test": 0, "fast.test": 0}
+    peak = dict(active)
+
+    async def navigate(url: str, host: str):
+        async with limiter.slot(url):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    await asyncio.gather(
+        *(navigate("https://slow.test/page", "slow.test") for _ in range(3)),
+        *(navigate("https://fast.test/page", "fast.test") for _ in range(3)),
+    )
+
+    assert peak == {"slow.test": 1, "fast.test": 3}
+    assert limiter.report()["slow.test"]["navigations"] == 3
+
+
+@pytest.mark.asyncio
+async def test_slot_throttles_only_busy_host():
+    limiter = HostRateLimiter()
+    limiter.configure({"busy.test": HostLimit(rate=20.0, burst=1, max_in_flight=4)})
+
+    for _ in range(3):
+        async with limiter.slot("https://busy.test/"):
+            pass
+    async with limiter.slot("https://idle.test/"):
+        pass
+
+    report = limiter.report()
+    assert report["busy.test"]["throttled_seconds"] >= 0.09
+    assert report["idle.test"]["throttled_seconds"] < 0.05
+
+
+def test_split_shares_each_host_budget():
+    limiter = HostRateLimiter()
+    limiter.configure({"bing.com": HostLimit(rate=1.0, burst=2, max_in_flight=2)})
+
+    limiter.split(2)
+
+    assert limiter.limit_for("www.bing.com") == HostLimit(
+        rate=0.5, burst=1, max_in_flight=1
+    )
+    assert limiter.limit_for("other.test").rate == limiter.default.rate / 2
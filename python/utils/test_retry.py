@@ -0,0 +1,99 @@
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from utils.metrics import METRICS
+from utils.retry import RetryBudget, RetryPolicy, is_retryable, retry
+
+NO_JITTER = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0, jitter=False)
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("status", request=request, response=response)
+
+
+def test_is_retryable_classifies_transient_errors():
+    assert is_retryable(TimeoutError())
+    assert is_retryable(PlaywrightError("net::ERR_CONNECTION_RESET at https://x"))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(status_error(503))
+
+    assert not is_retryable(status_error(404))
+    assert not is_retryable(PlaywrightError("Target page has been closed"))
+    assert not is_retryable(ValueError("bug"))
+
+
+def test_delay_backs_off_exponentially_up_to_max():
+    assert [NO_JITTER.delay(a) for a in (1, 2, 3, 4)] == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_delay_with_jitter_stays_within_backoff():
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+    rng = random.Random(1)
+
+    delays = [policy.delay(3, rng) for _ in range(50)]
+
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_budget_caps_retries_to_a_share_of_calls():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    for _ in range(4):
+        budget.record_call()
+
+    spent = [budget.try_spend() for _ in range(5)]
+
+    assert spent == [True, True, True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_retry_retries_transient_errors_until_success():
+    call = AsyncMock(side_effect=[TimeoutError(), TimeoutError(), "ok"])
+
+    with patch("utils.retry.asyncio.sleep", new=AsyncMock()) as sleep:
+        assert await retry(call, NO_JITTER, "test") == "ok"
+
+    assert [c.args[0] for c in call.await_args_list] == [1, 2, 3]
+    assert [c.args[0] for c in sleep.await_args_list] == [1.0, 2.0]
+    assert METRICS.counters[("retry.attempts", (("call", "test"),))] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_raises_after_max_attempts():
+    call = AsyncMock(side_effect=TimeoutError("slow"))
+
+    with patch("utils.retry.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(TimeoutError):
+            await retry(call, NO_JITTER, "test")
+
+    assert call.await_count == 3
+    assert METRICS.counters[("retry.exhausted", (("call", "test"),))] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_does_not_retry_permanent_errors():
+    call = AsyncMock(side_effect=PlaywrightError("Target page has been closed"))
+
+    with pytest.raises(PlaywrightError):
+        await retry(call, NO_JITTER, "test")
+
+    call.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_when_budget_is_spent():
+    budget = MagicMock(spec=RetryBudget)
+    budget.try_spend.return_value = False
+    call = AsyncMock(side_effect=TimeoutError())
+
+    with pytest.raises(TimeoutError):
+        await retry(call, NO_JITTER, "test", budget=budget)
+
+    call.assert_awaited_once()
+    assert METRICS.counters[("retry.budget_exhausted", (("call", "test"),))] == 1
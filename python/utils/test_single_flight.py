@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    started = 0
+
+    async def extract():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return "https://github.com/vercel/next.js/releases.atom"
+
+    flight = SingleFlight()
+    results = await asyncio.gather(
+        *(flight.do("vercel/next.js", extract) for _ in range(3))
+    )
+
+    assert started == 1
+    assert len(set(results)) == 1
+    assert (flight.stats.calls, flight.stats.joined, flight.stats.saved) == (1, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_finished_results_are_memoized_per_key():
+    flight = SingleFlight()
+
+    async def value(v):
+        return v
+
+    assert await flight.do("a", lambda: value(1)) == 1
+    assert await flight.do("a", lambda: value(2)) == 1
+    assert await flight.do("b", lambda: value(3)) == 3
+
+    assert (flight.stats.calls, flight.stats.memoized) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_call_is_not_memoized():
+    flight = SingleFlight()
+
+    async def broken():
+        raise TimeoutError("slow")
+
+    async def working():
+        return "ok"
+
+    with pytest.raises(TimeoutError):
+        await flight.do("a", broken)
+    assert await flight.do("a", working) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.create_task(flight.do("a", slow))
+    second = asyncio.create_task(flight.do("a", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -1,7 +1,16 @@
 import csv
 import json
 
-from utils.writer import save_csv, save_json
+import pytest
+
+from utils.reader import load_csv, load_jsonl
+from utils.writer import (
+    CsvStreamWriter,
+    JsonLinesStreamWriter,
+    StreamWriter,
+    save_csv,
+    save_json,
+)
 
 
 def test_save_csv_default_fieldnames(tmp_path):
@@ -80,3 +89,68 @@ def test_save_json_creates_valid_json(tmp_path):
         loaded = json.load(f)
 
     assert loaded == data
+
+
+def test_csv_stream_writer_replaces_output_on_close(tmp_path):
+    output_file = tmp_path / "stream.csv"
+    output_file.write_text("old\n", encoding="utf-8")
+
+    with CsvStreamWriter(output_file, batch_size=2) as writer:
+        writer.write({"Date": "2025-07-01", "Close": "105"})
+        writer.write({"Date": "2025-07-02", "Close": "106"})
+        # The first batch is on disk, but only in the temp file
+        assert output_file.read_text(encoding="utf-8") == "old\n"
+        writer.write({"Date": "2025-07-03", "Close": "107"})
+
+    assert [r["Date"] for r in load_csv(output_file)] == [
+        "2025-07-01",
+        "2025-07-02",
+        "2025-07-03",
+    ]
+    assert [p.name for p in tmp_path.iterdir()] == ["stream.csv"]
+
+
+def test_stream_writer_flushes_in_batches(tmp_path):
+    writer = JsonLinesStreamWriter(tmp_path / "rows.jsonl", batch_size=2)
+
+    writer.write({"n": 1})
+    assert writer.tmp_file.read_text(encoding="utf-8") == ""
+    writer.write({"n": 2})
+    assert writer.tmp_file.read_text(encoding="utf-8").count("\n") == 2
+
+    writer.close()
+
+
+def test_stream_writer_without_write_batch_fails_on_construction(tmp_path):
+    # A subclass that forgot write_batch
+    incomplete_writer = type("IncompleteWriter", (StreamWriter,), {})
+
+    pytest.raises(TypeError, incomplete_writer, tmp_path / "rows.txt")
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_stream_writer_keeps_partial_file_on_error(tmp_path):
+    output_file = tmp_path / "rows.jsonl"
+
+    with pytest.raises(RuntimeError):
+        with JsonLinesStreamWriter(output_file) as writer:
+            writer.write_rows([{"n": 1}, {"n": 2}])
+            raise RuntimeError("scraper crashed")
+
+    assert not output_file.exists()
+    assert load_jsonl(tmp_path / "rows.jsonl.partial") == [{"n": 1}, {"n": 2}]
+
+
+@pytest.mark.asyncio
+async def test_stream_writer_write_from_async_iterator(tmp_path):
+    async def rows():
+        for n in range(3):
+            yield {"n": n, "name": f"店舗{n}"}
+
+    output_file = tmp_path / "rows.jsonl"
+    with JsonLinesStreamWriter(output_file, batch_size=2) as writer:
+        await writer.write_from(rows())
+
+    assert writer.count == 3
+    assert load_jsonl(output_file)[2] == {"n": 2, "name": "店舗2"}
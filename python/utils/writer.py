@@ -1,5 +1,10 @@
 import csv
 import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, Iterable
+from pathlib import Path
 
 
 def save_csv(data, output_file, fieldnames=None):
@@ -16,3 +21,96 @@ def save_json(data, output_file, indent=2):
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=indent)
     print(f"✅ Saved to JSON File({output_file})")
+
+
+class StreamWriter(ABC):
+    """Write rows as they arrive to a temp file that replaces ``output_file`` on close.
+
+    Rows are buffered and flushed every ``batch_size`` rows. If the ``with``
+    block raises, the rows written so far are kept in ``<output_file>.partial``
+    and the previous output is left untouched.
+    """
+
+    def __init__(self, output_file, batch_size: int = 100):
+        self.output_file = Path(output_file)
+        self.batch_size = batch_size
+        self.buffer: list[dict] = []
+        self.count = 0
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.output_file.parent,
+            prefix=f".{self.output_file.name}.",
+            suffix=".tmp",
+        )
+        self.tmp_file = Path(tmp_name)
+        self.file = os.fdopen(fd, "w", newline="", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row: dict):
+        self.buffer.append(row)
+        self.count += 1
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[dict]):
+        for row in rows:
+            self.write(row)
+
+    async def write_from(self, rows: AsyncIterable[dict]):
+        async for row in rows:
+            self.write(row)
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.buffer = []
+        self.file.flush()
+
+    @abstractmethod
+    def write_batch(self, rows: list[dict]):
+        """Write one flushed batch of rows to ``self.file``."""
+
+    def finish(self):
+        self.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+    def close(self):
+        self.finish()
+        # mkstemp creates 0600 files; give the output the usual permissions
+        os.chmod(self.tmp_file, 0o644)
+        os.replace(self.tmp_file, self.output_file)
+        print(f"✅ Saved {self.count} rows to {self.output_file}")
+
+    def abort(self):
+        self.finish()
+        partial_file = self.output_file.with_name(f"{self.output_file.name}.partial")
+        os.replace(self.tmp_file, partial_file)
+        print(f"❌ Kept {self.count} rows written so far in {partial_file}")
+
+
+class CsvStreamWriter(StreamWriter):
+    def __init__(self, output_file, fieldnames=None, batch_size: int = 100):
+        super().__init__(output_file, batch_size=batch_size)
+        self.fieldnames = fieldnames
+        self.writer: csv.DictWriter | None = None
+
+    def write_batch(self, rows: list[dict]):
+        if self.writer is None:
+            self.writer = csv.DictWriter(
+                self.file, fieldnames=self.fieldnames or list(rows[0].keys())
+            )
+            self.writer.writeheader()
+        self.writer.writerows(rows)
+
+
+class JsonLinesStreamWriter(StreamWriter):
+    def write_batch(self, rows: list[dict]):
+        self.file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)